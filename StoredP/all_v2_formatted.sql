@@ -644,6 +644,155 @@ BEGIN
 END
 GO
 
+-- Keyset-paginated SP_GetStudentsByDepartment. Pass the S_LName, S_FName, S_Id of the
+-- previous page's last row (all NULL for the first page); S_Id breaks name ties. Only the
+-- page's students are joined to their phones. Served by IX_Student_Dep_Id_Name
+CREATE PROCEDURE SP_GetStudentsByDepartmentPage
+    @Dep_Id INT,
+    @After_LName NVARCHAR(100) = NULL,
+    @After_FName NVARCHAR(100) = NULL,
+    @After_S_Id INT = NULL,
+    @PageSize INT = 500
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    SELECT 
+        page.S_Id,
+        page.S_FName + ' ' + page.S_LName AS StudentName,
+        page.S_FName,
+        page.S_LName,
+        page.S_Age,
+        page.S_Email,
+        page.S_GPA,
+        page.Track_Name,
+        page.Track_Id,
+        page.DepartmentName,
+        (SELECT STRING_AGG(sp.S_Phone, ', ') FROM Student_Phones sp WHERE sp.S_Id = page.S_Id) AS PhoneNumbers
+    FROM (
+        SELECT TOP (@PageSize)
+            s.S_Id, s.S_FName, s.S_LName, s.S_Age, s.S_Email, s.S_GPA,
+            t.Track_Name, t.Track_Id, d.D_Name AS DepartmentName
+        FROM Student s
+        INNER JOIN Track t ON s.Track_Id = t.Track_Id
+        INNER JOIN Department d ON s.Dep_Id = d.D_Id
+        WHERE s.Dep_Id = @Dep_Id
+          -- Names are nullable: NULL sorts as '' so a page ending on one still has a successor
+          AND (@After_S_Id IS NULL
+               OR ISNULL(s.S_LName, N'') > ISNULL(@After_LName, N'')
+               OR (ISNULL(s.S_LName, N'') = ISNULL(@After_LName, N'')
+                   AND ISNULL(s.S_FName, N'') > ISNULL(@After_FName, N''))
+               OR (ISNULL(s.S_LName, N'') = ISNULL(@After_LName, N'')
+                   AND ISNULL(s.S_FName, N'') = ISNULL(@After_FName, N'') AND s.S_Id > @After_S_Id))
+        ORDER BY ISNULL(s.S_LName, N''), ISNULL(s.S_FName, N''), s.S_Id
+    ) AS page
+    ORDER BY ISNULL(page.S_LName, N''), ISNULL(page.S_FName, N''), page.S_Id
+    OPTION (RECOMPILE)
+END
+GO
+
+-- Per-(student, course) grade summary kept in step with Student_Exam by
+-- TR_Student_Exam_Grade_Summary, so grade lookups do not re-aggregate exam history
+IF OBJECT_ID(N'dbo.Student_Course_Grade', N'U') IS NULL
+BEGIN
+    CREATE TABLE Student_Course_Grade
+    (
+        S_Id INT NOT NULL,
+        C_Id INT NOT NULL,
+        Grade_Sum DECIMAL(18,2) NOT NULL,
+        Graded_Exams INT NOT NULL,
+        CONSTRAINT PK_Student_Course_Grade PRIMARY KEY (S_Id, C_Id)
+    )
+    
+    -- Backfill grades recorded before the trigger existed (as SP_RebuildStudentGradeSummary does)
+    INSERT INTO Student_Course_Grade (S_Id, C_Id, Grade_Sum, Graded_Exams)
+    SELECT se.S_Id, e.C_Id, SUM(se.Grade), COUNT(*)
+    FROM Student_Exam se
+    INNER JOIN Exam e ON se.E_Id = e.E_Id
+    WHERE se.Grade IS NOT NULL AND e.C_Id IS NOT NULL
+    GROUP BY se.S_Id, e.C_Id
+END
+GO
+
+-- Apply the grade delta of every Student_Exam insert/update/delete (any number of rows):
+-- old graded rows are subtracted, new graded rows added, emptied summaries removed
+CREATE TRIGGER TR_Student_Exam_Grade_Summary
+ON Student_Exam
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    IF NOT EXISTS (SELECT 1 FROM inserted) AND NOT EXISTS (SELECT 1 FROM deleted)
+        RETURN
+    
+    ;WITH Delta AS (
+        SELECT i.S_Id, e.C_Id, i.Grade AS Grade, 1 AS Exams
+        FROM inserted i
+        INNER JOIN Exam e ON e.E_Id = i.E_Id
+        WHERE i.Grade IS NOT NULL AND e.C_Id IS NOT NULL
+        UNION ALL
+        SELECT d.S_Id, e.C_Id, -d.Grade, -1
+        FROM deleted d
+        INNER JOIN Exam e ON e.E_Id = d.E_Id
+        WHERE d.Grade IS NOT NULL AND e.C_Id IS NOT NULL
+    ),
+    Changes AS (
+        SELECT S_Id, C_Id, SUM(Grade) AS Grade_Change, SUM(Exams) AS Exams_Change
+        FROM Delta
+        GROUP BY S_Id, C_Id
+    )
+    MERGE Student_Course_Grade AS target
+    USING Changes AS source
+        ON target.S_Id = source.S_Id AND target.C_Id = source.C_Id
+    WHEN MATCHED AND target.Graded_Exams + source.Exams_Change <= 0 THEN
+        DELETE
+    WHEN MATCHED THEN
+        UPDATE SET Grade_Sum = target.Grade_Sum + source.Grade_Change,
+                   Graded_Exams = target.Graded_Exams + source.Exams_Change
+    WHEN NOT MATCHED BY TARGET AND source.Exams_Change > 0 THEN
+        INSERT (S_Id, C_Id, Grade_Sum, Graded_Exams)
+        VALUES (source.S_Id, source.C_Id, source.Grade_Change, source.Exams_Change);
+END
+GO
+
+-- Recompute Student_Course_Grade from Student_Exam (initial deployment, or after a
+-- BULK INSERT that did not fire triggers)
+CREATE PROCEDURE SP_RebuildStudentGradeSummary
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    BEGIN TRY
+        BEGIN TRANSACTION
+        
+        DELETE FROM Student_Course_Grade
+        
+        INSERT INTO Student_Course_Grade (S_Id, C_Id, Grade_Sum, Graded_Exams)
+        SELECT se.S_Id, e.C_Id, SUM(se.Grade), COUNT(*)
+        FROM Student_Exam se
+        INNER JOIN Exam e ON se.E_Id = e.E_Id
+        WHERE se.Grade IS NOT NULL AND e.C_Id IS NOT NULL
+        GROUP BY se.S_Id, e.C_Id
+        
+        COMMIT TRANSACTION
+        
+        PRINT 'Student grade summary rebuilt'
+        
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION
+        
+        DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE()
+        DECLARE @ErrorSeverity INT = ERROR_SEVERITY()
+        DECLARE @ErrorState INT = ERROR_STATE()
+        
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState)
+    END CATCH
+END
+GO
+
 CREATE PROCEDURE SP_GetStudentGrades
     @S_Id INT
 AS
@@ -656,29 +805,32 @@ BEGIN
         RETURN
     END
     
+    -- Reads the maintained summary (one PK seek per student) instead of aggregating Student_Exam
     SELECT 
         s.S_FName + ' ' + s.S_LName AS StudentName,
         c.C_Id,
         c.C_Name AS CourseName,
-        AVG(se.Grade) AS AverageGrade,
-        COUNT(se.E_Id) AS ExamsTaken,
+        g.AverageGrade,
+        g.Graded_Exams AS ExamsTaken,
         CASE 
-            WHEN AVG(se.Grade) >= 90 THEN 'A'
-            WHEN AVG(se.Grade) >= 80 THEN 'B'
-            WHEN AVG(se.Grade) >= 70 THEN 'C'
-            WHEN AVG(se.Grade) >= 60 THEN 'D'
+            WHEN g.AverageGrade >= 90 THEN 'A'
+            WHEN g.AverageGrade >= 80 THEN 'B'
+            WHEN g.AverageGrade >= 70 THEN 'C'
+            WHEN g.AverageGrade >= 60 THEN 'D'
             ELSE 'F'
         END AS LetterGrade,
         CASE 
-            WHEN AVG(se.Grade) >= 60 THEN 'Pass'
+            WHEN g.AverageGrade >= 60 THEN 'Pass'
             ELSE 'Fail'
         END AS Status
-    FROM Student s
-    INNER JOIN Student_Exam se ON s.S_Id = se.S_Id
-    INNER JOIN Exam e ON se.E_Id = e.E_Id
-    INNER JOIN Course c ON e.C_Id = c.C_Id
-    WHERE s.S_Id = @S_Id AND se.Grade IS NOT NULL
-    GROUP BY s.S_FName, s.S_LName, c.C_Id, c.C_Name
+    FROM (
+        SELECT S_Id, C_Id, Graded_Exams,
+               CAST(Grade_Sum AS DECIMAL(38,6)) / Graded_Exams AS AverageGrade
+        FROM Student_Course_Grade
+        WHERE S_Id = @S_Id
+    ) AS g
+    INNER JOIN Student s ON s.S_Id = g.S_Id
+    INNER JOIN Course c ON c.C_Id = g.C_Id
     ORDER BY c.C_Name
 END
 GO
@@ -757,40 +909,138 @@ BEGIN
             RETURN
         END
         
-        DECLARE @CourseId INT
-        DECLARE @EnrollmentCount INT = 0
+        DECLARE @EnrollmentCount INT
+        
+        -- One set-based insert of every track course the student is not enrolled in yet
+        INSERT INTO Student_Course (S_Id, Course_Id, Enrollment_Date)
+        SELECT @S_Id, c.C_Id, GETDATE()
+        FROM Course c
+        WHERE c.Track_Id = @Track_Id
+          AND NOT EXISTS (
+              SELECT 1 FROM Student_Course sc WITH (UPDLOCK, HOLDLOCK)
+              WHERE sc.S_Id = @S_Id AND sc.Course_Id = c.C_Id
+          )
+        
+        SET @EnrollmentCount = @@ROWCOUNT
+        
+        PRINT 'Student ' + CAST(@S_Id AS VARCHAR) + ' enrolled in ' + CAST(@EnrollmentCount AS VARCHAR) + ' new courses for track ' + CAST(@Track_Id AS VARCHAR)
+        
+    END TRY
+    BEGIN CATCH
+        DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE()
+        DECLARE @ErrorSeverity INT = ERROR_SEVERITY()
+        DECLARE @ErrorState INT = ERROR_STATE()
+        
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState)
+    END CATCH
+END
+GO
+
+-- Table-valued parameter type for bulk enrollment: each row names either a Course_Id
+-- or a Track_Id (meaning every course of that track); Enrollment_Date defaults to today
+IF NOT EXISTS (SELECT * FROM sys.types WHERE name = 'EnrollmentListType')
+BEGIN
+    CREATE TYPE EnrollmentListType AS TABLE
+    (
+        S_Id INT NOT NULL,
+        Track_Id INT NULL,
+        Course_Id INT NULL,
+        Enrollment_Date DATE NULL
+    )
+END
+GO
+
+-- Enroll a whole cohort with one set-based insert; existing enrollments are skipped.
+-- Returns one row: RequestedCount (distinct student/course pairs), EnrolledCount (new rows)
+CREATE PROCEDURE SP_EnrollStudentsBulk
+    @Enrollments EnrollmentListType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    BEGIN TRY
+        DECLARE @BadId INT
+        
+        IF EXISTS (
+            SELECT 1 FROM @Enrollments
+            WHERE (Track_Id IS NULL AND Course_Id IS NULL) OR (Track_Id IS NOT NULL AND Course_Id IS NOT NULL)
+        )
+        BEGIN
+            RAISERROR('Each enrollment row needs exactly one of Track_Id or Course_Id', 16, 1)
+            RETURN
+        END
         
-        DECLARE course_cursor CURSOR FOR
-        SELECT C_Id
-        FROM Course
-        WHERE Track_Id = @Track_Id
+        SELECT TOP 1 @BadId = en.S_Id
+        FROM @Enrollments en
+        WHERE NOT EXISTS (SELECT 1 FROM Student s WHERE s.S_Id = en.S_Id)
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Student ID %d does not exist', 16, 1, @BadId)
+            RETURN
+        END
         
-        OPEN course_cursor
-        FETCH NEXT FROM course_cursor INTO @CourseId
+        SELECT TOP 1 @BadId = en.Course_Id
+        FROM @Enrollments en
+        WHERE en.Course_Id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM Course c WHERE c.C_Id = en.Course_Id)
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Course ID %d does not exist', 16, 1, @BadId)
+            RETURN
+        END
         
-        WHILE @@FETCH_STATUS = 0
+        SELECT TOP 1 @BadId = en.Track_Id
+        FROM @Enrollments en
+        WHERE en.Track_Id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM Track t WHERE t.Track_Id = en.Track_Id)
+        IF @BadId IS NOT NULL
         BEGIN
-            IF NOT EXISTS (SELECT 1 FROM Student_Course WHERE S_Id = @S_Id AND Course_Id = @CourseId)
-            BEGIN
-                EXEC SP_EnrollStudentInCourse @S_Id = @S_Id, @Course_Id = @CourseId
-                SET @EnrollmentCount = @EnrollmentCount + 1
-            END
-            
-            FETCH NEXT FROM course_cursor INTO @CourseId
+            RAISERROR('Track ID %d does not exist', 16, 1, @BadId)
+            RETURN
         END
         
-        CLOSE course_cursor
-        DEALLOCATE course_cursor
+        -- Expand tracks to their courses; a pair requested twice keeps its earliest date
+        CREATE TABLE #Requested (
+            S_Id INT NOT NULL,
+            Course_Id INT NOT NULL,
+            Enrollment_Date DATE NOT NULL,
+            PRIMARY KEY (S_Id, Course_Id)
+        )
         
-        PRINT 'Student ' + CAST(@S_Id AS VARCHAR) + ' enrolled in ' + CAST(@EnrollmentCount AS VARCHAR) + ' new courses for track ' + CAST(@Track_Id AS VARCHAR)
+        INSERT INTO #Requested (S_Id, Course_Id, Enrollment_Date)
+        SELECT S_Id, Course_Id, MIN(Enrollment_Date)
+        FROM (
+            SELECT en.S_Id, en.Course_Id, ISNULL(en.Enrollment_Date, CAST(GETDATE() AS DATE)) AS Enrollment_Date
+            FROM @Enrollments en
+            WHERE en.Course_Id IS NOT NULL
+            UNION ALL
+            SELECT en.S_Id, c.C_Id, ISNULL(en.Enrollment_Date, CAST(GETDATE() AS DATE))
+            FROM @Enrollments en
+            INNER JOIN Course c ON c.Track_Id = en.Track_Id
+            WHERE en.Track_Id IS NOT NULL
+        ) AS pairs
+        GROUP BY S_Id, Course_Id
+        
+        BEGIN TRANSACTION
+        
+        INSERT INTO Student_Course (S_Id, Course_Id, Enrollment_Date)
+        SELECT r.S_Id, r.Course_Id, r.Enrollment_Date
+        FROM #Requested r
+        WHERE NOT EXISTS (
+            SELECT 1 FROM Student_Course sc WITH (UPDLOCK, HOLDLOCK)
+            WHERE sc.S_Id = r.S_Id AND sc.Course_Id = r.Course_Id
+        )
+        
+        DECLARE @EnrolledCount INT = @@ROWCOUNT
+        
+        COMMIT TRANSACTION
+        
+        SELECT (SELECT COUNT(*) FROM #Requested) AS RequestedCount, @EnrolledCount AS EnrolledCount
         
     END TRY
     BEGIN CATCH
-        IF CURSOR_STATUS('local', 'course_cursor') >= 0
-        BEGIN
-            CLOSE course_cursor
-            DEALLOCATE course_cursor
-        END
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION
         
         DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE()
         DECLARE @ErrorSeverity INT = ERROR_SEVERITY()
@@ -882,6 +1132,49 @@ BEGIN
 END
 GO
 
+-- Keyset-paginated SP_GetStudentEnrollments, newest first. Pass the Enrollment_Date and
+-- C_Id of the previous page's last row (NULL @After_C_Id for the first page)
+CREATE PROCEDURE SP_GetStudentEnrollmentsPage
+    @S_Id INT,
+    @After_Date DATE = NULL,
+    @After_C_Id INT = NULL,
+    @PageSize INT = 500
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    IF NOT EXISTS (SELECT 1 FROM Student WHERE S_Id = @S_Id)
+    BEGIN
+        RAISERROR('Student ID %d does not exist', 16, 1, @S_Id)
+        RETURN
+    END
+    
+    -- Undated enrollments sort last, as they do in SP_GetStudentEnrollments
+    SELECT TOP (@PageSize)
+        s.S_FName + ' ' + s.S_LName AS StudentName,
+        c.C_Id,
+        c.C_Name AS CourseName,
+        c.C_Des AS CourseDescription,
+        c.C_Duration,
+        sc.Enrollment_Date,
+        t.Track_Name,
+        DATEDIFF(DAY, sc.Enrollment_Date, GETDATE()) AS DaysEnrolled,
+        (SELECT COUNT(*) FROM Exam WHERE C_Id = c.C_Id) AS TotalExams,
+        (SELECT COUNT(*) FROM Student_Exam se
+          INNER JOIN Exam e ON se.E_Id = e.E_Id
+          WHERE se.S_Id = @S_Id AND e.C_Id = c.C_Id) AS ExamsTaken
+    FROM Student s
+    INNER JOIN Student_Course sc ON s.S_Id = sc.S_Id
+    INNER JOIN Course c ON sc.Course_Id = c.C_Id
+    LEFT JOIN Track t ON c.Track_Id = t.Track_Id
+    WHERE s.S_Id = @S_Id
+      AND (@After_C_Id IS NULL
+           OR ISNULL(sc.Enrollment_Date, '00010101') < ISNULL(@After_Date, '00010101')
+           OR (ISNULL(sc.Enrollment_Date, '00010101') = ISNULL(@After_Date, '00010101') AND c.C_Id > @After_C_Id))
+    ORDER BY ISNULL(sc.Enrollment_Date, '00010101') DESC, c.C_Id
+END
+GO
+
 -- ================================================
 -- TEACHING PROCEDURES
 -- ================================================
@@ -1033,6 +1326,149 @@ BEGIN
 END
 GO
 
+-- ================================================
+-- BULK QUESTION IMPORT
+-- ================================================
+
+-- Table-valued parameter types for importing a question bank: one row per question, keyed
+-- by a caller-chosen Import_Id (e.g. its position in the bank file), and its choices in order
+IF NOT EXISTS (SELECT * FROM sys.types WHERE name = 'QuestionImportType')
+BEGIN
+    CREATE TYPE QuestionImportType AS TABLE
+    (
+        Import_Id INT NOT NULL PRIMARY KEY,
+        C_Id INT NOT NULL,
+        Q_Content NVARCHAR(400) NOT NULL,
+        Q_Type NVARCHAR(50) NOT NULL,
+        Q_Points FLOAT NULL,
+        Q_hardness NVARCHAR(50) NULL
+    )
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.types WHERE name = 'ChoiceImportType')
+BEGIN
+    CREATE TYPE ChoiceImportType AS TABLE
+    (
+        Import_Id INT NOT NULL,
+        Choice_No INT NOT NULL,
+        Is_Correct BIT NOT NULL,
+        Choice_Content NVARCHAR(100) NOT NULL,
+        PRIMARY KEY (Import_Id, Choice_No)
+    )
+END
+GO
+
+-- Import many questions with their choices in one call, instead of SP_CreateQuestion plus
+-- one SP_CreateChoice per choice. New Q_Ids and Choice_Ids continue after the current
+-- maximums in (Import_Id, Choice_No) order, one ROW_NUMBER pass per table; the key-range
+-- locks taken while reading the maximums keep concurrent imports from sharing ids.
+-- Choice_Id also references Student_Answer (FK_Choice_Student_Answer): while that key is
+-- enabled, every new Choice_Id must already exist as an A_Id.
+-- Returns Import_Id, Q_Id, First_Choice_Id, ChoiceCount per imported question
+CREATE PROCEDURE SP_ImportQuestionsBulk
+    @Questions QuestionImportType READONLY,
+    @Choices ChoiceImportType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    BEGIN TRY
+        DECLARE @BadId INT
+        
+        SELECT TOP 1 @BadId = q.C_Id
+        FROM @Questions q
+        WHERE NOT EXISTS (SELECT 1 FROM Course c WHERE c.C_Id = q.C_Id)
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Course ID %d does not exist', 16, 1, @BadId)
+            RETURN
+        END
+        
+        SELECT TOP 1 @BadId = Import_Id
+        FROM @Questions
+        WHERE Q_Type NOT IN ('MCQ', 'TF')
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Question %d has an unknown type (expected MCQ or TF)', 16, 1, @BadId)
+            RETURN
+        END
+        
+        SELECT TOP 1 @BadId = ch.Import_Id
+        FROM @Choices ch
+        WHERE NOT EXISTS (SELECT 1 FROM @Questions q WHERE q.Import_Id = ch.Import_Id)
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Choices given for question %d, which is not in the import', 16, 1, @BadId)
+            RETURN
+        END
+        
+        SELECT TOP 1 @BadId = q.Import_Id
+        FROM @Questions q
+        LEFT JOIN @Choices ch ON ch.Import_Id = q.Import_Id
+        GROUP BY q.Import_Id
+        HAVING COUNT(ch.Import_Id) < 2 OR SUM(CASE WHEN ch.Is_Correct = 1 THEN 1 ELSE 0 END) <> 1
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Question %d needs at least two choices with exactly one correct', 16, 1, @BadId)
+            RETURN
+        END
+        
+        DECLARE @Map TABLE (Import_Id INT PRIMARY KEY, Q_Id INT NOT NULL, First_Choice_Id INT NOT NULL)
+        
+        BEGIN TRANSACTION
+        
+        -- UPDLOCK + HOLDLOCK hold the range past each maximum until COMMIT
+        DECLARE @FirstQId INT = ISNULL((SELECT MAX(Q_Id) FROM Question WITH (UPDLOCK, HOLDLOCK)), 0) + 1
+        DECLARE @FirstChoiceId INT = ISNULL((SELECT MAX(Choice_Id) FROM Choice WITH (UPDLOCK, HOLDLOCK)), 0) + 1
+        
+        -- A question's choices take consecutive ids after those of the questions before it
+        INSERT INTO @Map (Import_Id, Q_Id, First_Choice_Id)
+        SELECT q.Import_Id,
+               @FirstQId + ROW_NUMBER() OVER (ORDER BY q.Import_Id) - 1,
+               @FirstChoiceId + ISNULL(SUM(counts.ChoiceCount) OVER (
+                   ORDER BY q.Import_Id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0)
+        FROM @Questions q
+        INNER JOIN (
+            SELECT Import_Id, COUNT(*) AS ChoiceCount
+            FROM @Choices
+            GROUP BY Import_Id
+        ) AS counts ON counts.Import_Id = q.Import_Id
+        
+        INSERT INTO Question (Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness, C_Id)
+        SELECT m.Q_Id, q.Q_Content, q.Q_Type, q.Q_Points, q.Q_hardness, q.C_Id
+        FROM @Questions q
+        INNER JOIN @Map m ON m.Import_Id = q.Import_Id
+        
+        INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content)
+        SELECT m.First_Choice_Id + ROW_NUMBER() OVER (PARTITION BY ch.Import_Id ORDER BY ch.Choice_No) - 1,
+               m.Q_Id, ch.Is_Correct, ch.Choice_Content
+        FROM @Choices ch
+        INNER JOIN @Map m ON m.Import_Id = ch.Import_Id
+        
+        COMMIT TRANSACTION
+        
+        SELECT m.Import_Id, m.Q_Id, m.First_Choice_Id, COUNT(*) AS ChoiceCount
+        FROM @Map m
+        INNER JOIN @Choices ch ON ch.Import_Id = m.Import_Id
+        GROUP BY m.Import_Id, m.Q_Id, m.First_Choice_Id
+        ORDER BY m.Import_Id
+    
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION
+        
+        DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE()
+        DECLARE @ErrorSeverity INT = ERROR_SEVERITY()
+        DECLARE @ErrorState INT = ERROR_STATE()
+        
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState)
+    END CATCH
+END
+GO
+
 -- ================================================
 -- EXAM PROCEDURES
 -- ================================================
@@ -1118,6 +1554,231 @@ BEGIN
 END
 GO
 
+-- Table-valued parameter types for batch exam generation: one row per exam to create,
+-- and optionally the exact questions of some of them (picked by the client to meet a
+-- difficulty mix or a total-marks target)
+IF NOT EXISTS (SELECT * FROM sys.types WHERE name = 'ExamRequestListType')
+BEGIN
+    CREATE TYPE ExamRequestListType AS TABLE
+    (
+        Request_Id INT NOT NULL PRIMARY KEY,
+        C_Id INT NOT NULL,
+        NumTrueFalse INT NOT NULL,
+        NumMCQ INT NOT NULL,
+        E_Title NVARCHAR(50) NULL,
+        E_Duaration FLOAT NULL,
+        E_Date DATE NULL
+    )
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.types WHERE name = 'ExamQuestionPlanType')
+BEGIN
+    CREATE TYPE ExamQuestionPlanType AS TABLE
+    (
+        Request_Id INT NOT NULL,
+        Q_Id INT NOT NULL,
+        PRIMARY KEY (Request_Id, Q_Id)
+    )
+END
+GO
+
+-- Create many exams in one call. Requests with rows in @Questions get exactly those
+-- questions; the others draw NumTrueFalse TF and NumMCQ MCQ questions of their course.
+-- Instead of sorting the pool by NEWID() per exam, each course's pool is numbered once
+-- and every request draws random ranks into it, redrawing only the duplicates, so the work
+-- grows with the questions picked rather than the pool size. Totals are computed before
+-- the insert, so there is no UPDATE.
+-- Returns Request_Id, E_Id, E_Total_Marks, QuestionCount per created exam
+CREATE PROCEDURE SP_GenerateExamsBulk
+    @Requests ExamRequestListType READONLY,
+    @Questions ExamQuestionPlanType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    BEGIN TRY
+        DECLARE @BadId INT
+        
+        SELECT TOP 1 @BadId = r.C_Id
+        FROM @Requests r
+        WHERE NOT EXISTS (SELECT 1 FROM Course c WHERE c.C_Id = r.C_Id)
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Course ID %d does not exist', 16, 1, @BadId)
+            RETURN
+        END
+        
+        SELECT TOP 1 @BadId = pq.Q_Id
+        FROM @Questions pq
+        LEFT JOIN @Requests r ON r.Request_Id = pq.Request_Id
+        LEFT JOIN Question q ON q.Q_Id = pq.Q_Id
+        WHERE r.Request_Id IS NULL OR q.Q_Id IS NULL OR q.C_Id <> r.C_Id
+        IF @BadId IS NOT NULL
+        BEGIN
+            RAISERROR('Question ID %d is not a question of its exam''s course', 16, 1, @BadId)
+            RETURN
+        END
+        
+        CREATE TABLE #Picked (
+            Request_Id INT NOT NULL,
+            Q_Id INT NOT NULL,
+            PRIMARY KEY (Request_Id, Q_Id)
+        )
+        
+        INSERT INTO #Picked (Request_Id, Q_Id)
+        SELECT Request_Id, Q_Id FROM @Questions
+        
+        -- Pools of the courses that need a random draw, numbered once per (course, type)
+        CREATE TABLE #Pool (
+            C_Id INT NOT NULL,
+            Q_Type NVARCHAR(50) NOT NULL,
+            Pool_Rank INT NOT NULL,
+            Q_Id INT NOT NULL UNIQUE,
+            PRIMARY KEY (C_Id, Q_Type, Pool_Rank)
+        )
+        
+        INSERT INTO #Pool (C_Id, Q_Type, Pool_Rank, Q_Id)
+        SELECT q.C_Id, q.Q_Type,
+               ROW_NUMBER() OVER (PARTITION BY q.C_Id, q.Q_Type ORDER BY q.Q_Id),
+               q.Q_Id
+        FROM Question q
+        WHERE q.Q_Type IN ('TF', 'MCQ')
+          AND q.C_Id IN (
+              SELECT r.C_Id FROM @Requests r
+              WHERE NOT EXISTS (SELECT 1 FROM @Questions pq WHERE pq.Request_Id = r.Request_Id)
+          )
+        
+        CREATE TABLE #Wanted (
+            Request_Id INT NOT NULL,
+            Q_Type NVARCHAR(50) NOT NULL,
+            C_Id INT NOT NULL,
+            Wanted INT NOT NULL,
+            Pool_Count INT NOT NULL,
+            Picked INT NOT NULL,
+            PRIMARY KEY (Request_Id, Q_Type)
+        )
+        
+        INSERT INTO #Wanted (Request_Id, Q_Type, C_Id, Wanted, Pool_Count, Picked)
+        SELECT r.Request_Id, pools.Q_Type, r.C_Id,
+               CASE WHEN wanted.Num < pools.Pool_Count THEN wanted.Num ELSE pools.Pool_Count END,
+               pools.Pool_Count, 0
+        FROM @Requests r
+        CROSS APPLY (VALUES ('TF', r.NumTrueFalse), ('MCQ', r.NumMCQ)) AS wanted (Q_Type, Num)
+        INNER JOIN (
+            SELECT C_Id, Q_Type, COUNT(*) AS Pool_Count
+            FROM #Pool
+            GROUP BY C_Id, Q_Type
+        ) AS pools ON pools.C_Id = r.C_Id AND pools.Q_Type = wanted.Q_Type
+        WHERE wanted.Num > 0
+          AND NOT EXISTS (SELECT 1 FROM @Questions pq WHERE pq.Request_Id = r.Request_Id)
+        
+        -- Requests that want the whole pool take it as is
+        INSERT INTO #Picked (Request_Id, Q_Id)
+        SELECT w.Request_Id, p.Q_Id
+        FROM #Wanted w
+        INNER JOIN #Pool p ON p.C_Id = w.C_Id AND p.Q_Type = w.Q_Type
+        WHERE w.Wanted = w.Pool_Count
+        
+        UPDATE #Wanted SET Picked = Wanted WHERE Wanted = Pool_Count
+        
+        -- One row per draw still needed (at most the largest Wanted)
+        DECLARE @MaxWanted INT = ISNULL((SELECT MAX(Wanted) FROM #Wanted WHERE Picked < Wanted), 0)
+        
+        SELECT TOP (@MaxWanted) ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS N
+        INTO #Tally
+        FROM sys.all_columns a CROSS JOIN sys.all_columns b
+        
+        CREATE TABLE #Draws (
+            Request_Id INT NOT NULL,
+            C_Id INT NOT NULL,
+            Q_Type NVARCHAR(50) NOT NULL,
+            Pool_Rank INT NOT NULL
+        )
+        
+        -- Each round draws one random rank per missing question; ranks already picked (or
+        -- drawn twice) are dropped and redrawn in the next round
+        WHILE EXISTS (SELECT 1 FROM #Wanted WHERE Picked < Wanted)
+        BEGIN
+            TRUNCATE TABLE #Draws
+            
+            INSERT INTO #Draws (Request_Id, C_Id, Q_Type, Pool_Rank)
+            SELECT w.Request_Id, w.C_Id, w.Q_Type, ABS(CHECKSUM(NEWID())) % w.Pool_Count + 1
+            FROM #Wanted w
+            INNER JOIN #Tally t ON t.N <= w.Wanted - w.Picked
+            WHERE w.Picked < w.Wanted
+            
+            INSERT INTO #Picked (Request_Id, Q_Id)
+            SELECT DISTINCT d.Request_Id, p.Q_Id
+            FROM #Draws d
+            INNER JOIN #Pool p ON p.C_Id = d.C_Id AND p.Q_Type = d.Q_Type AND p.Pool_Rank = d.Pool_Rank
+            WHERE NOT EXISTS (SELECT 1 FROM #Picked x WHERE x.Request_Id = d.Request_Id AND x.Q_Id = p.Q_Id)
+            
+            UPDATE w
+            SET Picked = counts.Picked
+            FROM #Wanted w
+            INNER JOIN (
+                SELECT x.Request_Id, p.Q_Type, COUNT(*) AS Picked
+                FROM #Picked x
+                INNER JOIN #Pool p ON p.Q_Id = x.Q_Id
+                GROUP BY x.Request_Id, p.Q_Type
+            ) AS counts ON counts.Request_Id = w.Request_Id AND counts.Q_Type = w.Q_Type
+            WHERE w.Picked < w.Wanted
+        END
+        
+        DECLARE @Created TABLE (Request_Id INT PRIMARY KEY, E_Id INT NOT NULL)
+        
+        BEGIN TRANSACTION
+        
+        -- MERGE (unlike INSERT) can OUTPUT source columns, mapping each request to its new E_Id
+        MERGE Exam AS target
+        USING (
+            SELECT r.Request_Id, r.C_Id,
+                   ISNULL(r.E_Title, 'Auto Generated Exam') AS E_Title,
+                   ISNULL(r.E_Duaration, 60) AS E_Duaration,
+                   ISNULL(r.E_Date, CAST(GETDATE() AS DATE)) AS E_Date,
+                   ISNULL(totals.Total_Marks, 0) AS E_Total_Marks
+            FROM @Requests r
+            LEFT JOIN (
+                SELECT p.Request_Id, SUM(q.Q_Points) AS Total_Marks
+                FROM #Picked p
+                INNER JOIN Question q ON q.Q_Id = p.Q_Id
+                GROUP BY p.Request_Id
+            ) AS totals ON totals.Request_Id = r.Request_Id
+        ) AS source
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (E_Title, E_Total_Marks, E_Duaration, E_Date, C_Id)
+            VALUES (source.E_Title, source.E_Total_Marks, source.E_Duaration, source.E_Date, source.C_Id)
+        OUTPUT source.Request_Id, inserted.E_Id INTO @Created (Request_Id, E_Id);
+        
+        INSERT INTO Exam_Questions (E_Id, Q_Id)
+        SELECT c.E_Id, p.Q_Id
+        FROM #Picked p
+        INNER JOIN @Created c ON c.Request_Id = p.Request_Id
+        
+        COMMIT TRANSACTION
+        
+        SELECT c.Request_Id, c.E_Id, e.E_Total_Marks,
+               (SELECT COUNT(*) FROM #Picked p WHERE p.Request_Id = c.Request_Id) AS QuestionCount
+        FROM @Created c
+        INNER JOIN Exam e ON e.E_Id = c.E_Id
+        ORDER BY c.Request_Id
+        
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION
+        
+        DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE()
+        DECLARE @ErrorSeverity INT = ERROR_SEVERITY()
+        DECLARE @ErrorState INT = ERROR_STATE()
+        
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState)
+    END CATCH
+END
+GO
+
 CREATE PROCEDURE SP_GetExamQuestions
     @ExamId INT
 AS
@@ -1198,10 +1859,70 @@ BEGIN
 END
 GO
 
+-- Keyset-paginated SP_GetAvailableExamsForStudent. Pass the E_Date, CourseName and E_Id
+-- of the previous page's last row (NULL @After_E_Id for the first page)
+CREATE PROCEDURE SP_GetAvailableExamsForStudentPage
+    @S_Id INT,
+    @After_Date DATE = NULL,
+    @After_CourseName NVARCHAR(100) = NULL,
+    @After_E_Id INT = NULL,
+    @PageSize INT = 500
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    IF NOT EXISTS (SELECT 1 FROM Student WHERE S_Id = @S_Id)
+    BEGIN
+        RAISERROR('Student ID %d does not exist', 16, 1, @S_Id)
+        RETURN
+    END
+    
+    -- Undated exams sort last, as they do in SP_GetAvailableExamsForStudent
+    SELECT TOP (@PageSize)
+        e.E_Id,
+        e.E_Title,
+        e.E_Total_Marks,
+        e.E_Duaration AS Duration_Minutes,
+        e.E_Date,
+        c.C_Name AS CourseName,
+        c.C_Id,
+        CASE 
+            WHEN se.E_Id IS NOT NULL THEN 'Taken'
+            ELSE 'Available'
+        END AS ExamStatus,
+        se.Grade,
+        se.Date_Taken,
+        (SELECT COUNT(*) FROM Exam_Questions WHERE E_Id = e.E_Id) AS TotalQuestions
+    FROM Student_Course sc
+    INNER JOIN Course c ON sc.Course_Id = c.C_Id
+    INNER JOIN Exam e ON c.C_Id = e.C_Id
+    LEFT JOIN Student_Exam se ON e.E_Id = se.E_Id AND se.S_Id = @S_Id
+    WHERE sc.S_Id = @S_Id
+      AND (@After_E_Id IS NULL
+           OR ISNULL(e.E_Date, '00010101') < ISNULL(@After_Date, '00010101')
+           OR (ISNULL(e.E_Date, '00010101') = ISNULL(@After_Date, '00010101')
+               AND ISNULL(c.C_Name, N'') > ISNULL(@After_CourseName, N''))
+           OR (ISNULL(e.E_Date, '00010101') = ISNULL(@After_Date, '00010101')
+               AND ISNULL(c.C_Name, N'') = ISNULL(@After_CourseName, N'')
+               AND e.E_Id > @After_E_Id))
+    ORDER BY ISNULL(e.E_Date, '00010101') DESC, ISNULL(c.C_Name, N''), e.E_Id
+END
+GO
+
 -- ================================================
 -- STUDENT EXAM ANSWER PROCEDURES
 -- ================================================
 
+-- Student_Answer ids come from a sequence so concurrent submissions (and the mock data
+-- loader) reserve disjoint ranges instead of racing on MAX(A_Id) + 1
+IF NOT EXISTS (SELECT * FROM sys.sequences WHERE name = 'Seq_Student_Answer_Id')
+BEGIN
+    DECLARE @FirstAId INT = ISNULL((SELECT MAX(A_Id) FROM Student_Answer), 0) + 1
+    EXEC('CREATE SEQUENCE dbo.Seq_Student_Answer_Id AS INT START WITH '
+         + CAST(@FirstAId AS VARCHAR(12)) + ' INCREMENT BY 1 CACHE 1000')
+END
+GO
+
 CREATE PROCEDURE SP_SubmitStudentAnswers
     @E_Id INT,
     @S_Id INT,
@@ -1236,7 +1957,16 @@ BEGIN
             RETURN
         END
         
-        DECLARE @NextAId INT = ISNULL((SELECT MAX(A_Id) FROM Student_Answer), 0) + 1
+        DECLARE @AnswerCount INT = (SELECT COUNT(*) FROM @Answers)
+        DECLARE @RangeFirst SQL_VARIANT
+        
+        IF @AnswerCount > 0
+            EXEC sp_sequence_get_range
+                @sequence_name = N'dbo.Seq_Student_Answer_Id',
+                @range_size = @AnswerCount,
+                @range_first_value = @RangeFirst OUTPUT
+        
+        DECLARE @NextAId INT = CAST(@RangeFirst AS INT)
         
         INSERT INTO Student_Answer (A_Id, Question_Id, Exam_Id, Choice_Id, S_Id)
         SELECT
@@ -1388,6 +2118,114 @@ BEGIN
 END
 GO
 
+-- Table-valued parameter type for a list of exam ids
+IF NOT EXISTS (SELECT * FROM sys.types WHERE name = 'ExamIdListType')
+BEGIN
+    CREATE TYPE ExamIdListType AS TABLE
+    (
+        E_Id INT PRIMARY KEY
+    )
+END
+GO
+
+-- Grade every submitted Student_Exam row of the given exams in one pass
+-- (same scoring as SP_CorrectExam, written with a single MERGE)
+CREATE PROCEDURE SP_CorrectExamsBulk
+    @ExamIds ExamIdListType READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- A DML OUTPUT on Student_Exam needs INTO: the table has a trigger
+    DECLARE @Graded TABLE (S_Id INT NOT NULL, E_Id INT NOT NULL, Grade DECIMAL(5,2) NULL)
+
+    BEGIN TRY
+        BEGIN TRANSACTION
+
+        ;WITH Submissions AS (
+            SELECT se.S_Id, se.E_Id
+            FROM Student_Exam se
+            INNER JOIN @ExamIds ids ON ids.E_Id = se.E_Id
+            UNION
+            SELECT sa.S_Id, sa.Exam_Id
+            FROM Student_Answer sa
+            INNER JOIN @ExamIds ids ON ids.E_Id = sa.Exam_Id
+        ),
+        ExamTotals AS (
+            SELECT eq.E_Id, SUM(q.Q_Points) AS TotalPoints
+            FROM Exam_Questions eq
+            INNER JOIN @ExamIds ids ON ids.E_Id = eq.E_Id
+            INNER JOIN Question q ON eq.Q_Id = q.Q_Id
+            GROUP BY eq.E_Id
+        ),
+        Earned AS (
+            SELECT
+                s.S_Id,
+                s.E_Id,
+                SUM(
+                    CASE
+                        WHEN sc.Choice_Id = cc.Choice_Id THEN q.Q_Points
+                        ELSE 0
+                    END
+                ) AS EarnedPoints
+            FROM Submissions s
+            INNER JOIN Exam_Questions eq ON eq.E_Id = s.E_Id
+            INNER JOIN Question q ON eq.Q_Id = q.Q_Id
+            LEFT JOIN Student_Answer sa
+                ON sa.Question_Id = q.Q_Id
+                AND sa.Exam_Id = s.E_Id
+                AND sa.S_Id = s.S_Id
+            LEFT JOIN Choice sc
+                ON sc.Choice_Id = sa.Choice_Id
+                AND sc.Q_Id = q.Q_Id
+            INNER JOIN Choice cc
+                ON cc.Q_Id = q.Q_Id
+                AND cc.Is_Correct = 1
+            GROUP BY s.S_Id, s.E_Id
+        ),
+        Grades AS (
+            SELECT
+                s.S_Id,
+                s.E_Id,
+                CAST(
+                    CASE
+                        WHEN t.TotalPoints = 0 THEN 0
+                        ELSE (e.EarnedPoints / t.TotalPoints) * 100
+                    END AS DECIMAL(5,2)
+                ) AS Grade
+            FROM Submissions s
+            LEFT JOIN ExamTotals t ON t.E_Id = s.E_Id
+            LEFT JOIN Earned e ON e.S_Id = s.S_Id AND e.E_Id = s.E_Id
+        )
+        MERGE Student_Exam AS target
+        USING Grades AS source
+            ON target.S_Id = source.S_Id AND target.E_Id = source.E_Id
+        WHEN MATCHED THEN
+            UPDATE SET Grade = source.Grade,
+                       Date_Taken = GETDATE()
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (S_Id, E_Id, Grade, Date_Taken)
+            VALUES (source.S_Id, source.E_Id, source.Grade, GETDATE())
+        OUTPUT inserted.S_Id, inserted.E_Id, inserted.Grade INTO @Graded (S_Id, E_Id, Grade);
+
+        COMMIT TRANSACTION
+
+        SELECT S_Id, E_Id, Grade
+        FROM @Graded
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION
+
+        DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE()
+        DECLARE @ErrorSeverity INT = ERROR_SEVERITY()
+        DECLARE @ErrorState INT = ERROR_STATE()
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState)
+    END CATCH
+END
+GO
+
 -- ================================================
 -- API HELPER PROCEDURES
 -- ================================================
@@ -0,0 +1,59 @@
+-- ============================================
+-- SUPPORTING INDEXES - v1
+-- Nonclustered indexes for the hot exam procedures. Safe to re-run: every index is
+-- created only if missing. Measure their effect with index_advisor.py.
+--
+-- Student_Course (S_Id, Course_Id) and Student_Exam (S_Id, E_Id) are already served by
+-- their primary keys, so they get no duplicate index here.
+-- ============================================
+
+-- ================================================
+-- SP_LoginStudent
+-- ================================================
+
+-- Email lookup, covering the columns the login returns
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Student_S_Email')
+    CREATE NONCLUSTERED INDEX IX_Student_S_Email ON Student (S_Email) INCLUDE (Password, S_FName, S_LName)
+GO
+
+-- ================================================
+-- SP_GetAvailableExamsForStudent
+-- ================================================
+
+-- Exams of the student's courses
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Exam_C_Id')
+    CREATE NONCLUSTERED INDEX IX_Exam_C_Id ON Exam (C_Id) INCLUDE (E_Title, E_Total_Marks, E_Duaration, E_Date)
+GO
+
+-- ================================================
+-- SP_CorrectExam / SP_CorrectExamsBulk
+-- ================================================
+
+-- Questions of an exam (also the TotalQuestions count above)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Exam_Questions_E_Id')
+    CREATE NONCLUSTERED INDEX IX_Exam_Questions_E_Id ON Exam_Questions (E_Id, Q_Id)
+GO
+
+-- Correct choice(s) of a question
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Choice_Q_Id_Is_Correct')
+    CREATE NONCLUSTERED INDEX IX_Choice_Q_Id_Is_Correct ON Choice (Q_Id, Is_Correct) INCLUDE (Choice_Content)
+GO
+
+-- One student's answers to one exam
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Student_Answer_S_Id_Exam_Id')
+    CREATE NONCLUSTERED INDEX IX_Student_Answer_S_Id_Exam_Id ON Student_Answer (S_Id, Exam_Id, Question_Id) INCLUDE (Choice_Id)
+GO
+
+-- Submissions of an exam (bulk grading filters Student_Exam by E_Id only)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Student_Exam_E_Id')
+    CREATE NONCLUSTERED INDEX IX_Student_Exam_E_Id ON Student_Exam (E_Id) INCLUDE (Grade, Date_Taken)
+GO
+
+-- ================================================
+-- SP_GetStudentsByDepartmentPage
+-- ================================================
+
+-- Department listing in page order; the clustered S_Id key completes the keyset
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Student_Dep_Id_Name')
+    CREATE NONCLUSTERED INDEX IX_Student_Dep_Id_Name ON Student (Dep_Id, S_LName, S_FName) INCLUDE (S_Age, S_Email, S_GPA, Track_Id)
+GO
@@ -0,0 +1,169 @@
+"""
+ITI Database - Answer Id Stress Test
+Many concurrent submissions of Student_Answer rows, with ids either reserved from the
+answer id sequence (SP_SubmitStudentAnswers) or allocated the old way with MAX(A_Id) + 1
+inside the submitting transaction. Reports throughput, errors, id collisions and a
+duplicate check over the rows the run wrote.
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from connection_pool import ConnectionPool
+from insert_egyptian_mock_data_v2 import (DatabaseConnection, add_connection_arguments, add_latency_arguments,
+                                          make_backend)
+
+def submit_with_sequence(db: DatabaseConnection, e_id, s_id, answers):
+    """One SP_SubmitStudentAnswers call: ids come from sp_sequence_get_range inside the procedure"""
+    db.call_procedure("SP_SubmitStudentAnswers", e_id, s_id, answers)
+    db.commit()
+
+def submit_with_max_id(db: DatabaseConnection, e_id, s_id, answers):
+    """The pre-sequence allocation: read MAX(A_Id) + 1, then insert from there in the same transaction"""
+    db.cursor.execute("SELECT COALESCE(MAX(A_Id), 0) + 1 FROM Student_Answer")
+    next_a_id = db.cursor.fetchone()[0]
+    # The INSERT is a second round trip; other sessions read the same MAX meanwhile
+    db.cursor.executemany(
+        "INSERT INTO Student_Answer (A_Id, Question_Id, Exam_Id, Choice_Id, S_Id) VALUES (?, ?, ?, ?, ?)",
+        [(next_a_id + i, q_id, e_id, choice_id, s_id)
+         for i, (q_id, choice_id) in enumerate(sorted(answers, key=lambda answer: answer[0]))]
+    )
+    db.cursor.execute("UPDATE Student_Exam SET Date_Taken = ? WHERE S_Id = ? AND E_Id = ?",
+                      (time.strftime('%Y-%m-%d'), s_id, e_id))
+    db.commit()
+
+ALLOCATION_MODES = {'sequence': submit_with_sequence, 'max-id': submit_with_max_id}
+
+def is_collision(error):
+    """Primary key violation on Student_Answer (SQL Server 2627, SQLite UNIQUE constraint)"""
+    text = str(error)
+    return ("PRIMARY KEY" in text or "UNIQUE constraint" in text or "2627" in text
+            or type(error).__name__ == "IntegrityError")
+
+def load_submissions(db: DatabaseConnection, count, rng):
+    """`count` (E_Id, S_Id, answers) submissions for existing Student_Exam rows"""
+    db.cursor.execute("SELECT Q_Id, Choice_Id FROM Choice")
+    choices = defaultdict(list)
+    for q_id, choice_id in db.cursor.fetchall():
+        choices[q_id].append(choice_id)
+    db.cursor.execute("SELECT E_Id, Q_Id FROM Exam_Questions")
+    questions = defaultdict(list)
+    for e_id, q_id in db.cursor.fetchall():
+        if choices.get(q_id):
+            questions[e_id].append(q_id)
+    db.cursor.execute("SELECT S_Id, E_Id FROM Student_Exam")
+    taken = [(s_id, e_id) for s_id, e_id in db.cursor.fetchall() if questions.get(e_id)]
+    if not taken:
+        return []
+    return [
+        (e_id, s_id, [(q_id, rng.choice(choices[q_id])) for q_id in questions[e_id]])
+        for s_id, e_id in (rng.choice(taken) for _ in range(count))
+    ]
+
+def run_stress(pool: ConnectionPool, submit, submissions, workers):
+    """Submit everything with `workers` threads; returns (outcome counters, answer rows committed, errors seen)"""
+    outcome = defaultdict(int)
+    examples = {}  # error type -> first message of that type
+    committed_rows = 0
+    lock = threading.Lock()
+
+    def one(submission):
+        nonlocal committed_rows
+        e_id, s_id, answers = submission
+        try:
+            with pool.connection() as db:
+                submit(db, e_id, s_id, answers)
+        except Exception as e:
+            with lock:
+                outcome['collisions' if is_collision(e) else 'errors'] += 1
+                examples.setdefault(type(e).__name__, str(e)[:100])
+            return
+        with lock:
+            outcome['submitted'] += 1
+            committed_rows += len(answers)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="answer-stress") as executor:
+        list(executor.map(one, submissions))
+    return outcome, committed_rows, examples
+
+def check_written_rows(db: DatabaseConnection, first_new_id, expected_rows):
+    """(rows written above the pre-test MAX(A_Id), duplicated A_Ids) - duplicates must be 0"""
+    db.cursor.execute("SELECT COUNT(*) FROM Student_Answer WHERE A_Id >= ?", (first_new_id,))
+    written = db.cursor.fetchone()[0]
+    db.cursor.execute("""
+        SELECT COUNT(*) FROM (
+            SELECT A_Id FROM Student_Answer WHERE A_Id >= ? GROUP BY A_Id HAVING COUNT(*) > 1
+        ) AS dup
+    """, (first_new_id,))
+    duplicates = db.cursor.fetchone()[0]
+    if written != expected_rows:
+        print(f"   ⚠️  {written} rows written, but committed submissions account for {expected_rows}")
+    return written, duplicates
+
+def realign_sequence(db: DatabaseConnection):
+    """Restart the answer id sequence after MAX(A_Id) (max-id mode writes ids it never reserved)"""
+    db.cursor.execute("SELECT COALESCE(MAX(A_Id), 0) + 1 FROM Student_Answer")
+    next_id = db.cursor.fetchone()[0]
+    db.restart_ids("Student_Answer", next_id)
+    db.commit()
+    return next_id
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress concurrent answer submission and id allocation')
+    add_connection_arguments(parser)
+    parser.add_argument('--modes', default='max-id,sequence',
+                        help=f"Comma-separated allocation modes to compare ({', '.join(ALLOCATION_MODES)})")
+    parser.add_argument('--submissions', type=int, default=500, help='Submissions per mode')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent submitting sessions')
+    add_latency_arguments(parser)
+    parser.add_argument('--seed', type=int, help='Seed for the submitted answers')
+    parser.add_argument('--cleanup', action='store_true', help='Delete the answers written by the test')
+    args = parser.parse_args()
+    modes = args.modes.split(',')
+    for mode in modes:
+        if mode not in ALLOCATION_MODES:
+            parser.error(f"unknown mode {mode!r}")
+
+    backend = make_backend(args)
+    pool = ConnectionPool(backend, min_size=1, max_size=args.workers,
+                          simulated_latency=args.simulated_latency_ms / 1000)
+    try:
+        with pool.connection() as db:
+            submissions = load_submissions(db, args.submissions, random.Random(args.seed))
+            db.cursor.execute("SELECT COALESCE(MAX(A_Id), 0) FROM Student_Answer")
+            pre_test_max = db.cursor.fetchone()[0]
+        if not submissions:
+            print("❌ No taken exams with answerable questions found - seed the database first")
+            return
+
+        print(f"\n🧪 {len(submissions)} submissions per mode, {args.workers} concurrent sessions "
+              f"({backend.name}, {args.simulated_latency_ms:g} ms simulated latency)")
+        print(f"\n   {'mode':<10} {'submits/s':>10} {'submitted':>10} {'collisions':>11} "
+              f"{'errors':>7} {'duplicates':>11}")
+        for mode in modes:
+            with pool.connection() as db:
+                first_new_id = realign_sequence(db)
+            started = time.perf_counter()
+            outcome, committed_rows, examples = run_stress(pool, ALLOCATION_MODES[mode], submissions, args.workers)
+            elapsed = time.perf_counter() - started
+            with pool.connection() as db:
+                _, duplicates = check_written_rows(db, first_new_id, committed_rows)
+            print(f"   {mode:<10} {outcome['submitted'] / elapsed:>10,.1f} {outcome['submitted']:>10} "
+                  f"{outcome['collisions']:>11} {outcome['errors']:>7} {duplicates:>11}")
+            for error_type, message in examples.items():
+                print(f"      ⚠️  e.g. {error_type}: {message}")
+
+        with pool.connection() as db:
+            if args.cleanup:
+                db.cursor.execute("DELETE FROM Student_Answer WHERE A_Id > ?", (pre_test_max,))
+                print(f"\n🧹 Deleted the answers written by the test (A_Id > {pre_test_max})")
+            realign_sequence(db)
+    finally:
+        pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Shared pytest fixtures: one small seeded SQLite database per session, copied for each
+test module that changes it
+"""
+
+import shutil
+
+import pytest
+
+from insert_egyptian_mock_data_v2 import DatabaseConnection, build_pipeline, make_backend, parse_args, run_pipeline
+
+SEED_ARGS = ['--seed', '13', '--students', '60', '--exam-takers', '40', '--reference-date', '2025-01-15']
+
+def sqlite_connection(path):
+    """A connected DatabaseConnection on the SQLite file at path"""
+    db = DatabaseConnection(make_backend(parse_args(['--backend', 'sqlite', '--sqlite-path', path])), verbose=False)
+    assert db.connect()
+    return db
+
+@pytest.fixture(scope="session")
+def seeded_db_path(tmp_path_factory):
+    """Path of a freshly seeded SQLite database (treat as read-only; copy it to modify)"""
+    path = str(tmp_path_factory.mktemp("seeded") / "iti.db")
+    args = parse_args(['--backend', 'sqlite', '--sqlite-path', path, *SEED_ARGS])
+    seeder = DatabaseConnection(make_backend(args), verbose=False)
+    assert seeder.connect()
+    seeder.disable_constraints()
+    run_pipeline(build_pipeline(args), [seeder], args.seed)
+    seeder.close()
+    return path
+
+@pytest.fixture(scope="module")
+def db_copy(seeded_db_path, tmp_path_factory):
+    """A connection to a private copy of the seeded database, for one test module"""
+    path = str(tmp_path_factory.mktemp("copy") / "iti.db")
+    shutil.copyfile(seeded_db_path, path)
+    db = sqlite_connection(path)
+    yield db
+    db.close()
@@ -0,0 +1,149 @@
+"""
+ITI Database - Connection Pool
+Thread-safe pool of DatabaseConnection objects with min/max size, health checks on
+idle connections and acquire timeouts
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from insert_egyptian_mock_data_v2 import DatabaseConnection
+
+class PoolTimeout(TimeoutError):
+    """No connection became available within the acquire timeout"""
+
+class ConnectionPool:
+    """Hands out up to max_size connections to one backend, keeping min_size open
+
+    Connections idle for longer than health_check_after seconds are pinged before being
+    handed out again; dead ones are replaced. Released connections are rolled back so no
+    open transaction leaks to the next borrower.
+    """
+    def __init__(self, backend, min_size=1, max_size=10, acquire_timeout=30.0,
+                 health_check_after=30.0, batch_size=1000, query_stats=None, simulated_latency=0.0):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+        self.backend = backend
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_after = health_check_after
+        self.batch_size = batch_size
+        self.query_stats = query_stats  # QueryStats shared by every pooled connection, or None
+        self.simulated_latency = simulated_latency  # seconds per round trip on every pooled connection
+        self._idle = deque()  # (connection, released_at), most recently used last
+        self._size = 0  # open connections, idle or in use (including ones being opened)
+        self._closed = False
+        self._available = threading.Condition()
+        self.created = self.discarded = self.waits = self.timeouts = 0
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+            self._size += 1
+
+    def _open(self):
+        db = DatabaseConnection(self.backend, batch_size=self.batch_size, verbose=False, stats=self.query_stats,
+                                simulated_latency=self.simulated_latency)
+        if not db.connect():
+            raise ConnectionError(f"Could not open a {self.backend.name} connection")
+        self.created += 1
+        return db
+
+    def _discard(self, db):
+        try:
+            db.close()
+        except Exception:
+            pass
+        self.discarded += 1
+
+    def acquire(self, timeout=None):
+        """Borrow a connection, waiting up to `timeout` (default acquire_timeout) seconds"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    db, released_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    db = released_at = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(f"No connection available within {timeout:.1f}s "
+                                      f"(pool size {self.max_size})")
+                self.waits += 1
+                self._available.wait(remaining)
+
+        # Opening and pinging happen outside the lock so other borrowers are not blocked
+        try:
+            if db is not None and time.monotonic() - released_at > self.health_check_after:
+                if not db.ping():
+                    self._discard(db)
+                    db = None
+            return db or self._open()
+        except Exception:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+
+    def release(self, db, broken=False):
+        """Return a borrowed connection; broken ones are closed instead of reused"""
+        if not broken:
+            try:
+                db.rollback()
+            except Exception:
+                broken = True
+        with self._available:
+            if broken or self._closed:
+                self._size -= 1
+                self._discard(db)
+            else:
+                self._idle.append((db, time.monotonic()))
+            self._available.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """with pool.connection() as db: ... - released (rolled back) on exit"""
+        db = self.acquire(timeout)
+        broken = False
+        try:
+            yield db
+        except Exception:
+            # A connection that fails its health check after an error is not reused
+            broken = not db.ping()
+            raise
+        finally:
+            self.release(db, broken)
+
+    def close(self):
+        """Close idle connections now and in-use ones as they are released"""
+        with self._available:
+            self._closed = True
+            while self._idle:
+                db, _ = self._idle.popleft()
+                self._size -= 1
+                self._discard(db)
+            self._available.notify_all()
+
+    def stats(self):
+        with self._available:
+            idle = len(self._idle)
+            size = self._size
+        return {
+            'size': size, 'idle': idle, 'in_use': size - idle, 'min_size': self.min_size,
+            'max_size': self.max_size, 'created': self.created, 'discarded': self.discarded,
+            'waits': self.waits, 'timeouts': self.timeouts,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
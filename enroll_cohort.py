@@ -0,0 +1,115 @@
+"""
+ITI Database - Cohort Enrollment
+Streams an intake cohort into SP_EnrollStudentsBulk in batches (one set-based insert per
+batch, existing enrollments skipped), or enrolls it the old way with one procedure call
+per student for comparison
+"""
+
+import argparse
+import csv
+import time
+from itertools import islice
+
+from insert_egyptian_mock_data_v2 import DatabaseConnection, add_connection_arguments, make_backend, parse_id_range
+
+DEFAULT_BATCH_SIZE = 5000
+ENROLLMENT_COLUMNS = ("S_Id", "Track_Id", "Course_Id", "Enrollment_Date")
+
+def read_cohort_csv(path):
+    """Yield EnrollmentListType rows from a CSV with a header naming any of ENROLLMENT_COLUMNS"""
+    with open(path, newline='', encoding='utf-8') as f:
+        for record in csv.DictReader(f):
+            values = {column: (record.get(column) or '').strip() or None for column in ENROLLMENT_COLUMNS}
+            yield (
+                int(values["S_Id"]),
+                int(values["Track_Id"]) if values["Track_Id"] else None,
+                int(values["Course_Id"]) if values["Course_Id"] else None,
+                values["Enrollment_Date"],
+            )
+
+def track_cohort(student_ids, track_id, enrollment_date=None):
+    """Yield one row per student enrolling them in every course of track_id"""
+    for s_id in student_ids:
+        yield (s_id, track_id, None, enrollment_date)
+
+def enroll_in_batches(db: DatabaseConnection, enrollments, batch_size=DEFAULT_BATCH_SIZE):
+    """Send enrollments to SP_EnrollStudentsBulk batch_size rows at a time, committing each batch
+
+    enrollments may be any iterable (e.g. a generator over a large CSV); only one batch is
+    held in memory. Returns {'batches', 'requested', 'enrolled'}.
+    """
+    totals = {'batches': 0, 'requested': 0, 'enrolled': 0}
+    enrollments = iter(enrollments)
+    while True:
+        batch = list(islice(enrollments, batch_size))
+        if not batch:
+            break
+        requested, enrolled = db.enroll_students_bulk(batch)
+        db.commit()
+        totals['batches'] += 1
+        totals['requested'] += requested
+        totals['enrolled'] += enrolled
+    return totals
+
+def enroll_one_by_one(db: DatabaseConnection, enrollments):
+    """The per-student path: SP_EnrollStudentInTrackCourses / SP_EnrollStudentInCourse per row"""
+    db.cursor.execute("SELECT COUNT(*) FROM Student_Course")
+    before = db.cursor.fetchone()[0]
+    calls = 0
+    for s_id, track_id, course_id, enrollment_date in enrollments:
+        if track_id is not None:
+            db.call_procedure("SP_EnrollStudentInTrackCourses", s_id, track_id)
+        else:
+            db.cursor.execute("SELECT 1 FROM Student_Course WHERE S_Id = ? AND Course_Id = ?", (s_id, course_id))
+            if db.cursor.fetchone() is None:
+                db.call_procedure("SP_EnrollStudentInCourse", s_id, course_id, enrollment_date)
+        db.commit()
+        calls += 1
+    db.cursor.execute("SELECT COUNT(*) FROM Student_Course")
+    return {'calls': calls, 'enrolled': db.cursor.fetchone()[0] - before}
+
+def main():
+    parser = argparse.ArgumentParser(description='Enroll an intake cohort in bulk')
+    add_connection_arguments(parser)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', help=f"CSV file with columns {', '.join(ENROLLMENT_COLUMNS)}")
+    source.add_argument('--track', type=int, help='Enroll --student-range in every course of this track')
+    parser.add_argument('--student-range', default='1-500', help='S_Id range for --track, e.g. 1-500')
+    parser.add_argument('--enrollment-date', help='Enrollment date for --track (default: today)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Rows per SP_EnrollStudentsBulk call')
+    parser.add_argument('--method', choices=['bulk', 'loop'], default='bulk',
+                        help='bulk = SP_EnrollStudentsBulk batches, loop = one procedure call per row')
+    args = parser.parse_args()
+
+    db = DatabaseConnection(make_backend(args))
+    if not db.connect():
+        return
+
+    if args.csv:
+        enrollments = read_cohort_csv(args.csv)
+    else:
+        enrollments = track_cohort(parse_id_range(args.student_range), args.track, args.enrollment_date)
+
+    try:
+        started = time.perf_counter()
+        if args.method == 'bulk':
+            print(f"\n🚀 Enrolling in batches of {args.batch_size} (SP_EnrollStudentsBulk)...")
+            totals = enroll_in_batches(db, enrollments, args.batch_size)
+            print(f"   ✅ {totals['enrolled']} new enrollments of {totals['requested']} requested "
+                  f"({totals['requested'] - totals['enrolled']} already existed) in {totals['batches']} batches")
+        else:
+            print("\n🐢 Enrolling one row at a time...")
+            totals = enroll_one_by_one(db, enrollments)
+            print(f"   ✅ {totals['enrolled']} new enrollments from {totals['calls']} procedure calls")
+        elapsed = time.perf_counter() - started
+        print(f"\n⏱️  {elapsed:.2f}s, {db.round_trips} round trips")
+    except Exception as e:
+        print(f"\n❌ Error occurred: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
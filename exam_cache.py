@@ -0,0 +1,204 @@
+"""
+ITI Database - Exam Content Cache
+Keeps the question/choice tree of recently opened exams in memory so students opening the
+same exam do not re-run SP_GetExamQuestionsWithChoices each time
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from insert_egyptian_mock_data_v2 import DatabaseConnection, add_connection_arguments, make_backend
+
+DEFAULT_MAX_EXAMS = 256
+
+class ExamContentCache:
+    """LRU cache of parsed exam content keyed by E_Id
+
+    Registers itself as a procedure listener on `db`, so calls to SP_UpdateQuestion,
+    SP_UpdateChoice, SP_DeleteQuestion and SP_UpdateExam made through that connection
+    drop every cached exam they touch. Cached trees are shared; treat them as read-only.
+    """
+    def __init__(self, db: DatabaseConnection, max_exams=DEFAULT_MAX_EXAMS):
+        self.db = db
+        self.max_exams = max_exams
+        self._exams = OrderedDict()  # E_Id -> exam tree, least recently used first
+        self._exams_by_question = {}  # Q_Id -> E_Ids of cached exams using it
+        self._question_by_choice = {}  # Choice_Id -> Q_Id, for cached exams
+        self._version = 0  # bumped by every invalidation, so stale loads are not stored
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        db.add_procedure_listener(self.on_procedure)
+
+    def get(self, e_id):
+        """Exam content for e_id, loading it with SP_GetExamQuestionsWithChoices on a miss"""
+        with self._lock:
+            exam = self._exams.get(e_id)
+            if exam is not None:
+                self._exams.move_to_end(e_id)
+                self.hits += 1
+                return exam
+            self.misses += 1
+            version = self._version
+
+        exam = parse_exam_content(e_id, self.db.call_procedure("SP_GetExamQuestionsWithChoices", e_id))
+
+        with self._lock:
+            if version == self._version:
+                self._store(e_id, exam)
+        return exam
+
+    def _store(self, e_id, exam):
+        self._exams[e_id] = exam
+        self._exams.move_to_end(e_id)
+        for question in exam['Questions']:
+            self._exams_by_question.setdefault(question['Q_Id'], set()).add(e_id)
+            for choice in question['Choices']:
+                self._question_by_choice[choice['Choice_Id']] = question['Q_Id']
+        while len(self._exams) > self.max_exams:
+            old_id, old_exam = self._exams.popitem(last=False)
+            self._forget(old_id, old_exam)
+            self.evictions += 1
+
+    def _forget(self, e_id, exam):
+        """Drop the reverse-index entries of an exam that left the cache"""
+        for question in exam['Questions']:
+            exam_ids = self._exams_by_question.get(question['Q_Id'], set())
+            exam_ids.discard(e_id)
+            if not exam_ids:
+                self._exams_by_question.pop(question['Q_Id'], None)
+                for choice in question['Choices']:
+                    self._question_by_choice.pop(choice['Choice_Id'], None)
+
+    def invalidate_exam(self, e_id):
+        with self._lock:
+            self._version += 1
+            exam = self._exams.pop(e_id, None)
+            if exam is not None:
+                self._forget(e_id, exam)
+                self.invalidations += 1
+
+    def invalidate_question(self, q_id):
+        """Drop every cached exam that contains question q_id"""
+        with self._lock:
+            exam_ids = list(self._exams_by_question.get(q_id, ()))
+        for e_id in exam_ids:
+            self.invalidate_exam(e_id)
+        with self._lock:
+            self._version += 1
+
+    def invalidate_choice(self, choice_id, q_id=None):
+        """Drop cached exams showing the choice, or the question it is being moved to"""
+        with self._lock:
+            old_q_id = self._question_by_choice.get(choice_id)
+        for question_id in {old_q_id, q_id} - {None}:
+            self.invalidate_question(question_id)
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._exams.clear()
+            self._exams_by_question.clear()
+            self._question_by_choice.clear()
+
+    def on_procedure(self, name, params):
+        """Procedure listener: invalidate the exams a content-changing call touched"""
+        if name == "SP_UpdateExam":
+            self.invalidate_exam(params[0])
+        elif name in ("SP_UpdateQuestion", "SP_DeleteQuestion"):
+            self.invalidate_question(params[0])
+        elif name == "SP_UpdateChoice":
+            self.invalidate_choice(params[0], params[1])
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        with self._lock:
+            size = len(self._exams)
+        return {
+            'size': size, 'max_exams': self.max_exams, 'hits': self.hits, 'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4), 'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+def parse_exam_content(e_id, rows):
+    """Turn SP_GetExamQuestionsWithChoices rows into {E_Id, Questions: [{..., Choices: [...]}]}"""
+    questions = {}
+    for _, q_id, content, q_type, points, choice_id, choice_content, is_correct in rows:
+        question = questions.get(q_id)
+        if question is None:
+            question = questions[q_id] = {
+                'Q_Id': q_id, 'Q_Content': content, 'Q_Type': q_type, 'Q_Points': points, 'Choices': []
+            }
+        # LEFT JOIN: a question without choices comes back with NULL choice columns
+        if choice_id is not None:
+            question['Choices'].append(
+                {'Choice_Id': choice_id, 'Choice_Content': choice_content, 'Is_Correct': bool(is_correct)}
+            )
+    return {'E_Id': e_id, 'Questions': list(questions.values())}
+
+# ============================================================================
+# MAIN FUNCTION (simulated exam session)
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate students opening exams through the cache')
+    add_connection_arguments(parser)
+    parser.add_argument('--opens', type=int, default=5000, help='Number of exam opens to simulate')
+    parser.add_argument('--max-exams', type=int, default=DEFAULT_MAX_EXAMS, help='Cache size limit')
+    parser.add_argument('--edit-every', type=int, default=500,
+                        help='Re-save one question through SP_UpdateQuestion every N opens (0 = never)')
+    parser.add_argument('--seed', type=int, help='Seed for the simulated access pattern')
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    db = DatabaseConnection(make_backend(args))
+    if not db.connect():
+        return
+
+    try:
+        db.cursor.execute("SELECT DISTINCT E_Id FROM Exam_Questions ORDER BY E_Id")
+        exam_ids = [row[0] for row in db.cursor.fetchall()]
+        if not exam_ids:
+            print("❌ No exams with questions found - seed the database first")
+            return
+        picks = [rng.choice(exam_ids) for _ in range(args.opens)]
+
+        print(f"\n📖 Opening {args.opens} exams without the cache...")
+        started = time.perf_counter()
+        for e_id in picks:
+            parse_exam_content(e_id, db.call_procedure("SP_GetExamQuestionsWithChoices", e_id))
+        uncached_seconds = time.perf_counter() - started
+        print(f"   ✅ {uncached_seconds:.2f}s")
+
+        print(f"\n⚡ Opening {args.opens} exams through the cache...")
+        cache = ExamContentCache(db, max_exams=args.max_exams)
+        started = time.perf_counter()
+        for i, e_id in enumerate(picks, 1):
+            exam = cache.get(e_id)
+            if args.edit_every and i % args.edit_every == 0 and exam['Questions']:
+                # Re-save a question unchanged: content is the same, but the cache must drop it
+                db.cursor.execute(
+                    "SELECT Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness FROM Question WHERE Q_Id = ?",
+                    (exam['Questions'][0]['Q_Id'],)
+                )
+                db.call_procedure("SP_UpdateQuestion", *db.cursor.fetchone())
+        db.commit()
+        cached_seconds = time.perf_counter() - started
+        print(f"   ✅ {cached_seconds:.2f}s")
+
+        print("\n📊 Cache statistics:")
+        for key, value in cache.stats().items():
+            print(f"   • {key}: {value}")
+        if cached_seconds:
+            print(f"\n⏱️  {uncached_seconds / cached_seconds:.1f}x faster with the cache")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
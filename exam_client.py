@@ -0,0 +1,132 @@
+"""
+ITI Database - Async Exam Client
+asyncio facade over a ConnectionPool: each stored procedure call borrows a pooled
+connection on a worker thread, so many exam sessions can be served concurrently
+"""
+
+import argparse
+import asyncio
+import functools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from connection_pool import ConnectionPool
+from insert_egyptian_mock_data_v2 import add_connection_arguments, add_latency_arguments, make_backend
+
+class ExamClient:
+    """Awaitable wrappers around the exam-taking stored procedures"""
+    def __init__(self, pool: ConnectionPool, executor=None):
+        self.pool = pool
+        # One worker per pooled connection: more threads would only queue on acquire()
+        self._executor = executor or ThreadPoolExecutor(max_workers=pool.max_size,
+                                                        thread_name_prefix="exam-client")
+
+    def _call(self, name, params, outputs, commit):
+        with self.pool.connection() as db:
+            rows = db.call_procedure(name, *params, outputs=outputs)
+            if commit:
+                db.commit()
+            return rows
+
+    async def call_procedure(self, name, *params, outputs=(), commit=False):
+        """Run a stored procedure on a pooled connection without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._call, name, params, outputs, commit)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def login_student(self, email, password):
+        """(S_Id, S_FName, S_LName, S_Email) of the matching student, or None"""
+        rows = await self.call_procedure("SP_LoginStudent", email, password)
+        return rows[0] if rows else None
+
+    async def available_exams(self, s_id):
+        return await self.call_procedure("SP_GetAvailableExamsForStudent", s_id)
+
+    async def exam_questions(self, e_id):
+        return await self.call_procedure("SP_GetExamQuestionsWithChoices", e_id)
+
+    async def submit_answers(self, e_id, s_id, answers):
+        """Submit (Q_Id, Choice_Id) answers through the AnswerListType TVP"""
+        return await self.call_procedure("SP_SubmitStudentAnswers", e_id, s_id, list(answers), commit=True)
+
+    async def correct_exam(self, e_id, s_id):
+        rows = await self.call_procedure("SP_CorrectExam", e_id, s_id, outputs=["DECIMAL(5,2)"], commit=True)
+        return rows[0][0] if rows else None
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+# ============================================================================
+# POOL SCALING LOAD TEST
+# ============================================================================
+
+async def browse_exams(client: ExamClient, student_ids, exam_ids, requests, concurrency, rng):
+    """Issue `requests` read calls (available exams / exam content) with bounded concurrency"""
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            try:
+                if rng.random() < 0.5:
+                    await client.available_exams(rng.choice(student_ids))
+                else:
+                    await client.exam_questions(rng.choice(exam_ids))
+            except Exception:
+                errors += 1
+
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    return errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure exam-read throughput at several pool sizes')
+    add_connection_arguments(parser)
+    parser.add_argument('--pool-sizes', default='1,2,4,8', help='Comma-separated pool sizes to compare')
+    parser.add_argument('--requests', type=int, default=2000, help='Procedure calls per pool size')
+    parser.add_argument('--concurrency', type=int, default=32, help='Calls in flight at once')
+    parser.add_argument('--acquire-timeout', type=float, default=30.0, help='Seconds to wait for a connection')
+    add_latency_arguments(parser)
+    parser.add_argument('--seed', type=int, help='Seed for the request mix')
+    args = parser.parse_args()
+    backend = make_backend(args)
+
+    with ConnectionPool(backend, min_size=1, max_size=1) as pool:
+        with pool.connection() as db:
+            db.cursor.execute("SELECT S_Id FROM Student")
+            student_ids = [row[0] for row in db.cursor.fetchall()]
+            db.cursor.execute("SELECT DISTINCT E_Id FROM Exam_Questions")
+            exam_ids = [row[0] for row in db.cursor.fetchall()]
+    if not student_ids or not exam_ids:
+        print("❌ No students or exams found - seed the database first")
+        return
+
+    print(f"\n🔌 {args.requests} calls per run, {args.concurrency} in flight ({backend.name}, "
+          f"{args.simulated_latency_ms:g} ms simulated latency)")
+    baseline = None
+    for size in [int(size) for size in args.pool_sizes.split(',')]:
+        pool = ConnectionPool(backend, min_size=size, max_size=size, acquire_timeout=args.acquire_timeout,
+                              simulated_latency=args.simulated_latency_ms / 1000)
+        client = ExamClient(pool)
+        started = time.perf_counter()
+        errors = asyncio.run(browse_exams(client, student_ids, exam_ids, args.requests,
+                                          args.concurrency, random.Random(args.seed)))
+        elapsed = time.perf_counter() - started
+        stats = pool.stats()
+        client.close()
+
+        throughput = args.requests / elapsed
+        baseline = baseline or throughput
+        print(f"   • pool size {size:>3}: {throughput:>9,.0f} calls/s  ({throughput / baseline:4.1f}x)  "
+              f"errors {errors}, waits {stats['waits']}, timeouts {stats['timeouts']}")
+
+if __name__ == "__main__":
+    main()
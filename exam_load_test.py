@@ -0,0 +1,203 @@
+"""
+ITI Database - Exam Session Load Test
+Simulated students run the real exam flow against the stored procedures:
+SP_LoginStudent -> SP_GetAvailableExamsForStudent -> SP_GetExamQuestionsWithChoices ->
+SP_SubmitStudentAnswers -> SP_CorrectExam, with configurable concurrency and ramp-up.
+Reports p50/p95/p99 latency and errors per procedure. Use --backend sqlite to run offline.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+
+from connection_pool import ConnectionPool
+from exam_client import ExamClient
+from insert_egyptian_mock_data_v2 import add_connection_arguments, add_latency_arguments, make_backend
+from query_stats import add_instrumentation_arguments, make_query_stats
+
+PROCEDURE_ORDER = [
+    "SP_LoginStudent", "SP_GetAvailableExamsForStudent", "SP_GetExamQuestionsWithChoices",
+    "SP_SubmitStudentAnswers", "SP_CorrectExam",
+]
+
+class LatencyRecorder:
+    """Latency samples and errors per procedure"""
+    def __init__(self):
+        self.samples = defaultdict(list)  # procedure -> seconds of successful calls
+        self.errors = defaultdict(lambda: defaultdict(int))  # procedure -> error text -> count
+
+    async def timed(self, procedure, call):
+        """Await call, recording its latency (or its error) under procedure"""
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception as e:
+            self.errors[procedure][f"{type(e).__name__}: {e}"] += 1
+            raise
+        self.samples[procedure].append(time.perf_counter() - started)
+        return result
+
+    def report(self):
+        report = {}
+        for procedure in PROCEDURE_ORDER:
+            samples = sorted(self.samples.get(procedure, []))
+            errors = dict(self.errors.get(procedure, {}))
+            if not samples and not errors:
+                continue
+            report[procedure] = {
+                'calls': len(samples) + sum(errors.values()),
+                'errors': sum(errors.values()),
+                'p50_ms': percentile_ms(samples, 50),
+                'p95_ms': percentile_ms(samples, 95),
+                'p99_ms': percentile_ms(samples, 99),
+                'max_ms': round(samples[-1] * 1000, 2) if samples else None,
+                'error_messages': errors,
+            }
+        return report
+
+def percentile_ms(sorted_samples, pct):
+    """Nearest-rank percentile of sorted second samples, in milliseconds"""
+    if not sorted_samples:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return round(sorted_samples[rank - 1] * 1000, 2)
+
+async def exam_session(client: ExamClient, recorder: LatencyRecorder, credentials, rng, think_time):
+    """One student's exam: log in, pick an exam, read it, answer every question, get graded"""
+    email, password = credentials
+    student = await recorder.timed("SP_LoginStudent", client.login_student(email, password))
+    if student is None:
+        recorder.errors["SP_LoginStudent"]["login rejected"] += 1
+        return False
+    s_id = student[0]
+
+    exams = await recorder.timed("SP_GetAvailableExamsForStudent", client.available_exams(s_id))
+    # Prefer an exam not taken yet; columns are E_Id, ..., ExamStatus (index 7), ..., TotalQuestions
+    candidates = [row for row in exams if row[7] == 'Available' and row[10]] or [row for row in exams if row[10]]
+    if not candidates:
+        return False
+    e_id = rng.choice(candidates)[0]
+
+    rows = await recorder.timed("SP_GetExamQuestionsWithChoices", client.exam_questions(e_id))
+    choices = defaultdict(list)
+    for _, q_id, _, _, _, choice_id, _, _ in rows:
+        choices[q_id].append(choice_id)
+    answers = [(q_id, rng.choice(choice_ids)) for q_id, choice_ids in choices.items()]
+    if think_time:
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * think_time)
+
+    await recorder.timed("SP_SubmitStudentAnswers", client.submit_answers(e_id, s_id, answers))
+    await recorder.timed("SP_CorrectExam", client.correct_exam(e_id, s_id))
+    return True
+
+async def run_load(client, recorder, credentials, concurrency, ramp_up, think_time, rng):
+    """Start one session per credential, spread over ramp_up seconds, at most `concurrency` at once"""
+    semaphore = asyncio.Semaphore(concurrency)
+    outcome = {'completed': 0, 'failed': 0}
+
+    async def student(i, creds, session_rng):
+        if ramp_up:
+            await asyncio.sleep(ramp_up * i / len(credentials))
+        async with semaphore:
+            try:
+                done = await exam_session(client, recorder, creds, session_rng, think_time)
+            except Exception:
+                done = False
+        outcome['completed' if done else 'failed'] += 1
+
+    await asyncio.gather(*(
+        student(i, creds, random.Random(rng.getrandbits(64))) for i, creds in enumerate(credentials)
+    ))
+    return outcome
+
+def load_credentials(pool: ConnectionPool, students, rng):
+    """(email, password) of `students` random students that are enrolled in a course with an exam"""
+    with pool.connection() as db:
+        db.cursor.execute("""
+            SELECT DISTINCT s.S_Id, s.S_Email, s.Password
+            FROM Student s
+            JOIN Student_Course sc ON sc.S_Id = s.S_Id
+            JOIN Exam e ON e.C_Id = sc.Course_Id
+            WHERE s.Password IS NOT NULL
+            ORDER BY s.S_Id
+        """)
+        rows = db.cursor.fetchall()
+    picked = rng.sample(rows, min(students, len(rows)))
+    return [(email, password) for _, email, password in picked]
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate concurrent students taking exams')
+    add_connection_arguments(parser)
+    parser.add_argument('--students', type=int, default=200, help='Simulated students (one exam each)')
+    parser.add_argument('--concurrency', type=int, default=50, help='Students in an exam at the same time')
+    parser.add_argument('--ramp-up', type=float, default=5.0, help='Seconds over which students start')
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help='Average seconds a student spends answering before submitting')
+    parser.add_argument('--pool-size', type=int, default=10, help='Database connections in the pool')
+    parser.add_argument('--acquire-timeout', type=float, default=30.0, help='Seconds to wait for a connection')
+    add_latency_arguments(parser)
+    parser.add_argument('--seed', type=int, help='Seed for student selection and answers')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    backend = make_backend(args)
+    pool = ConnectionPool(backend, min_size=1, max_size=args.pool_size, acquire_timeout=args.acquire_timeout,
+                          query_stats=make_query_stats(args),
+                          simulated_latency=args.simulated_latency_ms / 1000)
+    credentials = load_credentials(pool, args.students, rng)
+    if not credentials:
+        pool.close()
+        print("❌ No students with passwords and exams found - seed the database first")
+        return
+
+    print("=" * 80)
+    print("🧪 ITI Exam Session Load Test")
+    print("=" * 80)
+    print(f"\n{backend.describe()}")
+    print(f"Students: {len(credentials)}, concurrency: {args.concurrency}, ramp-up: {args.ramp_up:g}s, "
+          f"pool: {args.pool_size}")
+
+    recorder = LatencyRecorder()
+    client = ExamClient(pool)
+    started = time.perf_counter()
+    try:
+        outcome = asyncio.run(run_load(client, recorder, credentials, args.concurrency,
+                                       args.ramp_up, args.think_time, rng))
+    finally:
+        elapsed = time.perf_counter() - started
+        pool_stats = pool.stats()
+        client.close()
+
+    report = {
+        'students': len(credentials), 'concurrency': args.concurrency, 'ramp_up_s': args.ramp_up,
+        'pool_size': args.pool_size, 'elapsed_s': round(elapsed, 3),
+        'sessions_completed': outcome['completed'], 'sessions_failed': outcome['failed'],
+        'sessions_per_sec': round(outcome['completed'] / elapsed, 2) if elapsed else None,
+        'pool': pool_stats, 'procedures': recorder.report(),
+    }
+
+    print(f"\n📊 {outcome['completed']} sessions completed, {outcome['failed']} failed "
+          f"in {elapsed:.2f}s ({report['sessions_per_sec']} sessions/s)")
+    print(f"\n   {'procedure':<32} {'calls':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for procedure, stats in report['procedures'].items():
+        print(f"   {procedure:<32} {stats['calls']:>7} {stats['errors']:>7} "
+              f"{stats['p50_ms'] or 0:>9.2f} {stats['p95_ms'] or 0:>9.2f} {stats['p99_ms'] or 0:>9.2f}")
+    for procedure, stats in report['procedures'].items():
+        for message, count in stats['error_messages'].items():
+            print(f"   ⚠️  {procedure}: {count}x {message}")
+    print(f"\n🔌 Pool: {pool_stats['created']} connections opened, {pool_stats['waits']} waits, "
+          f"{pool_stats['timeouts']} acquire timeouts")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.json}")
+
+if __name__ == "__main__":
+    main()
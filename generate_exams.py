@@ -0,0 +1,249 @@
+"""
+ITI Database - Batch Exam Generation
+Creates exams for many courses (and sections) with one SP_GenerateExamsBulk call, or the
+old way with one SP_GenerateExam call per exam for comparison. With --mix or
+--target-marks the questions are planned here from a single read of the question pool:
+random sampling per (course, type, hardness) bucket, then swaps towards the marks target
+that keep each question's type (and hardness, when a mix is given).
+"""
+
+import argparse
+import random
+import time
+from collections import Counter, defaultdict
+
+from insert_egyptian_mock_data_v2 import (DatabaseConnection, add_connection_arguments, add_latency_arguments,
+                                          make_backend, parse_id_range)
+
+HARDNESS_LEVELS = ("Easy", "Medium", "Hard")
+MAX_SWAPS = 50
+DESCRIBE_CHUNK = 1000  # stays under SQL Server's 2100 parameters per statement
+
+class QuestionPool:
+    """Every question bucketed by (C_Id, Q_Type, Q_hardness) as (Q_Id, Q_Points, Q_Type, Q_hardness)"""
+    def __init__(self, rows):
+        self.buckets = defaultdict(list)
+        for q_id, c_id, q_type, points, hardness in rows:
+            self.buckets[(c_id, q_type, hardness)].append((q_id, float(points or 0), q_type, hardness))
+
+    @classmethod
+    def load(cls, db: DatabaseConnection):
+        db.cursor.execute("SELECT Q_Id, C_Id, Q_Type, Q_Points, Q_hardness FROM Question ORDER BY Q_Id")
+        return cls(db.cursor.fetchall())
+
+    def questions(self, c_id, q_type, hardness=None):
+        levels = (hardness,) if hardness else HARDNESS_LEVELS
+        return [q for level in levels for q in self.buckets.get((c_id, q_type, level), [])]
+
+def parse_mix(text):
+    """'Easy=50,Medium=30,Hard=20' -> {'Easy': 0.5, 'Medium': 0.3, 'Hard': 0.2}"""
+    weights = {}
+    for part in text.split(','):
+        level, _, weight = part.partition('=')
+        level = level.strip().capitalize()
+        if level not in HARDNESS_LEVELS:
+            raise ValueError(f"unknown hardness {level!r} (expected {', '.join(HARDNESS_LEVELS)})")
+        weights[level] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("the mix needs a positive weight")
+    return {level: weight / total for level, weight in weights.items()}
+
+def split_count(count, mix):
+    """Split count questions over the hardness levels of mix (largest remainder)"""
+    exact = {level: count * share for level, share in mix.items()}
+    quotas = {level: int(value) for level, value in exact.items()}
+    by_remainder = sorted(mix, key=lambda level: exact[level] - quotas[level], reverse=True)
+    for level in by_remainder[:count - sum(quotas.values())]:
+        quotas[level] += 1
+    return quotas
+
+def pick_questions(pool: QuestionPool, c_id, q_type, count, rng, mix=None):
+    """count random questions of one type; a hardness short of questions is topped up from the others"""
+    if not mix:
+        candidates = pool.questions(c_id, q_type)
+        return rng.sample(candidates, min(count, len(candidates)))
+    picked = []
+    for level, quota in split_count(count, mix).items():
+        bucket = pool.questions(c_id, q_type, level)
+        picked += rng.sample(bucket, min(quota, len(bucket)))
+    if len(picked) < count:
+        chosen = {q[0] for q in picked}
+        rest = [q for q in pool.questions(c_id, q_type) if q[0] not in chosen]
+        picked += rng.sample(rest, min(count - len(picked), len(rest)))
+    return picked
+
+def balance_marks(pool: QuestionPool, c_id, picked, target, keep_hardness=False):
+    """Swap questions for unpicked ones of the same type (and hardness, to keep a mix) while
+    that moves the total towards target"""
+    chosen = {q[0] for q in picked}
+    total = sum(q[1] for q in picked)
+    for _ in range(MAX_SWAPS):
+        gap = target - total
+        best = None
+        for i, question in enumerate(picked):
+            for candidate in pool.questions(c_id, question[2], question[3] if keep_hardness else None):
+                if candidate[0] in chosen:
+                    continue
+                remaining = abs(gap - (candidate[1] - question[1]))
+                if remaining < abs(gap) and (best is None or remaining < best[0]):
+                    best = (remaining, i, candidate)
+        if best is None:
+            break
+        _, i, candidate = best
+        chosen.discard(picked[i][0])
+        chosen.add(candidate[0])
+        total += candidate[1] - picked[i][1]
+        picked[i] = candidate
+    return picked
+
+def plan_exam(pool: QuestionPool, c_id, num_true_false, num_mcq, rng, mix=None, target_marks=None):
+    """The questions of one exam: per-type samples honouring mix, then balanced towards target_marks"""
+    picked = (pick_questions(pool, c_id, "TF", num_true_false, rng, mix)
+              + pick_questions(pool, c_id, "MCQ", num_mcq, rng, mix))
+    if target_marks is not None:
+        picked = balance_marks(pool, c_id, picked, target_marks, keep_hardness=bool(mix))
+    return picked
+
+def build_requests(course_ids, exams_per_course, num_true_false, num_mcq, title=None, duration=None, exam_date=None):
+    """ExamRequestListType rows, one per course and section"""
+    requests = []
+    for c_id in course_ids:
+        for section in range(1, exams_per_course + 1):
+            section_title = f"{title} #{section}" if title and exams_per_course > 1 else title
+            requests.append((len(requests) + 1, c_id, num_true_false, num_mcq, section_title, duration, exam_date))
+    return requests
+
+def generate_in_bulk(db: DatabaseConnection, requests, rng=None, mix=None, target_marks=None):
+    """One SP_GenerateExamsBulk call; questions are planned client-side only when mix or target_marks is given"""
+    questions = []
+    if mix or target_marks is not None:
+        pool = QuestionPool.load(db)
+        for request_id, c_id, num_true_false, num_mcq, *_ in requests:
+            planned = plan_exam(pool, c_id, num_true_false, num_mcq, rng or random, mix, target_marks)
+            questions += [(request_id, q[0]) for q in planned]
+    rows = db.generate_exams_bulk(requests, questions)
+    db.commit()
+    return [row[1] for row in rows]
+
+def generate_one_by_one(db: DatabaseConnection, requests):
+    """The per-exam path: one SP_GenerateExam call (and commit) per request"""
+    exam_ids = []
+    for _, c_id, num_true_false, num_mcq, *_ in requests:
+        rows = db.call_procedure("SP_GenerateExam", c_id, num_true_false, num_mcq, outputs=["INT"])
+        db.commit()
+        exam_ids.append(rows[0][0])
+    return exam_ids
+
+def describe_exams(db: DatabaseConnection, exam_ids):
+    """Question count, total marks and hardness mix over the created exams"""
+    marks, summed, hardness = {}, defaultdict(float), Counter()
+    for start in range(0, len(exam_ids), DESCRIBE_CHUNK):
+        chunk = list(exam_ids[start:start + DESCRIBE_CHUNK])
+        db.cursor.execute(f"""
+            SELECT e.E_Id, e.E_Total_Marks, q.Q_hardness, q.Q_Points
+            FROM Exam e
+            LEFT JOIN Exam_Questions eq ON eq.E_Id = e.E_Id
+            LEFT JOIN Question q ON q.Q_Id = eq.Q_Id
+            WHERE e.E_Id IN ({", ".join("?" * len(chunk))})
+        """, chunk)
+        for e_id, total_marks, level, points in db.cursor.fetchall():
+            marks[e_id] = float(total_marks or 0)
+            if level is not None:
+                hardness[level] += 1
+                summed[e_id] += float(points or 0)
+    mismatched = sum(1 for e_id in marks if abs(marks[e_id] - summed[e_id]) > 1e-6)
+    return {'exams': len(marks), 'questions': sum(hardness.values()), 'marks': list(marks.values()),
+            'hardness': hardness, 'mismatched_totals': mismatched}
+
+def delete_exams(db: DatabaseConnection, exam_ids):
+    params = [(e_id,) for e_id in exam_ids]
+    db.cursor.executemany("DELETE FROM Exam_Questions WHERE E_Id = ?", params)
+    db.cursor.executemany("DELETE FROM Exam WHERE E_Id = ?", params)
+    db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate exams for many courses at once')
+    add_connection_arguments(parser)
+    parser.add_argument('--courses', help='C_Id range, e.g. 1-12 (default: every course with questions)')
+    parser.add_argument('--exams-per-course', type=int, default=1, help='Exams (sections) per course')
+    parser.add_argument('--tf', type=int, default=5, help='True/false questions per exam')
+    parser.add_argument('--mcq', type=int, default=5, help='MCQ questions per exam')
+    parser.add_argument('--mix', help='Target hardness mix, e.g. Easy=50,Medium=30,Hard=20')
+    parser.add_argument('--target-marks', type=float, help='Target total marks per exam')
+    parser.add_argument('--title', help="Exam title (default: 'Auto Generated Exam')")
+    parser.add_argument('--duration', type=float, help='Exam duration in minutes (default: 60)')
+    parser.add_argument('--exam-date', help='Exam date (default: today)')
+    parser.add_argument('--method', choices=['bulk', 'loop', 'compare'], default='bulk',
+                        help='bulk = one SP_GenerateExamsBulk call, loop = SP_GenerateExam per exam, compare = both')
+    add_latency_arguments(parser)
+    parser.add_argument('--seed', type=int, help='Seed for the client-side question plan')
+    parser.add_argument('--cleanup', action='store_true', help='Delete the generated exams afterwards')
+    args = parser.parse_args()
+    try:
+        mix = parse_mix(args.mix) if args.mix else None
+    except ValueError as e:
+        parser.error(str(e))
+    if args.method == 'loop' and (mix or args.target_marks is not None or args.title):
+        parser.error("--mix, --target-marks and --title need the bulk method")
+
+    db = DatabaseConnection(make_backend(args), simulated_latency=args.simulated_latency_ms / 1000)
+    if not db.connect():
+        return
+
+    try:
+        if args.courses:
+            course_ids = list(parse_id_range(args.courses))
+        else:
+            db.cursor.execute("SELECT DISTINCT C_Id FROM Question WHERE C_Id IS NOT NULL ORDER BY C_Id")
+            course_ids = [row[0] for row in db.cursor.fetchall()]
+        requests = build_requests(course_ids, args.exams_per_course, args.tf, args.mcq,
+                                  args.title, args.duration, args.exam_date)
+        print(f"\n📝 {len(requests)} exams ({len(course_ids)} courses x {args.exams_per_course}), "
+              f"{args.tf} TF + {args.mcq} MCQ each")
+
+        methods = ['loop', 'bulk'] if args.method == 'compare' else [args.method]
+        results = {}
+        for method in methods:
+            db.round_trips = 0
+            started = time.perf_counter()
+            if method == 'bulk':
+                exam_ids = generate_in_bulk(db, requests, random.Random(args.seed), mix, args.target_marks)
+            else:
+                exam_ids = generate_one_by_one(db, requests)
+            elapsed = time.perf_counter() - started
+            results[method] = (exam_ids, elapsed, db.round_trips)
+
+        print(f"\n   {'method':<8} {'exams':>6} {'seconds':>9} {'exams/s':>9} {'round trips':>12} "
+              f"{'questions':>10} {'marks min/avg/max':>20}")
+        for method, (exam_ids, elapsed, round_trips) in results.items():
+            summary = describe_exams(db, exam_ids)
+            marks = summary['marks'] or [0]
+            print(f"   {method:<8} {summary['exams']:>6} {elapsed:>9.3f} {len(exam_ids) / elapsed:>9,.1f} "
+                  f"{round_trips:>12} {summary['questions']:>10} "
+                  f"{f'{min(marks):g}/{sum(marks) / len(marks):.1f}/{max(marks):g}':>20}")
+            shares = ", ".join(f"{level} {100 * summary['hardness'][level] / max(summary['questions'], 1):.0f}%"
+                               for level in HARDNESS_LEVELS)
+            print(f"      hardness: {shares}")
+            if summary.get('mismatched_totals'):
+                print(f"      ⚠️  {summary['mismatched_totals']} exams whose E_Total_Marks is not the sum of their questions")
+        if args.target_marks is not None and 'bulk' in results:
+            marks = describe_exams(db, results['bulk'][0])['marks']
+            on_target = sum(1 for value in marks if abs(value - args.target_marks) < 1e-6)
+            print(f"\n🎯 {on_target}/{len(marks)} exams hit {args.target_marks:g} marks exactly")
+        if 'loop' in results and 'bulk' in results and results['bulk'][1]:
+            print(f"\n⚡ bulk is {results['loop'][1] / results['bulk'][1]:.1f}x faster")
+
+        if args.cleanup:
+            for exam_ids, _, _ in results.values():
+                delete_exams(db, exam_ids)
+            print("\n🧹 Generated exams deleted")
+    except Exception as e:
+        print(f"\n❌ Error occurred: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+ITI Database - Bulk Exam Grading
+Grades every submitted Student_Exam row of one or many exams, either with a single
+SP_CorrectExamsBulk call or client-side from precomputed answer keys, optionally timing
+it against (and checking it with) one SP_CorrectExam call per student
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from insert_egyptian_mock_data_v2 import DatabaseConnection, add_connection_arguments, make_backend
+
+GRADE_PLACES = Decimal("0.01")  # Student_Exam grades are DECIMAL(5,2)
+EXAM_ID_CHUNK = 1000  # stays under SQL Server's 2100 parameters per statement
+
+def to_grade(value):
+    """Round a score the way a DECIMAL(5,2) assignment does (None stays None)"""
+    if value is None:
+        return None
+    return Decimal(repr(float(value))).quantize(GRADE_PLACES, rounding=ROUND_HALF_UP)
+
+def exam_id_chunks(exam_ids):
+    """exam_ids in lists small enough for one IN (...) parameter list"""
+    exam_ids = list(exam_ids)
+    for start in range(0, len(exam_ids), EXAM_ID_CHUNK):
+        yield exam_ids[start:start + EXAM_ID_CHUNK]
+
+def placeholders(values):
+    return ", ".join("?" * len(values))
+
+# ============================================================================
+# ANSWER KEYS (client-side grading fast path)
+# ============================================================================
+
+class AnswerKey:
+    """Precomputed answer key of one exam: points earned per (Q_Id, correct Choice_Id)
+
+    Scores exactly like SP_CorrectExam: a question's points are earned once per answer
+    row that picked one of its correct choices; the exam total counts every question.
+    """
+    __slots__ = ('e_id', 'total_points', 'points', '_questions')
+
+    def __init__(self, e_id):
+        self.e_id = e_id
+        self.total_points = None  # SUM(Q_Points) is NULL for an exam without questions
+        self.points = {}  # (Q_Id, correct Choice_Id) -> Q_Points
+        self._questions = set()
+
+    def add(self, q_id, q_points, correct_choice_id):
+        """Add one row of the exam's question x correct-choice listing"""
+        if q_id not in self._questions:
+            self._questions.add(q_id)
+            self.total_points = (self.total_points or 0) + q_points
+        if correct_choice_id is not None:
+            self.points[(q_id, correct_choice_id)] = q_points
+
+    def score(self, answers):
+        """Score percentage for an iterable of (Q_Id, Choice_Id) answers"""
+        if self.total_points == 0:
+            return to_grade(0)
+        if self.total_points is None or not self.points:
+            # No correct choice anywhere: SP_CorrectExam's earned SUM is NULL
+            return None
+        lookup = self.points.get
+        earned = sum(lookup(answer, 0) for answer in answers)
+        return to_grade(earned / self.total_points * 100)
+
+def load_answer_keys(db: DatabaseConnection, exam_ids):
+    """Build the AnswerKey of every exam in exam_ids (one query per EXAM_ID_CHUNK exams)"""
+    keys = {e_id: AnswerKey(e_id) for e_id in exam_ids}
+    for chunk in exam_id_chunks(keys):
+        db.cursor.execute(f"""
+            SELECT eq.E_Id, q.Q_Id, q.Q_Points, c.Choice_Id
+            FROM Exam_Questions eq
+            JOIN Question q ON eq.Q_Id = q.Q_Id
+            LEFT JOIN Choice c ON c.Q_Id = q.Q_Id AND c.Is_Correct = 1
+            WHERE eq.E_Id IN ({placeholders(chunk)})
+            ORDER BY eq.E_Id, q.Q_Id
+        """, chunk)
+        for e_id, q_id, q_points, choice_id in db.cursor.fetchall():
+            keys[e_id].add(q_id, q_points, choice_id)
+    return keys
+
+def load_answers(db: DatabaseConnection, exam_ids):
+    """{(S_Id, E_Id): [(Q_Id, Choice_Id), ...]} for the given exams"""
+    answers = defaultdict(list)
+    for chunk in exam_id_chunks(set(exam_ids)):
+        db.cursor.execute(
+            f"SELECT S_Id, Exam_Id, Question_Id, Choice_Id FROM Student_Answer WHERE Exam_Id IN ({placeholders(chunk)})",
+            chunk
+        )
+        for s_id, e_id, q_id, choice_id in db.cursor.fetchall():
+            answers[(s_id, e_id)].append((q_id, choice_id))
+    return answers
+
+def grade_with_answer_keys(db: DatabaseConnection, submissions, exam_ids):
+    """Grade submissions from answer keys and write the grades; returns {(S_Id, E_Id): grade}"""
+    keys = load_answer_keys(db, exam_ids)
+    answers = load_answers(db, exam_ids)
+    grades = {
+        (s_id, e_id): keys[e_id].score(answers.get((s_id, e_id), ()))
+        for s_id, e_id in submissions
+    }
+    taken = date.today().strftime('%Y-%m-%d')
+    db.cursor.executemany(
+        "UPDATE Student_Exam SET Grade = ?, Date_Taken = ? WHERE S_Id = ? AND E_Id = ?",
+        [(None if grade is None else float(grade), taken, s_id, e_id)
+         for (s_id, e_id), grade in grades.items()]
+    )
+    db.round_trips += 1
+    db.commit()
+    return grades
+
+# ============================================================================
+# STORED PROCEDURE GRADING
+# ============================================================================
+
+def submitted_exams(db: DatabaseConnection, exam_ids=None):
+    """(S_Id, E_Id) pairs of the Student_Exam rows to grade, optionally limited to exam_ids"""
+    if not exam_ids:
+        db.cursor.execute("SELECT S_Id, E_Id FROM Student_Exam ORDER BY E_Id, S_Id")
+        return [(s_id, e_id) for s_id, e_id in db.cursor.fetchall()]
+    rows = []
+    for chunk in exam_id_chunks(sorted(set(exam_ids))):
+        db.cursor.execute(
+            f"SELECT S_Id, E_Id FROM Student_Exam WHERE E_Id IN ({placeholders(chunk)}) ORDER BY E_Id, S_Id",
+            chunk
+        )
+        rows += [(s_id, e_id) for s_id, e_id in db.cursor.fetchall()]
+    return rows
+
+def grade_one_by_one(db: DatabaseConnection, submissions):
+    """Call SP_CorrectExam once per submission; returns {(S_Id, E_Id): grade}"""
+    grades = {}
+    for s_id, e_id in submissions:
+        grades[(s_id, e_id)] = db.correct_exam(e_id, s_id)
+    db.commit()
+    return grades
+
+def grade_in_bulk(db: DatabaseConnection, exam_ids):
+    """Grade every submission of exam_ids in one call; returns {(S_Id, E_Id): grade}"""
+    rows = db.grade_exams_bulk(exam_ids)
+    db.commit()
+    return {(s_id, e_id): grade for s_id, e_id, grade in rows}
+
+def grade_mismatches(expected, actual):
+    """Submissions whose grade differs from the per-student SP_CorrectExam grade"""
+    return [
+        (key, grade, actual.get(key))
+        for key, grade in expected.items()
+        if to_grade(grade) != to_grade(actual.get(key))
+    ]
+
+GRADING_METHODS = {
+    'bulk': ("SP_CorrectExamsBulk", lambda db, submissions, exam_ids: grade_in_bulk(db, exam_ids)),
+    'answer-key': ("in-memory answer keys", grade_with_answer_keys),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='Grade submitted exams in bulk')
+    add_connection_arguments(parser)
+    parser.add_argument('--exams', help='Comma-separated exam ids (default: every exam with submissions)')
+    parser.add_argument('--method', choices=list(GRADING_METHODS), default='bulk',
+                        help='bulk = one SP_CorrectExamsBulk call, answer-key = grade client-side')
+    parser.add_argument('--compare', action='store_true',
+                        help='First grade with one SP_CorrectExam call per student, then check that '
+                             '--method gives exactly the same grades and compare timings')
+    args = parser.parse_args()
+
+    db = DatabaseConnection(make_backend(args))
+    if not db.connect():
+        return
+
+    mismatches = []
+    try:
+        exam_ids = [int(e_id) for e_id in args.exams.split(',')] if args.exams else None
+        submissions = submitted_exams(db, exam_ids)
+        exam_ids = exam_ids or sorted({e_id for _, e_id in submissions})
+        print(f"\n📝 {len(submissions)} submissions across {len(exam_ids)} exams")
+
+        if args.compare:
+            print("\n🐢 Grading one student at a time (SP_CorrectExam)...")
+            started = time.perf_counter()
+            looped = grade_one_by_one(db, submissions)
+            looped_seconds = time.perf_counter() - started
+            print(f"   ✅ {len(looped)} grades in {looped_seconds:.2f}s")
+
+        label, grade = GRADING_METHODS[args.method]
+        print(f"\n🚀 Grading with {label}...")
+        started = time.perf_counter()
+        graded = grade(db, submissions, exam_ids)
+        graded_seconds = time.perf_counter() - started
+        print(f"   ✅ {len(graded)} grades in {graded_seconds:.2f}s")
+
+        if args.compare:
+            speedup = looped_seconds / graded_seconds if graded_seconds else float('inf')
+            print(f"\n⏱️  {label} is {speedup:.1f}x faster than the per-student loop")
+            mismatches = grade_mismatches(looped, graded)
+            if mismatches:
+                print(f"❌ {len(mismatches)} grades differ, e.g. {mismatches[:5]}")
+            else:
+                print("✅ Grades match SP_CorrectExam exactly for every submission")
+    except Exception as e:
+        print(f"\n❌ Error occurred: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+ITI Database - Question Bank Import
+Streams a JSON Lines question bank (see question_bank.py) into the database in batches,
+one SP_ImportQuestionsBulk call per batch: the procedure assigns every Q_Id and Choice_Id
+and returns the mapping from each bank question to its new ids. The old way, one INSERT
+per question and per choice, is kept for comparison.
+
+Each batch is committed on its own. If a run stops part way, the last committed Import_Id
+is printed, and --start-after resumes from the next question.
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+
+from insert_egyptian_mock_data_v2 import (DatabaseConnection, add_connection_arguments, add_latency_arguments,
+                                          make_backend)
+from question_bank import DEFAULT_BANK_PATH, QuestionBank
+
+DEFAULT_BATCH_SIZE = 1000  # questions per call
+CHOICE_ANSWER_FK = "FK_Choice_Student_Answer"  # Choice.Choice_Id -> Student_Answer.A_Id
+
+def read_bank(path, courses=None):
+    """Yield (position, question) in bank order; with courses, only theirs (read through the index)"""
+    if courses:
+        bank = QuestionBank(path)
+        position = 0
+        for course in courses:
+            for question in bank.questions(course):
+                position += 1
+                yield position, question
+        return
+    with open(path, encoding='utf-8') as f:
+        position = 0
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                question = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: not a question line ({e})") from None
+            position += 1
+            yield position, question
+
+def import_rows(import_id, c_id, question):
+    """QuestionImportType row and ChoiceImportType rows of one bank question"""
+    q_type = question['type']
+    if q_type == 'MCQ':
+        options = [(i == question['correct'], text) for i, text in enumerate(question['choices'])]
+    else:
+        options = [(question['answer'] is True, 'True'), (question['answer'] is False, 'False')]
+    return ((import_id, c_id, question['q'], q_type, question.get('points'), question.get('difficulty')),
+            [(import_id, number, 1 if correct else 0, text) for number, (correct, text) in enumerate(options, 1)])
+
+def count_choices(questions, course_ids):
+    """Choices an import of questions would insert (questions of unknown courses are skipped)"""
+    return sum(len(import_rows(position, None, question)[1])
+               for position, question in questions if question['course'] in course_ids)
+
+def missing_choice_ids(db: DatabaseConnection, count):
+    """(first new Choice_Id, how many of the next `count` Choice_Ids are not yet an A_Id)
+
+    New Choice_Ids continue after MAX(Choice_Id); while FK_Choice_Student_Answer is enforced
+    each of them must already exist as a Student_Answer A_Id.
+    """
+    db.cursor.execute("SELECT COALESCE(MAX(Choice_Id), 0) + 1 FROM Choice")
+    first = db.cursor.fetchone()[0]
+    db.cursor.execute("SELECT COUNT(*) FROM Student_Answer WHERE A_Id BETWEEN ? AND ?", (first, first + count - 1))
+    db.round_trips += 2
+    return first, count - db.cursor.fetchone()[0]
+
+def batches(questions, course_ids, batch_size, skipped):
+    """Group (position, question) into lists of import rows; questions of unknown courses are counted in skipped"""
+    batch = []
+    for position, question in questions:
+        c_id = course_ids.get(question['course'])
+        if c_id is None:
+            skipped[question['course']] = skipped.get(question['course'], 0) + 1
+            continue
+        batch.append(import_rows(position, c_id, question))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def import_in_bulk(db: DatabaseConnection, batch):
+    """One SP_ImportQuestionsBulk call and commit; returns its (Import_Id, Q_Id, First_Choice_Id, ChoiceCount) rows"""
+    rows = db.import_questions_bulk([question for question, _ in batch],
+                                   [choice for _, choices in batch for choice in choices])
+    db.commit()
+    return [tuple(row) for row in rows]
+
+def import_one_by_one(db: DatabaseConnection, batch):
+    """The per-row path: MAX + 1 ids, then one INSERT per question and per choice"""
+    db.cursor.execute("SELECT MAX(Q_Id) FROM Question")
+    q_id = (db.cursor.fetchone()[0] or 0) + 1
+    db.cursor.execute("SELECT MAX(Choice_Id) FROM Choice")
+    choice_id = (db.cursor.fetchone()[0] or 0) + 1
+    db.round_trips += 2
+    rows = []
+    for (import_id, c_id, content, q_type, points, hardness), choices in batch:
+        db.cursor.execute(
+            "INSERT INTO Question (Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness, C_Id) VALUES (?, ?, ?, ?, ?, ?)",
+            (q_id, content, q_type, points, hardness, c_id)
+        )
+        for offset, (_, _, is_correct, text) in enumerate(choices):
+            db.cursor.execute(
+                "INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content) VALUES (?, ?, ?, ?)",
+                (choice_id + offset, q_id, is_correct, text)
+            )
+        db.round_trips += 1 + len(choices)
+        rows.append((import_id, q_id, choice_id, len(choices)))
+        q_id += 1
+        choice_id += len(choices)
+    db.commit()
+    return rows
+
+def delete_questions(db: DatabaseConnection, id_ranges):
+    """Delete imported questions and their choices; each batch's Q_Ids are one (first, last) range"""
+    db.cursor.executemany("DELETE FROM Choice WHERE Q_Id BETWEEN ? AND ?", id_ranges)
+    db.cursor.executemany("DELETE FROM Question WHERE Q_Id BETWEEN ? AND ?", id_ranges)
+    db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='Import a JSON Lines question bank in batches')
+    add_connection_arguments(parser)
+    parser.add_argument('bank', nargs='?', default=DEFAULT_BANK_PATH, help='Question bank file')
+    parser.add_argument('--course', action='append', dest='courses',
+                        help='Import only this course (repeatable; read through the bank index)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Questions per import call')
+    parser.add_argument('--method', choices=['bulk', 'loop'], default='bulk',
+                        help='bulk = SP_ImportQuestionsBulk per batch, loop = one INSERT per question and choice')
+    parser.add_argument('--mapping', help='Write the Import_Id -> Q_Id / Choice_Id mapping to this CSV file '
+                                          '(appended to with --start-after)')
+    parser.add_argument('--start-after', type=int, default=0, metavar='IMPORT_ID',
+                        help='Skip bank questions up to this Import_Id (the last one committed by a stopped run)')
+    add_latency_arguments(parser)
+    parser.add_argument('--cleanup', action='store_true', help='Delete the imported questions afterwards')
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    db = DatabaseConnection(make_backend(args), simulated_latency=args.simulated_latency_ms / 1000)
+    if not db.connect():
+        return
+
+    def bank_questions():
+        return ((position, question) for position, question in read_bank(args.bank, args.courses)
+                if position > args.start_after)
+
+    resuming = args.start_after and args.mapping and os.path.exists(args.mapping)
+    mapping_file = None
+    if args.mapping:
+        mapping_file = open(args.mapping, 'a' if resuming else 'w', newline='', encoding='utf-8')
+    last_committed = None
+    try:
+        db.cursor.execute("SELECT C_Name, C_Id FROM Course")
+        course_ids = {name: c_id for name, c_id in db.cursor.fetchall()}
+        writer = csv.writer(mapping_file) if mapping_file else None
+        if writer and not resuming:
+            writer.writerow(["Import_Id", "Q_Id", "First_Choice_Id", "ChoiceCount"])
+
+        if db.foreign_key_enabled(CHOICE_ANSWER_FK):
+            # Batches commit one by one, so check up front instead of failing half way
+            needed = count_choices(bank_questions(), course_ids)
+            first, missing = missing_choice_ids(db, needed)
+            if needed and missing:
+                print(f"\n❌ {CHOICE_ANSWER_FK} is enforced: the {needed} new Choice_Ids "
+                      f"{first}-{first + needed - 1} must already be A_Ids, but {missing} are not. "
+                      f"Disable the key (ALTER TABLE Choice NOCHECK CONSTRAINT {CHOICE_ANSWER_FK}) "
+                      f"and import again.")
+                return
+
+        print(f"\n📥 Importing {args.bank} ({args.method}, {args.batch_size} questions per batch)...")
+        importer = import_in_bulk if args.method == 'bulk' else import_one_by_one
+        skipped, id_ranges = {}, []
+        questions = choices = 0
+        db.round_trips = 0
+        started = time.perf_counter()
+        for batch in batches(bank_questions(), course_ids, args.batch_size, skipped):
+            rows = importer(db, batch)
+            last_committed = batch[-1][0][0]
+            questions += len(rows)
+            choices += sum(row[3] for row in rows)
+            if writer:
+                writer.writerows(rows)
+            if args.cleanup and rows:
+                id_ranges.append((min(row[1] for row in rows), max(row[1] for row in rows)))
+        elapsed = time.perf_counter() - started
+
+        print(f"   ✅ {questions} questions and {choices} choices in {elapsed:.3f}s "
+              f"({questions / elapsed if elapsed else 0:,.0f} questions/s, {db.round_trips} round trips)")
+        if skipped:
+            print(f"   ⚠️  Skipped {sum(skipped.values())} questions of courses not in the database: "
+                  f"{', '.join(sorted(skipped))}")
+        if writer:
+            print(f"📄 Id mapping written to {args.mapping}")
+
+        if args.cleanup:
+            delete_questions(db, id_ranges)
+            print("\n🧹 Imported questions deleted")
+    except Exception as e:
+        print(f"\n❌ Error occurred: {e}")
+        db.rollback()
+        if last_committed is not None:
+            print(f"   Batches up to Import_Id {last_committed} are committed; "
+                  f"resume with --start-after {last_committed}")
+        raise
+    finally:
+        if mapping_file:
+            mapping_file.close()
+        db.close()
+
+if __name__ == "__main__":
+    main()
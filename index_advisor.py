@@ -0,0 +1,159 @@
+"""
+ITI Database - Index Advisor
+Runs the hot exam procedures against the mock data with and without the index pack in
+StoredP/indexes_v1.sql and reports elapsed time and work per call: logical reads
+(SET STATISTICS IO) on SQL Server, virtual machine steps on SQLite
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import time
+from collections import namedtuple
+
+from insert_egyptian_mock_data_v2 import DatabaseConnection, add_connection_arguments, make_backend
+
+DEFAULT_INDEX_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "StoredP", "indexes_v1.sql")
+
+IndexDefinition = namedtuple("IndexDefinition", "name table columns include")
+
+INDEX_PATTERN = re.compile(
+    r"CREATE\s+NONCLUSTERED\s+INDEX\s+(\w+)\s+ON\s+(?:dbo\.)?(\w+)\s*\(([^)]*)\)"
+    r"(?:\s*INCLUDE\s*\(([^)]*)\))?",
+    re.IGNORECASE
+)
+LOGICAL_READS = re.compile(r"logical reads (\d+)")
+
+# Hot procedure -> (query returning parameter sets, OUTPUT parameter types)
+HOT_PROCEDURES = {
+    "SP_LoginStudent": ("SELECT S_Email, Password FROM Student WHERE Password IS NOT NULL", ()),
+    "SP_GetAvailableExamsForStudent": ("SELECT DISTINCT S_Id FROM Student_Course", ()),
+    "SP_CorrectExam": ("SELECT E_Id, S_Id FROM Student_Exam", ["DECIMAL(5,2)"]),
+}
+
+def load_index_pack(path=DEFAULT_INDEX_SCRIPT):
+    """IndexDefinitions of every CREATE NONCLUSTERED INDEX in the index script"""
+    with open(path, encoding="utf-8") as f:
+        script = f.read()
+    split = lambda columns: tuple(column.strip() for column in (columns or "").split(",") if column.strip())
+    return [IndexDefinition(name, table, split(columns), split(include))
+            for name, table, columns, include in INDEX_PATTERN.findall(script)]
+
+def apply_index_pack(db: DatabaseConnection, indexes, enabled):
+    """Create (enabled) or drop every index of the pack"""
+    for index in indexes:
+        if enabled:
+            db.backend.create_index(db.cursor, index.name, index.table, index.columns, index.include)
+        else:
+            db.backend.drop_index(db.cursor, index.name, index.table)
+    db.commit()
+    if db.backend.name == "SQLite":
+        db.cursor.execute("ANALYZE")
+        db.commit()
+
+def measure_work(db: DatabaseConnection, name, params, outputs):
+    """Work done by one call: logical reads on SQL Server, VM steps on SQLite"""
+    if db.backend.name == "SQLite":
+        steps = 0
+        def count_step():
+            nonlocal steps
+            steps += 1
+            return 0
+        db.conn.set_progress_handler(count_step, 1)
+        try:
+            db.backend.call_procedure(db.cursor, name, params, outputs)
+        finally:
+            db.conn.set_progress_handler(None, 1)
+        return steps
+
+    messages = []
+    db.cursor.execute("SET STATISTICS IO ON")
+    try:
+        db.backend.call_procedure(db.cursor, name, params, outputs, messages=messages)
+    finally:
+        db.cursor.execute("SET STATISTICS IO OFF")
+    return sum(int(reads) for text in messages for reads in LOGICAL_READS.findall(text))
+
+def run_procedures(db: DatabaseConnection, calls):
+    """Time and measure every sampled call; each is rolled back so runs see the same data"""
+    results = {}
+    for name, param_sets in calls.items():
+        outputs = HOT_PROCEDURES[name][1]
+        elapsed = work = 0.0
+        for params in param_sets:
+            started = time.perf_counter()
+            db.backend.call_procedure(db.cursor, name, params, outputs)
+            elapsed += time.perf_counter() - started
+            db.rollback()
+            work += measure_work(db, name, params, outputs)
+            db.rollback()
+        results[name] = {
+            'calls': len(param_sets),
+            'ms_per_call': round(elapsed * 1000 / len(param_sets), 3) if param_sets else None,
+            'work_per_call': round(work / len(param_sets), 1) if param_sets else None,
+        }
+    return results
+
+def sample_calls(db: DatabaseConnection, count, rng):
+    """Up to `count` parameter sets per hot procedure, drawn from the mock data"""
+    calls = {}
+    for name, (query, _) in HOT_PROCEDURES.items():
+        db.cursor.execute(query)
+        rows = [tuple(row) for row in db.cursor.fetchall()]
+        calls[name] = rng.sample(rows, min(count, len(rows)))
+    return calls
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the hot procedures with and without the index pack')
+    add_connection_arguments(parser)
+    parser.add_argument('--index-script', default=DEFAULT_INDEX_SCRIPT, help='Index DDL pack to evaluate')
+    parser.add_argument('--calls', type=int, default=100, help='Sampled calls per procedure')
+    parser.add_argument('--seed', type=int, help='Seed for the sampled parameters')
+    parser.add_argument('--drop-after', action='store_true',
+                        help='Leave the database without the pack (default: indexes stay created)')
+    parser.add_argument('--json', help='Also write the report to this JSON file')
+    args = parser.parse_args()
+
+    indexes = load_index_pack(args.index_script)
+    db = DatabaseConnection(make_backend(args))
+    if not db.connect():
+        return
+
+    unit = "VM steps" if db.backend.name == "SQLite" else "logical reads"
+    try:
+        calls = sample_calls(db, args.calls, random.Random(args.seed))
+        print(f"\n📐 {len(indexes)} indexes in {os.path.basename(args.index_script)}: "
+              f"{', '.join(index.name for index in indexes)}")
+
+        report = {}
+        for label, enabled in (("without", False), ("with", True)):
+            print(f"\n⏱️  Running {sum(len(c) for c in calls.values())} calls {label} the indexes...")
+            apply_index_pack(db, indexes, enabled)
+            report[label] = run_procedures(db, calls)
+
+        print(f"\n   {'procedure':<32} {'ms/call':>17} {'speedup':>8} {unit + '/call':>26}")
+        print(f"   {'':<32} {'without':>8} {'with':>8} {'':>8} {'without':>12} {'with':>12}")
+        for name in calls:
+            before, after = report['without'][name], report['with'][name]
+            if not before['calls']:
+                continue
+            speedup = before['ms_per_call'] / after['ms_per_call'] if after['ms_per_call'] else float('inf')
+            print(f"   {name:<32} {before['ms_per_call']:>8.3f} {after['ms_per_call']:>8.3f} {speedup:>7.1f}x "
+                  f"{before['work_per_call']:>12,.1f} {after['work_per_call']:>12,.1f}")
+
+        if args.drop_after:
+            apply_index_pack(db, indexes, False)
+            print("\n🧹 Index pack dropped again")
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'backend': db.backend.name, 'work_unit': unit,
+                           'indexes': [index._asdict() for index in indexes], **report}, f, indent=2)
+            print(f"📄 Report written to {args.json}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
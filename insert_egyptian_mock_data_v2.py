@@ -1,14 +1,45 @@
 """
 ITI Database - Egyptian Mock Data Insertion Script
 Uses SQL Server connection string to insert Egyptian-themed mock data directly into database
+(or a local SQLite file with --backend sqlite)
 """
 
-import pyodbc
+import os
+import hashlib
 import random
 import argparse
-from datetime import datetime, timedelta
+import sys
+import time
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from array import array
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from operator import itemgetter
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Any
 
+try:
+    import pyodbc
+except ImportError:  # Only needed for live inserts; --output-dir works without it
+    pyodbc = None
+
+from query_stats import InstrumentedCursor, add_instrumentation_arguments, make_query_stats
+from question_bank import DEFAULT_BANK_PATH, QuestionBank
+from sqlite_backend import SqliteBackend
+
+try:
+    import numpy
+except ImportError:  # Only needed for --engine numpy
+    numpy = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 # ============================================================================
 # EGYPTIAN DATA SETS
 # ============================================================================
@@ -65,267 +96,838 @@ TOPICS = [
     "React", "Node.js", "Python Basics", "Neural Networks", "Docker", "Kubernetes"
 ]
 
+# Data volume presets for --scale (explicit --students/--instructors/--exam-takers win)
+SCALE_PRESETS = {
+    "small":  {"students": 100,       "instructors": 20,    "exam_takers": 50},
+    "medium": {"students": 10_000,    "instructors": 200,   "exam_takers": 5_000},
+    "large":  {"students": 100_000,   "instructors": 1_000, "exam_takers": 50_000},
+    "xl":     {"students": 1_000_000, "instructors": 5_000, "exam_takers": 500_000},
+}
+
 # ============================================================================
 # REAL QUESTIONS BANK - Organized by Course
 # ============================================================================
 
-QUESTION_BANK = {
-    "Database Management Systems": {
-        "MCQ": [
-            {"q": "What does SQL stand for?", "choices": ["Structured Query Language", "Simple Question Language", "Sequential Query Logic", "Standard Query Library"], "correct": 0, "difficulty": "Easy", "points": 1},
-            {"q": "Which SQL clause is used to filter rows?", "choices": ["SELECT", "WHERE", "FROM", "GROUP BY"], "correct": 1, "difficulty": "Easy", "points": 2},
-            {"q": "What is the purpose of a PRIMARY KEY?", "choices": ["Speed up queries", "Uniquely identify each row", "Sort data", "Link tables"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which normal form eliminates transitive dependencies?", "choices": ["1NF", "2NF", "3NF", "BCNF"], "correct": 2, "difficulty": "Medium", "points": 3},
-            {"q": "What type of join returns all rows from both tables?", "choices": ["INNER JOIN", "LEFT JOIN", "RIGHT JOIN", "FULL OUTER JOIN"], "correct": 3, "difficulty": "Medium", "points": 2},
-            {"q": "Which SQL command is used to modify existing data?", "choices": ["INSERT", "UPDATE", "ALTER", "MODIFY"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "What is a foreign key constraint used for?", "choices": ["Ensure data integrity", "Speed up queries", "Create indexes", "Define primary keys"], "correct": 0, "difficulty": "Medium", "points": 2},
-            {"q": "Which isolation level prevents dirty reads?", "choices": ["READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE"], "correct": 1, "difficulty": "Hard", "points": 3},
-        ],
-        "TF": [
-            {"q": "A database can have multiple tables with the same name", "answer": False, "difficulty": "Easy", "points": 1},
-            {"q": "Stored procedures can improve database performance", "answer": True, "difficulty": "Medium", "points": 2},
-            {"q": "NULL and 0 are the same in SQL", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "Triggers can be executed automatically on INSERT, UPDATE, or DELETE operations", "answer": True, "difficulty": "Medium", "points": 2},
-        ]
-    },
-    
-    "Data Structures": {
-        "MCQ": [
-            {"q": "What is the time complexity of binary search?", "choices": ["O(n)", "O(log n)", "O(n log n)", "O(1)"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which data structure uses LIFO (Last In First Out)?", "choices": ["Queue", "Stack", "Tree", "Graph"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "What is the worst-case time complexity for insertion in a hash table?", "choices": ["O(1)", "O(log n)", "O(n)", "O(n²)"], "correct": 2, "difficulty": "Hard", "points": 3},
-            {"q": "In a binary tree, what is a node with no children called?", "choices": ["Root", "Leaf", "Parent", "Sibling"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "Which traversal visits nodes in ascending order in a BST?", "choices": ["Pre-order", "Post-order", "In-order", "Level-order"], "correct": 2, "difficulty": "Medium", "points": 2},
-            {"q": "What is the maximum number of children in a binary tree node?", "choices": ["1", "2", "3", "Unlimited"], "correct": 1, "difficulty": "Easy", "points": 1},
-        ],
-        "TF": [
-            {"q": "Arrays have fixed size in most programming languages", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "Linked lists provide constant time random access", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "A queue follows First In First Out (FIFO) principle", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "All binary search trees are balanced", "answer": False, "difficulty": "Medium", "points": 2},
-        ]
-    },
-    
-    "Algorithms": {
-        "MCQ": [
-            {"q": "What is the time complexity of Quick Sort on average?", "choices": ["O(n)", "O(n log n)", "O(n²)", "O(log n)"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which algorithm is used to find the shortest path in a graph?", "choices": ["DFS", "BFS", "Dijkstra's", "Kruskal's"], "correct": 2, "difficulty": "Medium", "points": 3},
-            {"q": "Which sorting algorithm is most efficient for nearly sorted data?", "choices": ["Bubble Sort", "Insertion Sort", "Merge Sort", "Quick Sort"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "What technique does Dynamic Programming use?", "choices": ["Divide and Conquer", "Greedy Choice", "Memoization", "Backtracking"], "correct": 2, "difficulty": "Hard", "points": 3},
-            {"q": "Which algorithm finds the Minimum Spanning Tree?", "choices": ["Dijkstra's", "Prim's", "Binary Search", "Linear Search"], "correct": 1, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "Bubble Sort has O(n²) time complexity in the worst case", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "Binary search works on unsorted arrays", "answer": False, "difficulty": "Easy", "points": 1},
-            {"q": "Merge sort is a stable sorting algorithm", "answer": True, "difficulty": "Medium", "points": 2},
-            {"q": "Greedy algorithms always find the optimal solution", "answer": False, "difficulty": "Hard", "points": 3},
-        ]
-    },
-    
-    "Web Development": {
-        "MCQ": [
-            {"q": "What does HTML stand for?", "choices": ["Hyper Text Markup Language", "High Tech Modern Language", "Home Tool Markup Language", "Hyperlinks Text Mark Language"], "correct": 0, "difficulty": "Easy", "points": 1},
-            {"q": "Which CSS property is used to change text color?", "choices": ["font-color", "text-color", "color", "fg-color"], "correct": 2, "difficulty": "Easy", "points": 1},
-            {"q": "Which JavaScript method is used to select an element by ID?", "choices": ["querySelector()", "getElementById()", "getElement()", "selectById()"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "What is the default HTTP method for HTML forms?", "choices": ["POST", "GET", "PUT", "DELETE"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which HTML tag is used for creating hyperlinks?", "choices": ["<link>", "<a>", "<href>", "<url>"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "What is the CSS Box Model?", "choices": ["Content, Padding, Border, Margin", "Header, Body, Footer", "Width, Height, Depth", "Font, Size, Color"], "correct": 0, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "CSS stands for Cascading Style Sheets", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "JavaScript is the same as Java", "answer": False, "difficulty": "Easy", "points": 1},
-            {"q": "HTML5 introduced semantic elements like <header> and <footer>", "answer": True, "difficulty": "Medium", "points": 2},
-            {"q": "The <div> tag has semantic meaning", "answer": False, "difficulty": "Medium", "points": 2},
-        ]
-    },
-    
-    "Machine Learning": {
-        "MCQ": [
-            {"q": "Which type of learning uses labeled data?", "choices": ["Unsupervised Learning", "Supervised Learning", "Reinforcement Learning", "Semi-supervised Learning"], "correct": 1, "difficulty": "Easy", "points": 2},
-            {"q": "What is overfitting in machine learning?", "choices": ["Model is too simple", "Model performs well on training data but poorly on new data", "Model has too few parameters", "Model trains too quickly"], "correct": 1, "difficulty": "Medium", "points": 3},
-            {"q": "Which algorithm is used for classification?", "choices": ["Linear Regression", "Logistic Regression", "K-Means", "PCA"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "What does k in k-NN algorithm represent?", "choices": ["Number of features", "Number of nearest neighbors", "Number of clusters", "Number of iterations"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which activation function is commonly used in hidden layers?", "choices": ["Sigmoid", "ReLU", "Linear", "Softmax"], "correct": 1, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "Deep Learning is a subset of Machine Learning", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "K-Means is a supervised learning algorithm", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "Feature scaling can improve model performance", "answer": True, "difficulty": "Medium", "points": 2},
-            {"q": "Neural networks always outperform traditional algorithms", "answer": False, "difficulty": "Hard", "points": 3},
-        ]
-    },
-    
-    "Computer Networks": {
-        "MCQ": [
-            {"q": "Which layer of OSI model handles routing?", "choices": ["Data Link", "Network", "Transport", "Application"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "What protocol is used for sending emails?", "choices": ["HTTP", "FTP", "SMTP", "POP3"], "correct": 2, "difficulty": "Easy", "points": 1},
-            {"q": "What is the default port number for HTTP?", "choices": ["21", "25", "80", "443"], "correct": 2, "difficulty": "Medium", "points": 2},
-            {"q": "Which protocol ensures reliable data transmission?", "choices": ["IP", "UDP", "TCP", "ICMP"], "correct": 2, "difficulty": "Medium", "points": 2},
-            {"q": "What does DNS stand for?", "choices": ["Dynamic Name System", "Domain Name System", "Data Network Service", "Digital Name Server"], "correct": 1, "difficulty": "Easy", "points": 1},
-        ],
-        "TF": [
-            {"q": "IP address uniquely identifies a device on a network", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "UDP provides guaranteed delivery of packets", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "HTTPS is more secure than HTTP", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "MAC address operates at the Network layer", "answer": False, "difficulty": "Medium", "points": 2},
-        ]
-    },
-    
-    "Operating Systems": {
-        "MCQ": [
-            {"q": "What is the main function of an operating system?", "choices": ["Internet browsing", "Resource management", "Gaming", "File editing"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "Which scheduling algorithm can cause starvation?", "choices": ["FCFS", "Round Robin", "SJF", "Priority"], "correct": 3, "difficulty": "Hard", "points": 3},
-            {"q": "What is a deadlock?", "choices": ["System crash", "Process waiting indefinitely for resources", "Memory leak", "CPU overload"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which memory management technique divides memory into fixed-size blocks?", "choices": ["Paging", "Segmentation", "Swapping", "Caching"], "correct": 0, "difficulty": "Hard", "points": 3},
-            {"q": "What is the purpose of virtual memory?", "choices": ["Faster processing", "Extend physical memory", "Improve graphics", "Network communication"], "correct": 1, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "A process and a thread are the same thing", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "Context switching has overhead", "answer": True, "difficulty": "Medium", "points": 2},
-            {"q": "All deadlocks can be prevented", "answer": False, "difficulty": "Hard", "points": 3},
-            {"q": "The kernel is the core part of an operating system", "answer": True, "difficulty": "Easy", "points": 1},
-        ]
-    },
-    
-    "Software Engineering": {
-        "MCQ": [
-            {"q": "Which software development model emphasizes iterative development?", "choices": ["Waterfall", "Agile", "Spiral", "V-Model"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "What does UML stand for?", "choices": ["Universal Markup Language", "Unified Modeling Language", "User Mode Logic", "Uniform Method Library"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "Which testing level focuses on individual units?", "choices": ["Integration Testing", "System Testing", "Unit Testing", "Acceptance Testing"], "correct": 2, "difficulty": "Easy", "points": 1},
-            {"q": "What is refactoring?", "choices": ["Adding new features", "Rewriting code from scratch", "Improving code structure without changing behavior", "Fixing bugs"], "correct": 2, "difficulty": "Medium", "points": 2},
-            {"q": "Which SOLID principle states that classes should have one reason to change?", "choices": ["Open/Closed", "Single Responsibility", "Liskov Substitution", "Interface Segregation"], "correct": 1, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "Version control systems help track code changes", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "Waterfall model allows going back to previous phases easily", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "Code reviews can improve software quality", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "Design patterns are specific implementations", "answer": False, "difficulty": "Medium", "points": 2},
-        ]
-    },
-    
-    "Artificial Intelligence": {
-        "MCQ": [
-            {"q": "What is the Turing Test used for?", "choices": ["Measuring computer speed", "Determining if a machine exhibits intelligent behavior", "Testing network latency", "Evaluating algorithm efficiency"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which search algorithm uses a heuristic function?", "choices": ["BFS", "DFS", "A*", " Uniform Cost Search"], "correct": 2, "difficulty": "Hard", "points": 3},
-            {"q": "What type of AI learns from trial and error?", "choices": ["Supervised Learning", "Unsupervised Learning", "Reinforcement Learning", "Transfer Learning"], "correct": 2, "difficulty": "Medium", "points": 2},
-            {"q": "What is backpropagation used for?", "choices": ["Data preprocessing", "Training neural networks", "Feature selection", "Model deployment"], "correct": 1, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "Neural networks are inspired by the human brain", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "AI and Machine Learning are the same", "answer": False, "difficulty": "Easy", "points": 1},
-            {"q": "Natural Language Processing is a branch of AI", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "Expert systems use predefined rules", "answer": True, "difficulty": "Medium", "points": 2},
-        ]
-    },
-    
-    "Cloud Computing": {
-        "MCQ": [
-            {"q": "Which cloud service model provides infrastructure?", "choices": ["SaaS", "PaaS", "IaaS", "FaaS"], "correct": 2, "difficulty": "Medium", "points": 2},
-            {"q": "What does AWS stand for?", "choices": ["Amazon Web Services", "Advanced Web System", "Automatic Web Service", "Amazon Wireless System"], "correct": 0, "difficulty": "Easy", "points": 1},
-            {"q": "Which deployment model is owned by a single organization?", "choices": ["Public Cloud", "Private Cloud", "Hybrid Cloud", "Community Cloud"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "What is auto-scaling in cloud computing?", "choices": ["Automatic backup", "Automatic resource adjustment", "Automatic deployment", "Automatic monitoring"], "correct": 1, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "Cloud computing eliminates the need for data centers", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "Virtualization is a key technology in cloud computing", "answer": True, "difficulty": "Medium", "points": 2},
-            {"q": "All cloud services are free", "answer": False, "difficulty": "Easy", "points": 1},
-            {"q": "Cloud storage can be accessed from anywhere with internet", "answer": True, "difficulty": "Easy", "points": 1},
-        ]
-    },
-    
-    "Cybersecurity": {
-        "MCQ": [
-            {"q": "What does CIA triad stand for in security?", "choices": ["Confidentiality, Integrity, Availability", "Control, Inspection, Analysis", "Centralized, Integrated, Automated", "Cloud, Infrastructure, Applications"], "correct": 0, "difficulty": "Medium", "points": 2},
-            {"q": "Which attack involves flooding a server with traffic?", "choices": ["Phishing", "DDoS", "SQL Injection", "Man-in-the-Middle"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "What is encryption used for?", "choices": ["Speed up data transfer", "Protect data confidentiality", "Compress files", "Monitor network"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "Which protocol provides secure communication over networks?", "choices": ["HTTP", "FTP", "SSL/TLS", "SMTP"], "correct": 2, "difficulty": "Medium", "points": 2},
-        ],
-        "TF": [
-            {"q": "Firewalls can block unauthorized access", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "Two-factor authentication is less secure than passwords alone", "answer": False, "difficulty": "Easy", "points": 1},
-            {"q": "Social engineering exploits human psychology", "answer": True, "difficulty": "Medium", "points": 2},
-            {"q": "Antivirus software can detect all types of malware", "answer": False, "difficulty": "Medium", "points": 2},
-        ]
-    },
-    
-    "Mobile Development": {
-        "MCQ": [
-            {"q": "Which language is primarily used for Android development?", "choices": ["Swift", "Kotlin", "C#", "Ruby"], "correct": 1, "difficulty": "Easy", "points": 1},
-            {"q": "What is the main advantage of React Native?", "choices": ["Better performance", "Cross-platform development", "Smaller app size", "More features"], "correct": 1, "difficulty": "Medium", "points": 2},
-            {"q": "Which company developed Swift programming language?", "choices": ["Google", "Microsoft", "Apple", "Facebook"], "correct": 2, "difficulty": "Easy", "points": 1},
-            {"q": "What is an APK file?", "choices": ["Android Package Kit", "Application Programming Key", "Advanced Plugin Kit", "App Performance Kernel"], "correct": 0, "difficulty": "Easy", "points": 1},
-        ],
-        "TF": [
-            {"q": "iOS apps can run on Android devices", "answer": False, "difficulty": "Easy", "points": 1},
-            {"q": "Mobile apps can access device sensors", "answer": True, "difficulty": "Easy", "points": 1},
-            {"q": "Flutter uses JavaScript for development", "answer": False, "difficulty": "Medium", "points": 2},
-            {"q": "Push notifications can work when app is closed", "answer": True, "difficulty": "Medium", "points": 2},
-        ]
-    }
-}
+# Questions are read per course from a JSON Lines bank (see question_bank.py), so the
+# bank's size does not affect startup; --question-bank selects another file
+
+def __getattr__(name):
+    """QUESTION_BANK as {course: {"MCQ": [...], "TF": [...]}}, loaded on first access"""
+    if name == "QUESTION_BANK":
+        bank = QuestionBank().as_dict()
+        globals()["QUESTION_BANK"] = bank
+        return bank
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def generate_phone():
+PHONE_PREFIXES = [0, 1, 2, 5]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "iti.edu.eg", "hotmail.com"]
+
+def generate_phone(rng=random):
     """Generate Egyptian phone number (format: 01X XXXXXXXX)"""
-    return f"01{random.choice([0, 1, 2, 5])}{random.randint(10000000, 99999999)}"
+    return f"01{rng.choice(PHONE_PREFIXES)}{rng.randint(10000000, 99999999)}"
+
+def generate_phones(columns, size):
+    """Generate `size` Egyptian phone numbers from whole columns of draws"""
+    prefixes = columns.choice(PHONE_PREFIXES, size)
+    numbers = columns.integers(10000000, 99999999, size)
+    return [f"01{prefix}{number}" for prefix, number in zip(prefixes, numbers)]
 
-def generate_email(first_name, last_name):
+def generate_email(first_name, last_name, rng=random):
     """Generate email address"""
-    domains = ["gmail.com", "yahoo.com", "outlook.com", "iti.edu.eg", "hotmail.com"]
-    return f"{first_name.lower()}.{last_name.lower()}{random.randint(1, 999)}@{random.choice(domains)}"
+    return f"{first_name.lower()}.{last_name.lower()}{rng.randint(1, 999)}@{rng.choice(EMAIL_DOMAINS)}"
+
+def date_strings_before(reference_date, max_days):
+    """'YYYY-MM-DD' strings for reference_date minus 0..max_days days, indexed by offset"""
+    return [(reference_date - timedelta(days=days)).strftime('%Y-%m-%d') for days in range(max_days + 1)]
+
+def group_by(rows, key, value=None):
+    """Build a hash index mapping row[key] -> list of rows (or of row[value])"""
+    index = defaultdict(list)
+    for row in rows:
+        index[row[key]].append(row if value is None else row[value])
+    return index
 
-def get_random_name(gender):
+def get_random_name(gender, rng=random):
     """Get random Egyptian name based on gender"""
     if gender == 'M':
-        first_name = random.choice(EGYPTIAN_FIRST_NAMES_MALE)
+        first_name = rng.choice(EGYPTIAN_FIRST_NAMES_MALE)
     else:
-        first_name = random.choice(EGYPTIAN_FIRST_NAMES_FEMALE)
-    last_name = random.choice(EGYPTIAN_LAST_NAMES)
+        first_name = rng.choice(EGYPTIAN_FIRST_NAMES_FEMALE)
+    last_name = rng.choice(EGYPTIAN_LAST_NAMES)
     return first_name, last_name
 
+class IdColumns:
+    """Compact append-only table of integer id columns, each backed by array('i')"""
+    def __init__(self, *names):
+        self.names = names
+        self._columns = [array('i') for _ in names]
+    
+    def append(self, *values):
+        for column, value in zip(self._columns, values):
+            column.append(value)
+    
+    def column(self, name):
+        return self._columns[self.names.index(name)]
+    
+    def __len__(self):
+        return len(self._columns[0])
+    
+    def __iter__(self):
+        return zip(*self._columns)
+
+class TableChecksums:
+    """Running row count and SHA-256 digest of every row written, per table"""
+    def __init__(self):
+        self.row_counts = {}
+        self.total_rows = 0
+        self._digests = {}
+    
+    def update(self, table, values):
+        digest = self._digests.get(table)
+        if digest is None:
+            digest = self._digests.setdefault(table, hashlib.sha256())
+        digest.update(repr(tuple(values)).encode("utf-8"))
+        self.row_counts[table] = self.row_counts.get(table, 0) + 1
+        self.total_rows += 1
+    
+    def digests(self):
+        return {table: digest.hexdigest()[:16] for table, digest in self._digests.items()}
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+# ============================================================================
+# COLUMN GENERATION ENGINES
+# ============================================================================
+
+# Rows generated per column draw; bounds the arrays held in memory at once
+CHUNK_ROWS = 10000
+
+class PythonColumns:
+    """Draws whole columns of random values with the standard library RNG"""
+    def __init__(self, rng=random):
+        self.rng = rng
+    
+    def integers(self, low, high, size):
+        """`size` ints uniform on [low, high] (inclusive, like randint)"""
+        randint = self.rng.randint
+        return [randint(low, high) for _ in range(size)]
+    
+    def uniform(self, low, high, size, decimals=None):
+        uniform = self.rng.uniform
+        if decimals is None:
+            return [uniform(low, high) for _ in range(size)]
+        return [round(uniform(low, high), decimals) for _ in range(size)]
+    
+    def choice(self, options, size):
+        return self.rng.choices(options, k=size)
+    
+    def indexes(self, lengths):
+        """One index in range(n) for every n in lengths"""
+        randrange = self.rng.randrange
+        return [randrange(n) for n in lengths]
+
+class NumpyColumns:
+    """Draws whole columns of random values as NumPy arrays, returned as Python lists"""
+    def __init__(self, rng=random):
+        # Seed from the stage RNG so --seed stays reproducible with this engine too
+        self.generator = numpy.random.default_rng(rng.getrandbits(64))
+    
+    def integers(self, low, high, size):
+        return self.generator.integers(low, high, size=size, endpoint=True).tolist()
+    
+    def uniform(self, low, high, size, decimals=None):
+        values = self.generator.uniform(low, high, size=size)
+        if decimals is not None:
+            values = values.round(decimals)
+        return values.tolist()
+    
+    def choice(self, options, size):
+        picks = self.generator.integers(0, len(options), size=size)
+        return [options[i] for i in picks.tolist()]
+    
+    def indexes(self, lengths):
+        lengths = numpy.asarray(lengths)
+        return (self.generator.random(len(lengths)) * lengths).astype(numpy.int64).tolist()
+
+COLUMN_ENGINES = {'python': PythonColumns, 'numpy': NumpyColumns}
+
+def make_columns(engine, rng=random):
+    """Column generator for --engine, drawing its randomness from rng"""
+    if engine == 'numpy' and numpy is None:
+        raise RuntimeError("--engine numpy requires NumPy (pip install numpy)")
+    return COLUMN_ENGINES[engine](rng)
+
+def chunks(total, size=CHUNK_ROWS):
+    """(start, length) pairs covering range(total) in blocks of `size`"""
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+# ============================================================================
+# DATABASE BACKENDS
+# ============================================================================
+
+class SqlServerBackend:
+    """SQL Server through pyodbc and ODBC Driver 17"""
+    name = "SQL Server"
+    
+    def __init__(self, server, database, username='', password=''):
+        self.server = server
+        self.database = database
+        self.username = username
+        self.connection_string = build_connection_string(server, database, username, password)
+        self._sequences_ready = set()  # sequences known to exist on the server
+    
+    def describe(self):
+        auth = 'SQL Server' if self.username else 'Windows'
+        return f"Server: {self.server}\nDatabase: {self.database}\nAuthentication: {auth}"
+    
+    def connect(self):
+        if pyodbc is None:
+            raise RuntimeError("pyodbc is not installed (use --backend sqlite or --output-dir)")
+        return pyodbc.connect(self.connection_string)
+    
+    def prepare_cursor(self, cursor):
+        # Send each executemany() batch as a single parameter array
+        cursor.fast_executemany = True
+    
+    def identity_insert(self, cursor, table, enabled):
+        cursor.execute(f"SET IDENTITY_INSERT {table} {'ON' if enabled else 'OFF'}")
+    
+    def disable_constraints(self, cursor):
+        cursor.execute("EXEC sp_MSforeachtable 'ALTER TABLE ? NOCHECK CONSTRAINT ALL'")
+    
+    def enable_constraints(self, cursor):
+        cursor.execute("EXEC sp_MSforeachtable 'ALTER TABLE ? WITH CHECK CHECK CONSTRAINT ALL'")
+    
+    def foreign_key_enabled(self, cursor, name):
+        cursor.execute("SELECT is_disabled FROM sys.foreign_keys WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        return row is not None and not row[0]
+    
+    def truncate_tables(self, cursor, tables):
+        """TRUNCATE tables (missing ones are skipped)
+        
+        TRUNCATE refuses tables referenced by a foreign key, even a disabled one, so every
+        foreign key pointing at one of the tables is dropped first and recreated after,
+        keeping its actions and its enabled/disabled state.
+        """
+        cursor.execute("""
+            SELECT fk.name, OBJECT_NAME(fk.parent_object_id), OBJECT_NAME(fk.referenced_object_id),
+                   pc.name, rc.name, fk.delete_referential_action_desc,
+                   fk.update_referential_action_desc, fk.is_disabled
+            FROM sys.foreign_keys fk
+            JOIN sys.foreign_key_columns fkc ON fkc.constraint_object_id = fk.object_id
+            JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+            JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+            ORDER BY fk.name, fkc.constraint_column_id
+        """)
+        foreign_keys = {}
+        for name, parent, referenced, column, ref_column, on_delete, on_update, disabled in cursor.fetchall():
+            fk = foreign_keys.setdefault(name, {
+                'parent': parent, 'referenced': referenced, 'columns': [], 'ref_columns': [],
+                'on_delete': on_delete.replace('_', ' '), 'on_update': on_update.replace('_', ' '),
+                'disabled': disabled,
+            })
+            fk['columns'].append(f"[{column}]")
+            fk['ref_columns'].append(f"[{ref_column}]")
+        
+        truncated = set(tables)
+        dropped = {name: fk for name, fk in foreign_keys.items() if fk['referenced'] in truncated}
+        for name, fk in dropped.items():
+            cursor.execute(f"ALTER TABLE [{fk['parent']}] DROP CONSTRAINT [{name}]")
+        for table in tables:
+            cursor.execute(f"IF OBJECT_ID(N'{table}', N'U') IS NOT NULL TRUNCATE TABLE [{table}]")
+        for name, fk in dropped.items():
+            cursor.execute(
+                f"ALTER TABLE [{fk['parent']}] WITH CHECK ADD CONSTRAINT [{name}] "
+                f"FOREIGN KEY ({', '.join(fk['columns'])}) "
+                f"REFERENCES [{fk['referenced']}] ({', '.join(fk['ref_columns'])}) "
+                f"ON DELETE {fk['on_delete']} ON UPDATE {fk['on_update']}"
+            )
+            if fk['disabled']:
+                cursor.execute(f"ALTER TABLE [{fk['parent']}] NOCHECK CONSTRAINT [{name}]")
+    
+    def _ensure_sequence(self, cursor, sequence, table, column):
+        """Create the sequence (as StoredP/all_v2_formatted.sql does) if that script has not been run"""
+        if sequence in self._sequences_ready:
+            return
+        cursor.execute(
+            f"IF OBJECT_ID(N'{sequence}', N'SO') IS NULL "
+            f"BEGIN "
+            f"DECLARE @start INT = ISNULL((SELECT MAX({column}) FROM {table}), 0) + 1; "
+            f"EXEC('CREATE SEQUENCE {sequence} AS INT START WITH ' + CAST(@start AS VARCHAR(12)) "
+            f"+ ' INCREMENT BY 1 CACHE 1000') "
+            f"END"
+        )
+        self._sequences_ready.add(sequence)
+    
+    def reserve_ids(self, cursor, sequence, table, column, count):
+        """Reserve `count` consecutive ids from a SEQUENCE; returns the first one"""
+        self._ensure_sequence(cursor, sequence, table, column)
+        cursor.execute(
+            "SET NOCOUNT ON; DECLARE @first SQL_VARIANT; "
+            "EXEC sp_sequence_get_range @sequence_name = ?, @range_size = ?, @range_first_value = @first OUTPUT; "
+            "SELECT CAST(@first AS INT)",
+            (sequence, count)
+        )
+        return cursor.fetchone()[0]
+    
+    def restart_sequence(self, cursor, sequence, table, column, start):
+        self._ensure_sequence(cursor, sequence, table, column)
+        cursor.execute(f"ALTER SEQUENCE {sequence} RESTART WITH {int(start)}")
+    
+    def create_index(self, cursor, name, table, columns, include=()):
+        include_sql = f" INCLUDE ({', '.join(include)})" if include else ""
+        cursor.execute(
+            f"IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = '{name}') "
+            f"CREATE NONCLUSTERED INDEX {name} ON {table} ({', '.join(columns)}){include_sql}"
+        )
+    
+    def drop_index(self, cursor, name, table):
+        cursor.execute(f"DROP INDEX IF EXISTS {name} ON {table}")
+    
+    def call_procedure(self, cursor, name, params, outputs=(), messages=None):
+        """EXEC a stored procedure and return the rows of its last result set
+        
+        `outputs` lists the SQL types of trailing OUTPUT parameters; their values are
+        selected after the EXEC, so they arrive as the last result set. Informational
+        messages (PRINT, STATISTICS IO) are appended to `messages` when a list is given.
+        """
+        out_vars = [f"@out{i}" for i in range(len(outputs))]
+        args = ["?"] * len(params) + [f"{var} OUTPUT" for var in out_vars]
+        sql = f"EXEC {name} {', '.join(args)}"
+        if outputs:
+            declares = ", ".join(f"{var} {sql_type}" for var, sql_type in zip(out_vars, outputs))
+            sql = f"SET NOCOUNT ON; DECLARE {declares}; {sql}; SELECT {', '.join(out_vars)}"
+        cursor.execute(sql, params)
+        
+        rows = []
+        while True:
+            if cursor.description:
+                rows = cursor.fetchall()
+            if messages is not None:
+                messages.extend(text for _, text in cursor.messages or ())
+            if not cursor.nextset():
+                return rows
+    
+    def fetch_page(self, cursor, name, params, size):
+        """EXEC a list procedure and read at most `size` rows of its result with fetchmany
+        
+        Returns (rows, column names).
+        """
+        cursor.execute(f"EXEC {name} {', '.join('?' * len(params))}", params)
+        while cursor.description is None:
+            if not cursor.nextset():
+                return [], []
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchmany(size)
+        # Drain what is left so errors raised after the SELECT still surface here
+        while cursor.nextset():
+            pass
+        return rows, columns
+
+def build_connection_string(server, database, username='', password=''):
+    """ODBC connection string (Windows Auth when no username is given)"""
+    if username:
+        return (
+            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+            f"SERVER={server};"
+            f"DATABASE={database};"
+            f"UID={username};"
+            f"PWD={password}"
+        )
+    return (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={server};"
+        f"DATABASE={database};"
+        f"Trusted_Connection=yes;"
+    )
+
+BACKENDS = {'sqlserver': SqlServerBackend, 'sqlite': SqliteBackend}
+
+# Tables whose ids are handed out by a database sequence: table -> (sequence, id column)
+ID_SEQUENCES = {"Student_Answer": ("dbo.Seq_Student_Answer_Id", "A_Id")}
+
+# Keyset-paginated list procedures -> result columns of the page key, in parameter order
+PAGED_PROCEDURES = {
+    "SP_GetStudentsByDepartmentPage": ("S_LName", "S_FName", "S_Id"),
+    "SP_GetStudentEnrollmentsPage": ("Enrollment_Date", "C_Id"),
+    "SP_GetAvailableExamsForStudentPage": ("E_Date", "CourseName", "E_Id"),
+}
+DEFAULT_PAGE_SIZE = 500
+
 # ============================================================================
 # DATABASE CONNECTION
 # ============================================================================
 
+class LatencyCursor:
+    """DB-API cursor proxy sleeping before every statement, to model a remote server over a local backend"""
+    def __init__(self, cursor, latency):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_latency', latency)  # seconds per round trip
+        object.__setattr__(self, '_in_call', False)
+
+    def execute(self, sql, *args):
+        self._wait()
+        result = self._cursor.execute(sql, *args)
+        return self if result is self._cursor else result
+
+    def executemany(self, sql, rows):
+        self._wait()
+        result = self._cursor.executemany(sql, rows)
+        return self if result is self._cursor else result
+
+    @contextmanager
+    def single_round_trip(self):
+        """One sleep for a call the backend may run as several statements (emulated procedures)"""
+        self._wait()
+        object.__setattr__(self, '_in_call', True)
+        try:
+            yield
+        finally:
+            object.__setattr__(self, '_in_call', False)
+
+    def _wait(self):
+        if not self._in_call:
+            time.sleep(self._latency)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
 class DatabaseConnection:
-    def __init__(self, connection_string):
-        self.connection_string = connection_string
+    can_query = True
+    
+    def __init__(self, backend, batch_size=1000, use_batching=True, verbose=True, stats=None,
+                 simulated_latency=0.0):
+        self.backend = backend
+        self.verbose = verbose  # pooled connections open and close quietly
         self.conn = None
         self.cursor = None
+        self.batch_size = batch_size
+        self.use_batching = use_batching
+        self._pending = {}  # (table, columns) -> buffered row tuples
+        self.checksums = TableChecksums()
+        self.round_trips = 0  # statements and commits sent to the server
+        self._procedure_listeners = []  # called with (name, params) after each procedure call
+        self.stats = stats  # QueryStats recording every statement, or None
+        self.simulated_latency = simulated_latency  # seconds added to every round trip (LatencyCursor)
     
     def connect(self):
         """Establish database connection"""
         try:
-            self.conn = pyodbc.connect(self.connection_string)
+            self.conn = self.backend.connect()
             self.cursor = self.conn.cursor()
-            print("✅ Database connection established successfully!")
+            self.backend.prepare_cursor(self.cursor)
+            if self.simulated_latency:
+                self.cursor = LatencyCursor(self.cursor, self.simulated_latency)
+            if self.stats is not None:
+                self.cursor = InstrumentedCursor(self.cursor, self.stats)
+            if self.verbose:
+                print(f"✅ {self.backend.name} connection established successfully!")
             return True
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
             return False
     
+    def ping(self):
+        """Health check: True if the connection can still run a trivial query"""
+        try:
+            self.cursor.execute("SELECT 1")
+            self.cursor.fetchone()
+            return True
+        except Exception:
+            return False
+    
     def close(self):
         """Close database connection"""
         if self.cursor:
             self.cursor.close()
         if self.conn:
             self.conn.close()
-        print("🔒 Database connection closed.")
+        if self.verbose:
+            print("🔒 Database connection closed.")
+    
+    def insert(self, table, columns, values):
+        """Insert one row, buffering it per table when batching is enabled"""
+        columns = tuple(columns)
+        self.checksums.update(table, values)
+        if not self.use_batching:
+            self.cursor.execute(build_insert_sql(table, columns), tuple(values))
+            self.round_trips += 1
+            return
+        
+        key = (table, columns)
+        rows = self._pending.setdefault(key, [])
+        rows.append(tuple(values))
+        if len(rows) >= self.batch_size:
+            self._flush_rows(key)
+    
+    def identity_insert(self, table, enabled):
+        """Toggle SET IDENTITY_INSERT for explicit ids on an IDENTITY column"""
+        if not enabled:
+            # Buffered rows must reach the server while IDENTITY_INSERT is still ON
+            self.flush()
+        self.backend.identity_insert(self.cursor, table, enabled)
+        self.round_trips += 1
+    
+    def reserve_ids(self, table, count):
+        """Reserve `count` consecutive ids for table from its sequence; returns the first"""
+        sequence, column = ID_SEQUENCES[table]
+        with self._round_trip():
+            first = self.backend.reserve_ids(self.cursor, sequence, table, column, count)
+        self.round_trips += 1
+        return first
+    
+    def restart_ids(self, table, start=1):
+        """Restart the id sequence of table (after its rows were cleared)"""
+        sequence, column = ID_SEQUENCES[table]
+        with self._round_trip():
+            self.backend.restart_sequence(self.cursor, sequence, table, column, start)
+        self.round_trips += 1
+    
+    def truncate_tables(self, tables):
+        """Empty tables in one pass (TRUNCATE where the backend has it)"""
+        self.flush()
+        with self._round_trip():
+            self.backend.truncate_tables(self.cursor, tables)
+        self.round_trips += 1
+    
+    def disable_constraints(self):
+        """Stop foreign key checks while tables are loaded out of order"""
+        self.backend.disable_constraints(self.cursor)
+        self.commit()
+    
+    def enable_constraints(self):
+        """Turn foreign key checks back on, validating the loaded rows"""
+        self.backend.enable_constraints(self.cursor)
+        self.commit()
+    
+    def foreign_key_enabled(self, name):
+        """True if the foreign key `name` is checked on this connection's inserts"""
+        self.round_trips += 1
+        return self.backend.foreign_key_enabled(self.cursor, name)
+    
+    def call_procedure(self, name, *params, outputs=()):
+        """Run a stored procedure (emulated on SQLite) and return its last result set"""
+        self.flush()
+        started = time.perf_counter()
+        try:
+            with self._round_trip():
+                rows = self.backend.call_procedure(self.cursor, name, params, outputs)
+        except Exception:
+            self._record_procedure(name, started, error=True)
+            raise
+        self._record_procedure(name, started)
+        self.round_trips += 1
+        for listener in self._procedure_listeners:
+            listener(name, params)
+        return rows
+    
+    def iter_pages(self, name, *params, page_size=DEFAULT_PAGE_SIZE):
+        """Yield the result of a keyset-paginated list procedure one page (list of rows) at a time
+        
+        Each page is one call of `name` with the previous page's last key, read with
+        fetchmany, so memory stays at one page however long the list is and the caller can
+        stop early, e.g. next(db.iter_pages("SP_GetStudentsByDepartmentPage", dep_id)).
+        """
+        key_columns = PAGED_PROCEDURES[name]
+        last_key = (None,) * len(key_columns)
+        while True:
+            self.flush()
+            started = time.perf_counter()
+            try:
+                with self._round_trip():
+                    rows, columns = self.backend.fetch_page(self.cursor, name, params + last_key + (page_size,),
+                                                            page_size)
+            except Exception:
+                self._record_procedure(name, started, error=True)
+                raise
+            self._record_procedure(name, started)
+            self.round_trips += 1
+            if not rows:
+                return
+            last_key = tuple(rows[-1][columns.index(column)] for column in key_columns)
+            yield rows
+            if len(rows) < page_size:
+                return
+    
+    def _round_trip(self):
+        """Context for one server call the backend may run as several statements"""
+        return self.cursor.single_round_trip() if self.simulated_latency else nullcontext()
+    
+    def _record_procedure(self, name, started, error=False):
+        if self.stats is not None:
+            self.stats.record_procedure(name, time.perf_counter() - started, error)
+    
+    def add_procedure_listener(self, listener):
+        """Register listener(name, params) to run after every successful procedure call"""
+        self._procedure_listeners.append(listener)
+    
+    def remove_procedure_listener(self, listener):
+        self._procedure_listeners.remove(listener)
+    
+    def correct_exam(self, e_id, s_id):
+        """Grade one student's exam with SP_CorrectExam and return the score percentage"""
+        rows = self.call_procedure("SP_CorrectExam", e_id, s_id, outputs=["DECIMAL(5,2)"])
+        return rows[0][0] if rows else None
+    
+    def grade_exams_bulk(self, exam_ids):
+        """Grade every submission of the given exams in one SP_CorrectExamsBulk call
+        
+        Returns the (S_Id, E_Id, Grade) rows written by the MERGE.
+        """
+        # Table-valued parameters are passed as a list of row tuples
+        return self.call_procedure("SP_CorrectExamsBulk", [(e_id,) for e_id in exam_ids])
+    
+    def enroll_students_bulk(self, enrollments):
+        """Enroll (S_Id, Track_Id, Course_Id, Enrollment_Date) rows with one SP_EnrollStudentsBulk call
+        
+        Each row names a Course_Id or a Track_Id (all its courses); existing enrollments are
+        skipped. Returns (requested student/course pairs, newly enrolled pairs).
+        """
+        rows = self.call_procedure("SP_EnrollStudentsBulk", list(enrollments))
+        return tuple(rows[0]) if rows else (0, 0)
+    
+    def generate_exams_bulk(self, requests, questions=()):
+        """Create exams with one SP_GenerateExamsBulk call
+        
+        requests are (Request_Id, C_Id, NumTrueFalse, NumMCQ, E_Title, E_Duaration, E_Date)
+        rows; questions optionally fixes the (Request_Id, Q_Id) picks of some requests, the
+        rest are drawn by the procedure. Returns (Request_Id, E_Id, E_Total_Marks,
+        QuestionCount) rows.
+        """
+        return self.call_procedure("SP_GenerateExamsBulk", list(requests), list(questions))
+    
+    def import_questions_bulk(self, questions, choices):
+        """Insert questions and their choices with one SP_ImportQuestionsBulk call
+        
+        questions are (Import_Id, C_Id, Q_Content, Q_Type, Q_Points, Q_hardness) rows, choices
+        (Import_Id, Choice_No, Is_Correct, Choice_Content) rows. Ids are assigned by the
+        procedure; returns (Import_Id, Q_Id, First_Choice_Id, ChoiceCount) rows.
+        """
+        return self.call_procedure("SP_ImportQuestionsBulk", list(questions), list(choices))
+    
+    def flush(self):
+        """Write every buffered row to the database"""
+        for key in list(self._pending):
+            self._flush_rows(key)
+    
+    def _flush_rows(self, key):
+        """Send the buffered rows of one table in a single executemany() call"""
+        rows = self._pending.pop(key, None)
+        if not rows:
+            return
+        table, columns = key
+        self.cursor.executemany(build_insert_sql(table, columns), rows)
+        self.round_trips += 1
     
     def commit(self):
         """Commit transaction"""
         if self.conn:
+            self.flush()
+            started = time.perf_counter()
             self.conn.commit()
+            if self.stats is not None:
+                self.stats.record_statement("COMMIT", time.perf_counter() - started)
+            self.round_trips += 1
     
     def rollback(self):
         """Rollback transaction"""
+        self._pending.clear()
         if self.conn:
             self.conn.rollback()
 
+def build_insert_sql(table, columns):
+    """Build a parameterized INSERT statement for the given columns"""
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+# ============================================================================
+# BULK FILE EXPORT (offline, bcp / BULK INSERT)
+# ============================================================================
+
+# Tables in foreign key order, as loaded by the generated load.sql
+LOAD_ORDER = [
+    "Department", "Track", "Track_JobProfile", "Instructor", "Instructor_Phones",
+    "Student", "Student_Phones", "Course", "Topic", "Course_Topic", "Student_Course",
+    "Teaching", "Exam", "Question", "Exam_Questions", "Student_Exam",
+    "Student_Answer", "Choice"
+]
+
+# Tables whose key column is an IDENTITY and needs IDENTITY_INSERT on load
+IDENTITY_TABLES = {"Exam"}
+
+BCP_FIELD_TERMINATOR = "\t"
+BCP_ROW_TERMINATOR = "\r\n"
+
+class BulkFileWriter:
+    """Drop-in replacement for DatabaseConnection that writes bcp-compatible files"""
+    can_query = False
+    
+    def __init__(self, output_dir):
+        self.output_dir = os.path.abspath(output_dir)
+        self.checksums = TableChecksums()
+        self.round_trips = 0  # nothing is sent to a server
+        self._files = {}    # table -> open data file
+        self._columns = {}  # table -> (column names, SQL types)
+        self._next_ids = {}  # table -> next id of the exported sequence-backed ids
+        self._lock = threading.Lock()
+    
+    def connect(self):
+        """Create the output directory (no database needed)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        print(f"✅ Writing bulk-load files to {self.output_dir}")
+        return True
+    
+    def insert(self, table, columns, values):
+        """Append one row to the table's character-mode data file"""
+        data_file = self._files.get(table) or self._open(table, columns, values)
+        data_file.write(BCP_FIELD_TERMINATOR.join(bcp_field(v) for v in values) + BCP_ROW_TERMINATOR)
+        # Stages share one writer with --workers > 1; the running totals are not thread-safe
+        with self._lock:
+            self.checksums.update(table, values)
+    
+    def reserve_ids(self, table, count):
+        """Hand out ids locally; load.sql moves the real sequence past them afterwards"""
+        with self._lock:
+            first = self._next_ids.get(table, 1)
+            self._next_ids[table] = first + count
+        return first
+    
+    def _open(self, table, columns, values):
+        with self._lock:
+            if table not in self._files:
+                path = os.path.join(self.output_dir, f"{table}.dat")
+                self._files[table] = open(path, "w", encoding="utf-8", newline="")
+                self._columns[table] = (tuple(columns), [bcp_sql_type(v) for v in values])
+            return self._files[table]
+    
+    def identity_insert(self, table, enabled):
+        """Explicit identity values are kept by the generated load script"""
+    
+    def flush(self):
+        for data_file in list(self._files.values()):
+            data_file.flush()
+    
+    def commit(self):
+        self.flush()
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        """Close the data files and write the format files and load script"""
+        for data_file in self._files.values():
+            data_file.close()
+        for table, (columns, sql_types) in self._columns.items():
+            write_bcp_format_file(os.path.join(self.output_dir, f"{table}.xml"), columns, sql_types)
+        write_bulk_load_script(os.path.join(self.output_dir, "load.sql"), self.output_dir,
+                               [t for t in LOAD_ORDER if t in self._columns], self._columns)
+        print(f"📦 Wrote {len(self._columns)} tables + format files and load.sql to {self.output_dir}")
+
+def bcp_field(value):
+    """Render one value for a character-mode bcp file (empty field = NULL)"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    text = str(value)
+    # Terminators cannot be escaped in bcp character mode
+    return text.replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+def bcp_sql_type(value):
+    """Pick the XML format file column type for a sample value"""
+    if isinstance(value, bool) or isinstance(value, int):
+        return "SQLINT"
+    if isinstance(value, float):
+        return "SQLFLT8"
+    return "SQLNVARCHAR"
+
+def escape_terminator(terminator):
+    """Spell a terminator the way format files do (e.g. a tab as \\t)"""
+    return terminator.encode("unicode_escape").decode("ascii")
+
+def write_bcp_format_file(path, columns, sql_types):
+    """Write an XML bcp format file describing a tab-delimited UTF-8 data file"""
+    last = len(columns)
+    fields = "\n".join(
+        f'  <FIELD ID="{i}" xsi:type="CharTerm" TERMINATOR="{escape_terminator(term)}" />'
+        for i, term in enumerate(
+            [BCP_FIELD_TERMINATOR] * (last - 1) + [BCP_ROW_TERMINATOR], 1)
+    )
+    row = "\n".join(
+        f'  <COLUMN SOURCE="{i}" NAME="{name}" xsi:type="{sql_type}" />'
+        for i, (name, sql_type) in enumerate(zip(columns, sql_types), 1)
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '<?xml version="1.0"?>\n'
+            '<BCPFORMAT xmlns="http://schemas.microsoft.com/sqlserver/2004/bulkload/format" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+            f" <RECORD>\n{fields}\n </RECORD>\n"
+            f" <ROW>\n{row}\n </ROW>\n"
+            "</BCPFORMAT>\n"
+        )
+
+def write_bulk_load_script(path, data_dir, tables, table_columns):
+    """Write a sqlcmd script that bulk loads every exported table in FK order"""
+    lines = [
+        "-- Generated by insert_egyptian_mock_data_v2.py --output-dir",
+        "-- Run with: sqlcmd -S <server> -d ITI_E -i load.sql -v DataDir=\"<folder on the server>\"",
+        f"-- DataDir is required (no :setvar here, it would override -v); exported to {data_dir}",
+        "SET NOCOUNT ON;",
+        "EXEC sp_MSforeachtable 'ALTER TABLE ? NOCHECK CONSTRAINT ALL';",
+        "GO",
+    ]
+    for table in tables:
+        column_list = ", ".join(table_columns[table][0])
+        lines.append(f"PRINT 'Loading {table}...';")
+        if table in IDENTITY_TABLES:
+            lines.append(f"SET IDENTITY_INSERT {table} ON;")
+        lines += [
+            f"INSERT INTO {table} WITH (TABLOCK) ({column_list})",
+            f"SELECT {column_list}",
+            f"FROM OPENROWSET(BULK N'$(DataDir)\\{table}.dat',",
+            f"                FORMATFILE = N'$(DataDir)\\{table}.xml', CODEPAGE = '65001') AS src;",
+        ]
+        if table in IDENTITY_TABLES:
+            lines.append(f"SET IDENTITY_INSERT {table} OFF;")
+        lines.append("GO")
+    for table, (sequence, column) in ID_SEQUENCES.items():
+        if table not in tables:
+            continue
+        lines += [
+            f"IF OBJECT_ID(N'{sequence}', N'SO') IS NOT NULL",
+            "BEGIN",
+            f"    DECLARE @NextId INT = ISNULL((SELECT MAX({column}) FROM {table}), 0) + 1;",
+            f"    EXEC('ALTER SEQUENCE {sequence} RESTART WITH ' + CAST(@NextId AS VARCHAR(12)));",
+            "END",
+            "GO",
+        ]
+    lines += [
+        "EXEC sp_MSforeachtable 'ALTER TABLE ? WITH CHECK CHECK CONSTRAINT ALL';",
+        "GO",
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
 # ============================================================================
 # DATA INSERTION FUNCTIONS
 # ============================================================================
@@ -334,17 +936,20 @@ def clear_tables(db: DatabaseConnection):
     """Clear all tables in reverse dependency order"""
     print("\n🗑️  Clearing existing data...")
     
+    # Student_Course_Grade is derived from Student_Exam; TRUNCATE does not fire its trigger
     tables = [
-        "Student_Answer", "Student_Exam", "Exam_Questions", "Choice", "Question",
+        "Student_Answer", "Student_Exam", "Student_Course_Grade", "Exam_Questions", "Choice", "Question",
         "Exam", "Teaching", "Student_Course", "Course_Topic", "Student_Phones",
         "Student", "Instructor_Phones", "Instructor", "Topic", "Course",
         "Track_JobProfile", "Track", "Department"
     ]
     
     try:
+        db.truncate_tables(tables)
         for table in tables:
-            db.cursor.execute(f"DELETE FROM {table}")
             print(f"   Cleared {table}")
+        for table in ID_SEQUENCES:
+            db.restart_ids(table)
         db.commit()
         print("✅ All tables cleared successfully!")
     except Exception as e:
@@ -352,31 +957,28 @@ def clear_tables(db: DatabaseConnection):
         db.rollback()
         raise
 
-def insert_departments(db: DatabaseConnection):
+def insert_departments(db: DatabaseConnection, rng=random):
     """Insert Department data"""
     print("\n📊 Inserting Departments...")
     departments = []
     
     for i, dept_name in enumerate(DEPARTMENTS, 1):
-        db.cursor.execute(
-            "INSERT INTO Department (D_Id, D_Name) VALUES (?, ?)",
-            (i, dept_name)
-        )
+        db.insert("Department", ("D_Id", "D_Name"), (i, dept_name))
         departments.append({'D_Id': i, 'D_Name': dept_name})
     
     db.commit()
     print(f"   ✅ Inserted {len(departments)} departments")
     return departments
 
-def insert_tracks(db: DatabaseConnection, departments):
+def insert_tracks(db: DatabaseConnection, departments, rng=random):
     """Insert Track data"""
     print("\n🛤️  Inserting Tracks...")
     tracks = []
     
     for i, track_name in enumerate(TRACKS, 1):
-        dep_id = random.randint(1, len(departments))
-        db.cursor.execute(
-            "INSERT INTO Track (Track_Id, Track_Name, Track_Des, Dep_Id) VALUES (?, ?, ?, ?)",
+        dep_id = rng.randint(1, len(departments))
+        db.insert(
+            "Track", ("Track_Id", "Track_Name", "Track_Des", "Dep_Id"),
             (i, track_name, f"Specialized training in {track_name}", dep_id)
         )
         tracks.append({'Track_Id': i, 'Track_Name': track_name, 'Dep_Id': dep_id})
@@ -385,40 +987,36 @@ def insert_tracks(db: DatabaseConnection, departments):
     print(f"   ✅ Inserted {len(tracks)} tracks")
     return tracks
 
-def insert_track_job_profiles(db: DatabaseConnection, tracks):
+def insert_track_job_profiles(db: DatabaseConnection, tracks, rng=random):
     """Insert Track_JobProfile data"""
     print("\n💼 Inserting Track Job Profiles...")
     count = 0
     
     for track in tracks:
-        num_jobs = random.randint(2, 4)
-        selected_jobs = random.sample(JOB_PROFILES, min(num_jobs, len(JOB_PROFILES)))
+        num_jobs = rng.randint(2, 4)
+        selected_jobs = rng.sample(JOB_PROFILES, min(num_jobs, len(JOB_PROFILES)))
         for job in selected_jobs:
-            db.cursor.execute(
-                "INSERT INTO Track_JobProfile (Track_Id, T_JobProfiles) VALUES (?, ?)",
-                (track['Track_Id'], job)
-            )
+            db.insert("Track_JobProfile", ("Track_Id", "T_JobProfiles"), (track['Track_Id'], job))
             count += 1
     
     db.commit()
     print(f"   ✅ Inserted {count} job profiles")
 
-def insert_instructors(db: DatabaseConnection, departments, num_instructors=20):
+def insert_instructors(db: DatabaseConnection, departments, num_instructors=20, rng=random):
     """Insert Instructor data"""
     print(f"\n👨‍🏫 Inserting {num_instructors} Instructors...")
     instructors = []
     
     for i in range(1, num_instructors + 1):
-        gender = random.choice(['M', 'F'])
-        first_name, last_name = get_random_name(gender)
+        gender = rng.choice(['M', 'F'])
+        first_name, last_name = get_random_name(gender, rng)
         
-        db.cursor.execute(
-            """INSERT INTO Instructor 
-               (Ins_Id, Ins_FName, Ins_LName, Ins_Email, Password, Salary, Ins_Gender, Dep_Id) 
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (i, first_name, last_name, generate_email(first_name, last_name),
-             f"Pass{random.randint(1000, 9999)}", random.randint(5000, 15000),
-             gender, random.randint(1, len(departments)))
+        db.insert(
+            "Instructor",
+            ("Ins_Id", "Ins_FName", "Ins_LName", "Ins_Email", "Password", "Salary", "Ins_Gender", "Dep_Id"),
+            (i, first_name, last_name, generate_email(first_name, last_name, rng),
+             f"Pass{rng.randint(1000, 9999)}", rng.randint(5000, 15000),
+             gender, rng.randint(1, len(departments)))
         )
         instructors.append({'Ins_Id': i, 'Ins_FName': first_name, 'Ins_LName': last_name})
     
@@ -426,73 +1024,81 @@ def insert_instructors(db: DatabaseConnection, departments, num_instructors=20):
     print(f"   ✅ Inserted {len(instructors)} instructors")
     return instructors
 
-def insert_instructor_phones(db: DatabaseConnection, instructors):
+def insert_instructor_phones(db: DatabaseConnection, instructors, rng=random):
     """Insert Instructor_Phones data"""
     print("\n📱 Inserting Instructor Phones...")
     count = 0
     
     for inst in instructors:
-        for _ in range(random.randint(1, 2)):
-            db.cursor.execute(
-                "INSERT INTO Instructor_Phones (Ins_Id, Phone) VALUES (?, ?)",
-                (inst['Ins_Id'], generate_phone())
-            )
+        for _ in range(rng.randint(1, 2)):
+            db.insert("Instructor_Phones", ("Ins_Id", "Phone"), (inst['Ins_Id'], generate_phone(rng)))
             count += 1
     
     db.commit()
     print(f"   ✅ Inserted {count} phone numbers")
 
-def insert_students(db: DatabaseConnection, departments, tracks, num_students=100):
-    """Insert Student data"""
+def insert_students(db: DatabaseConnection, departments, tracks, num_students=100, rng=random, columns=None,
+                    first_id=1):
+    """Insert Student data with ids first_id, first_id + 1, ..."""
     print(f"\n👨‍🎓 Inserting {num_students} Students...")
-    students = []
+    columns = columns or PythonColumns(rng)
     
-    for i in range(1, num_students + 1):
-        gender = random.choice(['M', 'F'])
-        first_name, last_name = get_random_name(gender)
-        dept_id = random.randint(1, len(departments))
+    for start, size in chunks(num_students):
+        genders = columns.choice(['M', 'F'], size)
+        male_names = columns.choice(EGYPTIAN_FIRST_NAMES_MALE, size)
+        female_names = columns.choice(EGYPTIAN_FIRST_NAMES_FEMALE, size)
+        last_names = columns.choice(EGYPTIAN_LAST_NAMES, size)
+        ages = columns.integers(18, 30, size)
+        email_numbers = columns.integers(1, 999, size)
+        email_domains = columns.choice(EMAIL_DOMAINS, size)
+        passwords = columns.integers(1000, 9999, size)
+        gpas = columns.uniform(2.0, 4.0, size, decimals=2)
+        track_ids = columns.integers(1, len(tracks), size)
+        dept_ids = columns.integers(1, len(departments), size)
         
-        db.cursor.execute(
-            """INSERT INTO Student 
-               (S_Id, S_FName, S_LName, S_Age, S_Email, S_GPA, Track_Id, Dep_Id) 
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (i, first_name, last_name, random.randint(18, 30),
-             generate_email(first_name, last_name), round(random.uniform(2.0, 4.0), 2),
-             random.randint(1, len(tracks)), dept_id)
-        )
-        students.append({'S_Id': i, 'S_FName': first_name, 'S_LName': last_name})
+        for j in range(size):
+            first_name = male_names[j] if genders[j] == 'M' else female_names[j]
+            last_name = last_names[j]
+            email = f"{first_name.lower()}.{last_name.lower()}{email_numbers[j]}@{email_domains[j]}"
+            db.insert(
+                "Student",
+                ("S_Id", "S_FName", "S_LName", "S_Age", "S_Email", "Password", "S_GPA", "Track_Id", "Dep_Id"),
+                (first_id + start + j, first_name, last_name, ages[j], email, f"Pass{passwords[j]}", gpas[j],
+                 tracks[track_ids[j] - 1]['Track_Id'], departments[dept_ids[j] - 1]['D_Id'])
+            )
     
     db.commit()
-    print(f"   ✅ Inserted {len(students)} students")
-    return students
+    print(f"   ✅ Inserted {num_students} students")
+    # Student ids are contiguous, so downstream stages only need the range
+    return range(first_id, first_id + num_students)
 
-def insert_student_phones(db: DatabaseConnection, students):
+def insert_student_phones(db: DatabaseConnection, students, rng=random, columns=None):
     """Insert Student_Phones data"""
     print("\n📱 Inserting Student Phones...")
+    columns = columns or PythonColumns(rng)
     count = 0
     
-    for student in students:
-        for _ in range(random.randint(1, 2)):
-            db.cursor.execute(
-                "INSERT INTO Student_Phones (S_Id, S_Phone) VALUES (?, ?)",
-                (student['S_Id'], generate_phone())
-            )
-            count += 1
+    for start, size in chunks(len(students)):
+        phone_counts = columns.integers(1, 2, size)
+        phones = iter(generate_phones(columns, sum(phone_counts)))
+        for s_id, num_phones in zip(students[start:start + size], phone_counts):
+            for _ in range(num_phones):
+                db.insert("Student_Phones", ("S_Id", "S_Phone"), (s_id, next(phones)))
+                count += 1
     
     db.commit()
     print(f"   ✅ Inserted {count} phone numbers")
 
-def insert_courses(db: DatabaseConnection, tracks):
+def insert_courses(db: DatabaseConnection, tracks, rng=random, course_names=COURSES):
     """Insert Course data"""
     print("\n📚 Inserting Courses...")
     courses = []
     
-    for i, course_name in enumerate(COURSES, 1):
-        db.cursor.execute(
-            """INSERT INTO Course (C_Id, C_Name, C_Des, C_Duration, Track_Id) 
-               VALUES (?, ?, ?, ?, ?)""",
+    for i, course_name in enumerate(course_names, 1):
+        db.insert(
+            "Course", ("C_Id", "C_Name", "C_Des", "C_Duration", "Track_Id"),
             (i, course_name, f"Comprehensive course in {course_name}",
-             random.choice([30, 45, 60, 90]), random.randint(1, len(tracks)))
+             rng.choice([30, 45, 60, 90]), rng.randint(1, len(tracks)))
         )
         courses.append({'C_Id': i, 'C_Name': course_name})
     
@@ -500,14 +1106,14 @@ def insert_courses(db: DatabaseConnection, tracks):
     print(f"   ✅ Inserted {len(courses)} courses")
     return courses
 
-def insert_topics(db: DatabaseConnection):
+def insert_topics(db: DatabaseConnection, rng=random):
     """Insert Topic data"""
     print("\n📖 Inserting Topics...")
     topics = []
     
     for i, topic_name in enumerate(TOPICS, 1):
-        db.cursor.execute(
-            "INSERT INTO Topic (Topic_Id, Topic_Name, Topic_Des) VALUES (?, ?, ?)",
+        db.insert(
+            "Topic", ("Topic_Id", "Topic_Name", "Topic_Des"),
             (i, topic_name, f"Study materials for {topic_name}")
         )
         topics.append({'Topic_Id': i, 'Topic_Name': topic_name})
@@ -516,443 +1122,723 @@ def insert_topics(db: DatabaseConnection):
     print(f"   ✅ Inserted {len(topics)} topics")
     return topics
 
-def insert_course_topics(db: DatabaseConnection, courses, topics):
+def insert_course_topics(db: DatabaseConnection, courses, topics, rng=random):
     """Insert Course_Topic data"""
     print("\n🔗 Inserting Course-Topic mappings...")
     count = 0
     
     for course in courses:
-        num_topics = random.randint(3, 5)
-        selected_topics = random.sample(topics, min(num_topics, len(topics)))
+        num_topics = rng.randint(3, 5)
+        selected_topics = rng.sample(topics, min(num_topics, len(topics)))
         for topic in selected_topics:
-            db.cursor.execute(
-                "INSERT INTO Course_Topic (C_Id, Topic_Id) VALUES (?, ?)",
-                (course['C_Id'], topic['Topic_Id'])
-            )
+            db.insert("Course_Topic", ("C_Id", "Topic_Id"), (course['C_Id'], topic['Topic_Id']))
             count += 1
     
     db.commit()
     print(f"   ✅ Inserted {count} course-topic mappings")
 
-def insert_student_courses(db: DatabaseConnection, students, courses):
+def insert_student_courses(db: DatabaseConnection, students, courses, rng=random, reference_date=None,
+                           columns=None):
     """Insert Student_Course data"""
     print("\n📝 Inserting Student Course Enrollments...")
-    enrollments = []
+    enrollments = IdColumns('S_Id', 'Course_Id')
+    columns = columns or PythonColumns(rng)
+    enrollment_dates = date_strings_before(reference_date or datetime.now(), 365)
     
-    for student in students:
-        num_courses = random.randint(3, 6)
-        selected_courses = random.sample(courses, min(num_courses, len(courses)))
-        for course in selected_courses:
-            enrollment_date = datetime.now() - timedelta(days=random.randint(1, 365))
-            db.cursor.execute(
-                "INSERT INTO Student_Course (S_Id, Course_Id, Enrollment_Date) VALUES (?, ?, ?)",
-                (student['S_Id'], course['C_Id'], enrollment_date.strftime('%Y-%m-%d'))
-            )
-            enrollments.append({'S_Id': student['S_Id'], 'Course_Id': course['C_Id']})
+    for start, size in chunks(len(students)):
+        course_counts = [min(n, len(courses)) for n in columns.integers(3, 6, size)]
+        days_ago = iter(columns.integers(1, 365, sum(course_counts)))
+        for s_id, num_courses in zip(students[start:start + size], course_counts):
+            for course in rng.sample(courses, num_courses):
+                db.insert(
+                    "Student_Course", ("S_Id", "Course_Id", "Enrollment_Date"),
+                    (s_id, course['C_Id'], enrollment_dates[next(days_ago)])
+                )
+                enrollments.append(s_id, course['C_Id'])
     
     db.commit()
     print(f"   ✅ Inserted {len(enrollments)} enrollments")
     return enrollments
 
-def insert_teaching(db: DatabaseConnection, enrollments, instructors):
+def insert_teaching(db: DatabaseConnection, enrollments, instructors, rng=random):
     """Insert Teaching data"""
     print("\n👥 Inserting Teaching Assignments...")
     count = 0
     
-    for enrollment in enrollments:
-        instructor = random.choice(instructors)
-        db.cursor.execute(
-            "INSERT INTO Teaching (S_Id, Ins_Id, C_Id) VALUES (?, ?, ?)",
-            (enrollment['S_Id'], instructor['Ins_Id'], enrollment['Course_Id'])
-        )
+    for s_id, course_id in enrollments:
+        instructor = rng.choice(instructors)
+        db.insert("Teaching", ("S_Id", "Ins_Id", "C_Id"), (s_id, instructor['Ins_Id'], course_id))
         count += 1
     
     db.commit()
     print(f"   ✅ Inserted {count} teaching assignments")
 
-def insert_exams(db: DatabaseConnection, courses):
+def insert_exams(db: DatabaseConnection, courses, rng=random, reference_date=None):
     """Insert Exam data"""
     print("\n📝 Inserting Exams...")
     exams = []
     exam_id = 1
+    reference_date = reference_date or datetime.now()
     
     # Enable IDENTITY_INSERT for explicit ID values
-    db.cursor.execute("SET IDENTITY_INSERT Exam ON")
+    db.identity_insert("Exam", True)
     
     for course in courses:
-        for exam_num in range(random.randint(2, 3)):
-            exam_date = datetime.now() - timedelta(days=random.randint(1, 365))
-            db.cursor.execute(
-                """INSERT INTO Exam (E_Id, E_Title, E_Total_Marks, E_Duaration, E_Date, C_Id) 
-                   VALUES (?, ?, ?, ?, ?, ?)""",
+        for exam_num in range(rng.randint(2, 3)):
+            exam_date = reference_date - timedelta(days=rng.randint(1, 365))
+            db.insert(
+                "Exam", ("E_Id", "E_Title", "E_Total_Marks", "E_Duaration", "E_Date", "C_Id"),
                 (exam_id, f"{course['C_Name']} - Exam {exam_num + 1}",
-                 random.choice([50, 75, 100]), random.choice([60, 90, 120]),
+                 rng.choice([50, 75, 100]), rng.choice([60, 90, 120]),
                  exam_date.strftime('%Y-%m-%d'), course['C_Id'])
             )
             exams.append({'E_Id': exam_id, 'C_Id': course['C_Id'], 'E_Date': exam_date.strftime('%Y-%m-%d')})
             exam_id += 1
     
-    db.cursor.execute("SET IDENTITY_INSERT Exam OFF")
+    db.identity_insert("Exam", False)
     db.commit()
     print(f"   ✅ Inserted {len(exams)} exams")
     return exams
 
-def insert_questions(db: DatabaseConnection, courses):
-    """Insert Question data from real question bank"""
-    print("\n❓ Inserting Real Questions...")
-    questions = []
+def insert_questions(db: DatabaseConnection, courses, rng=random, bank=None):
+    """Insert Question data from real question bank, streamed one course at a time
+    
+    Each course's Choice rows (MCQ + TF) are written right after its questions, so no
+    question text or choice list outlives its course. Returns compact id columns
+    (Q_Id, C_Id, First_Choice_Id, Choice_Count, Correct_Choice_Id); a question's choices
+    are the Choice_Ids First_Choice_Id .. First_Choice_Id + Choice_Count - 1.
+    """
+    print("\n❓ Inserting Real Questions and Choices (MCQ + True/False)...")
+    bank = bank if bank is not None else QuestionBank()
+    questions = IdColumns('Q_Id', 'C_Id', 'First_Choice_Id', 'Choice_Count', 'Correct_Choice_Id')
     question_id = 1
+    choice_id = 1
+    
+    def add_question(c_id, content, q_type, points, hardness, options):
+        """Insert one question and its (is_correct, text) options"""
+        nonlocal question_id, choice_id
+        db.insert(
+            "Question", ("Q_Id", "Q_Content", "Q_Type", "Q_Points", "Q_hardness", "C_ID"),
+            (question_id, content, q_type, points, hardness, c_id)
+        )
+        correct_id = 0
+        for offset, (is_correct, text) in enumerate(options):
+            db.insert(
+                "Choice", ("Choice_Id", "Q_Id", "Is_Correct", "Choice_Content"),
+                (choice_id + offset, question_id, 1 if is_correct else 0, text)
+            )
+            if is_correct:
+                correct_id = choice_id + offset
+        questions.append(question_id, c_id, choice_id, len(options), correct_id)
+        question_id += 1
+        choice_id += len(options)
     
     for course in courses:
         course_name = course['C_Name']
         
-        # Get questions for this course from question bank
-        if course_name in QUESTION_BANK:
-            course_questions = QUESTION_BANK[course_name]
-            
-            # Insert MCQ questions
-            for mcq in course_questions.get('MCQ', []):
-                db.cursor.execute(
-                    """INSERT INTO Question (Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness,C_ID) 
-                       VALUES (?, ?, ?, ?, ?,?)""",
-                    (question_id, mcq['q'], 'MCQ', mcq['points'], mcq['difficulty'],course['C_Id'])
-                )
-                questions.append({
-                    'Q_Id': question_id, 
-                    'Q_Type': 'MCQ',
-                    'Q_Content': mcq['q'],
-                    'choices': mcq['choices'],
-                    'correct': mcq['correct']
-                })
-                question_id += 1
-            
-            # Insert True/False questions
-            for tf in course_questions.get('TF', []):
-                db.cursor.execute(
-                    """INSERT INTO Question (Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness,C_ID) 
-                       VALUES (?, ?, ?, ?, ?,?)""",
-                    (question_id, tf['q'], 'TF', tf['points'], tf['difficulty'],course['C_Id'])
-                )
-                questions.append({
-                    'Q_Id': question_id, 
-                    'Q_Type': 'TF',
-                    'Q_Content': tf['q'],
-                    'answer': tf['answer']
-                })
-                question_id += 1
+        # Get questions for this course from question bank (in bank file order)
+        if course_name in bank:
+            for question in bank.questions(course_name):
+                q_type = question['type']
+                if q_type == 'MCQ':
+                    options = [(i == question['correct'], text) for i, text in enumerate(question['choices'])]
+                else:
+                    answer = question.get('answer', True)  # Default to True if not specified
+                    options = [(answer == True, 'True'), (answer == False, 'False')]
+                add_question(course['C_Id'], question['q'], q_type, question['points'],
+                             question['difficulty'], options)
         else:
-            # Fallback for courses without specific questions
+            # Fallback for courses without specific questions, with generic choices
             for i in range(10):
-                q_type = random.choice(['TF', 'MCQ'])
-                db.cursor.execute(
-                    """INSERT INTO Question (Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness,C_ID) 
-                       VALUES (?, ?, ?, ?, ?,?)""",
-                    (question_id, f"General question about {course_name} - Q{i+1}",
-                     q_type, random.choice([1, 2, 3]), random.choice(['Easy', 'Medium', 'Hard']),course['C_Id'])
-                )
-                questions.append({
-                    'Q_Id': question_id, 
-                    'Q_Type': q_type,
-                    'Q_Content': f"General question about {course_name} - Q{i+1}"
-                })
-                question_id += 1
+                q_type = rng.choice(['TF', 'MCQ'])
+                points, hardness = rng.choice([1, 2, 3]), rng.choice(['Easy', 'Medium', 'Hard'])
+                if q_type == 'MCQ':
+                    correct_choice = rng.randint(0, 3)
+                    options = [(j == correct_choice, f"Option {chr(65+j)}") for j in range(4)]
+                else:
+                    options = [(True, 'True'), (False, 'False')]
+                add_question(course['C_Id'], f"General question about {course_name} - Q{i+1}",
+                             q_type, points, hardness, options)
+        db.commit()
     
-    db.commit()
-    print(f"   ✅ Inserted {len(questions)} real questions")
+    print(f"   ✅ Inserted {len(questions)} real questions and {choice_id - 1} choices")
     return questions
 
-def insert_choices(db: DatabaseConnection, questions):
-    """Insert Choice data with real answers - including TF choices"""
-    print("\n✔️  Inserting Real Choices (MCQ + True/False)...")
-    choices = []
-    choice_id = 1
-    
-    for question in questions:
-        if question['Q_Type'] == 'MCQ':
-            # Check if we have real choices from question bank
-            if 'choices' in question and 'correct' in question:
-                # Use real choices from question bank
-                for i, choice_text in enumerate(question['choices']):
-                    is_correct = 1 if i == question['correct'] else 0
-                    db.cursor.execute(
-                        """INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content) 
-                           VALUES (?, ?, ?, ?)""",
-                        (choice_id, question['Q_Id'], is_correct, choice_text)
-                    )
-                    choices.append({'Choice_Id': choice_id, 'Q_Id': question['Q_Id']})
-                    choice_id += 1
-            else:
-                # Fallback generic choices
-                correct_choice = random.randint(0, 3)
-                for i in range(4):
-                    db.cursor.execute(
-                        """INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content) 
-                           VALUES (?, ?, ?, ?)""",
-                        (choice_id, question['Q_Id'], 1 if i == correct_choice else 0,
-                         f"Option {chr(65+i)}")
-                    )
-                    choices.append({'Choice_Id': choice_id, 'Q_Id': question['Q_Id']})
-                    choice_id += 1
-        
-        elif question['Q_Type'] == 'TF':
-            # ✅ NEW: Insert True and False choices for TF questions
-            correct_answer = question.get('answer', True)  # Default to True if not specified
-            
-            # Insert "True" choice
-            db.cursor.execute(
-                """INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content) 
-                   VALUES (?, ?, ?, ?)""",
-                (choice_id, question['Q_Id'], 1 if correct_answer == True else 0, 'True')
-            )
-            choices.append({'Choice_Id': choice_id, 'Q_Id': question['Q_Id'], 'text': 'True'})
-            choice_id += 1
-            
-            # Insert "False" choice
-            db.cursor.execute(
-                """INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content) 
-                   VALUES (?, ?, ?, ?)""",
-                (choice_id, question['Q_Id'], 1 if correct_answer == False else 0, 'False')
-            )
-            choices.append({'Choice_Id': choice_id, 'Q_Id': question['Q_Id'], 'text': 'False'})
-            choice_id += 1
-    
-    db.commit()
-    print(f"   ✅ Inserted {len(choices)} choices (MCQ + TF)")
-    return choices
-
-def insert_exam_questions(db: DatabaseConnection, exams, questions):
+def insert_exam_questions(db: DatabaseConnection, exams, questions, rng=random):
     """Insert Exam_Questions data - course-aligned"""
     print("\n🔗 Inserting Course-Aligned Exam-Question mappings...")
-    count = 0
+    exam_questions = []
+    question_ids_by_course = defaultdict(list)
+    for q_id, c_id in zip(questions.column('Q_Id'), questions.column('C_Id')):
+        question_ids_by_course[c_id].append(q_id)
     
     for exam in exams:
-        # Query questions for this specific course from the database
-        db.cursor.execute(
-            "SELECT Q_Id FROM Question WHERE C_ID = ?",
-            (exam['C_Id'],)
-        )
-        course_question_ids = [row[0] for row in db.cursor.fetchall()]
+        course_question_ids = question_ids_by_course.get(exam['C_Id'], [])
         
         if not course_question_ids:
             print(f"   ⚠️  Warning: No questions found for exam {exam['E_Id']} (Course {exam['C_Id']})")
             continue
         
         # Select 5-10 questions from this course only
-        num_questions = min(random.randint(5, 10), len(course_question_ids))
-        selected_question_ids = random.sample(course_question_ids, num_questions)
+        num_questions = min(rng.randint(5, 10), len(course_question_ids))
+        selected_question_ids = rng.sample(course_question_ids, num_questions)
         
         for question_id in selected_question_ids:
-            db.cursor.execute(
-                "INSERT INTO Exam_Questions (E_Id, Q_Id) VALUES (?, ?)",
-                (exam['E_Id'], question_id)
-            )
-            count += 1
+            db.insert("Exam_Questions", ("E_Id", "Q_Id"), (exam['E_Id'], question_id))
+            exam_questions.append({'E_Id': exam['E_Id'], 'Q_Id': question_id})
     
     db.commit()
-    print(f"   ✅ Inserted {count} course-aligned exam-question mappings")
+    print(f"   ✅ Inserted {len(exam_questions)} course-aligned exam-question mappings")
+    return exam_questions
 
 
-def insert_student_exams(db: DatabaseConnection, students, exams, enrollments):
-    """Insert Student_Exam data"""
+def insert_student_exams(db: DatabaseConnection, students, exams, enrollments, exam_takers=50, rng=random,
+                         columns=None):
+    """Insert Student_Exam data for the first `exam_takers` students"""
     print("\n📊 Inserting Student Exam Records...")
-    student_exams = []
+    student_exams = IdColumns('S_Id', 'E_Id')
+    exams_by_course = group_by(exams, 'C_Id')
+    taker_ids = students[:exam_takers]
+    columns = columns or PythonColumns(rng)
+    pending = []  # (S_Id, exam) rows waiting for a column of grades
     
-    for student in students[:50]:  # First 50 students
-        student_courses = [e['Course_Id'] for e in enrollments if e['S_Id'] == student['S_Id']]
-        available_exams = [e for e in exams if e['C_Id'] in student_courses]
+    def write_pending():
+        grades = columns.integers(50, 100, len(pending))
+        for (s_id, exam), grade in zip(pending, grades):
+            db.insert(
+                "Student_Exam", ("S_Id", "E_Id", "Grade", "Date_Taken"),
+                (s_id, exam['E_Id'], grade, exam['E_Date'])
+            )
+            student_exams.append(s_id, exam['E_Id'])
+        pending.clear()
+    
+    # Enrollments are stored student by student, so each student's courses are one run
+    for s_id, rows in itertools.groupby(enrollments, key=itemgetter(0)):
+        if s_id not in taker_ids:
+            continue
+        available_exams = [exam for _, course_id in rows
+                           for exam in exams_by_course.get(course_id, [])]
         
-        num_exams = min(random.randint(2, 5), len(available_exams))
-        taken_exams = random.sample(available_exams, num_exams) if available_exams else []
+        num_exams = min(rng.randint(2, 5), len(available_exams))
+        taken_exams = rng.sample(available_exams, num_exams) if available_exams else []
         
-        for exam in taken_exams:
-            db.cursor.execute(
-                "INSERT INTO Student_Exam (S_Id, E_Id, Grade, Date_Taken) VALUES (?, ?, ?, ?)",
-                (student['S_Id'], exam['E_Id'], random.randint(50, 100), exam['E_Date'])
-            )
-            student_exams.append({'S_Id': student['S_Id'], 'E_Id': exam['E_Id']})
+        pending.extend((s_id, exam) for exam in taken_exams)
+        if len(pending) >= CHUNK_ROWS:
+            write_pending()
     
+    write_pending()
     db.commit()
     print(f"   ✅ Inserted {len(student_exams)} student exam records")
     return student_exams
 
-def insert_student_answers(db: DatabaseConnection, student_exams, questions, choices):
+def insert_student_answers(db: DatabaseConnection, student_exams, question_ids_by_exam,
+                           choices_by_question, rng=random, columns=None):
     """Insert Student_Answer data - handles both MCQ and TF questions"""
     print("\n✍️  Inserting Student Answers (MCQ + TF)...")
+    columns = columns or PythonColumns(rng)
+    pending = []  # (S_Id, E_Id, Q_Id, choice ids) waiting for a column of picks
+    id_ranges = []  # (first A_Id, count) reserved from the answer id sequence per chunk
     
-    # Get exam questions mapping
-    db.cursor.execute("SELECT E_Id, Q_Id FROM Exam_Questions")
-    exam_questions = [{'E_Id': row[0], 'Q_Id': row[1]} for row in db.cursor.fetchall()]
-    
-    answer_id = 1
-    count = 0
+    def write_pending():
+        if not pending:
+            return
+        answer_id = db.reserve_ids("Student_Answer", len(pending))
+        id_ranges.append((answer_id, len(pending)))
+        picks = columns.indexes([len(q_choices) for _, _, _, q_choices in pending])
+        for (s_id, e_id, q_id, q_choices), pick in zip(pending, picks):
+            db.insert(
+                "Student_Answer", ("A_Id", "Question_Id", "Exam_Id", "Choice_Id", "S_Id"),
+                (answer_id, q_id, e_id, q_choices[pick], s_id)
+            )
+            answer_id += 1
+        pending.clear()
     
-    for student_exam in student_exams:
-        exam_qs = [eq for eq in exam_questions if eq['E_Id'] == student_exam['E_Id']]
-        
-        for eq in exam_qs:
-            question = next((q for q in questions if q['Q_Id'] == eq['Q_Id']), None)
-            if not question:
-                continue
-            
-            choice_id_val = None
-            
-            # Get choices for this question (works for both MCQ and TF)
-            q_choices = [c for c in choices if c['Q_Id'] == question['Q_Id']]
+    for s_id, e_id in student_exams:
+        for q_id in question_ids_by_exam.get(e_id, []):
+            # Only answer questions that exist and have choices (works for both MCQ and TF)
+            q_choices = choices_by_question.get(q_id)
             if q_choices:
-                choice_id_val = random.choice(q_choices)['Choice_Id']
-            
-            # Only insert if we have a valid choice
-            if choice_id_val:
-                db.cursor.execute(
-                    """INSERT INTO Student_Answer (A_Id, Question_Id, Exam_Id, Choice_Id, S_Id) 
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (answer_id, question['Q_Id'], student_exam['E_Id'], choice_id_val, student_exam['S_Id'])
-                )
-                answer_id += 1
-                count += 1
+                pending.append((s_id, e_id, q_id, q_choices))
+        if len(pending) >= CHUNK_ROWS:
+            write_pending()
     
+    write_pending()
     db.commit()
+    count = sum(size for _, size in id_ranges)
     print(f"   ✅ Inserted {count} student answers (MCQ + TF)")
+    return id_ranges
+
+def verify_student_answers(db: DatabaseConnection, student_exams, question_ids_by_exam,
+                           choices_by_question, id_ranges):
+    """Check that the reserved A_Id ranges hold one answered row per (student exam, exam question)"""
+    print("\n🔎 Verifying Student Answers...")
+    expected = sum(1 for _, e_id in student_exams
+                   for q_id in question_ids_by_exam.get(e_id, [])
+                   if choices_by_question.get(q_id))
+    
+    if db.can_query:
+        total = answered = 0
+        for first, size in id_ranges:
+            db.cursor.execute(
+                "SELECT COUNT(*), COUNT(Choice_Id) FROM Student_Answer WHERE A_Id BETWEEN ? AND ?",
+                (first, first + size - 1)
+            )
+            rows, with_choice = db.cursor.fetchone()
+            total += rows
+            answered += with_choice
+    else:
+        # Offline export: every exported row was written with a Choice_Id
+        total = answered = db.checksums.row_counts.get("Student_Answer", 0)
+    
+    if total != expected or answered != expected:
+        raise RuntimeError(
+            f"Student_Answer mismatch: expected {expected} answered rows, "
+            f"found {total} rows ({answered} with Choice_Id)"
+        )
+    print(f"   ✅ {total} rows, all with a Choice_Id (one per exam question taken)")
+
+def seed_student_answers(db: DatabaseConnection, student_exams, exam_questions, questions, rng=random,
+                         columns=None):
+    """Build the answer-stage hash indexes once, then write and verify Student_Answer"""
+    question_ids_by_exam = group_by(exam_questions, 'E_Id', 'Q_Id')
+    # A question's choices are a run of Choice_Ids; a range indexes them without a list
+    choices_by_question = {q_id: range(first, first + count)
+                           for q_id, _, first, count, _ in questions if count}
+    
+    id_ranges = insert_student_answers(db, student_exams, question_ids_by_exam,
+                                       choices_by_question, rng, columns)
+    verify_student_answers(db, student_exams, question_ids_by_exam, choices_by_question, id_ranges)
+    return sum(size for _, size in id_ranges)
+
+# ============================================================================
+# APPEND MODE (top up an existing database)
+# ============================================================================
+
+# Single-column keys used to report what a database already holds
+ID_COLUMNS = {
+    "Department": "D_Id", "Track": "Track_Id", "Instructor": "Ins_Id", "Student": "S_Id",
+    "Course": "C_Id", "Topic": "Topic_Id", "Exam": "E_Id", "Question": "Q_Id",
+    "Choice": "Choice_Id", "Student_Answer": "A_Id",
+}
+
+# Stages whose rows --append reads back instead of generating: stage -> (query, result keys)
+REFERENCE_QUERIES = {
+    'departments': ("SELECT D_Id, D_Name FROM Department ORDER BY D_Id", ('D_Id', 'D_Name')),
+    'tracks': ("SELECT Track_Id, Track_Name, Dep_Id FROM Track ORDER BY Track_Id",
+               ('Track_Id', 'Track_Name', 'Dep_Id')),
+    'instructors': ("SELECT Ins_Id, Ins_FName, Ins_LName FROM Instructor ORDER BY Ins_Id",
+                    ('Ins_Id', 'Ins_FName', 'Ins_LName')),
+    'courses': ("SELECT C_Id, C_Name FROM Course ORDER BY C_Id", ('C_Id', 'C_Name')),
+    'exams': ("SELECT E_Id, C_Id, E_Date FROM Exam ORDER BY E_Id", ('E_Id', 'C_Id', 'E_Date')),
+    # Questions whose choices are not one run of Choice_Ids (added by hand) get no choices
+    'questions': ("""
+        SELECT q.Q_Id, q.C_Id, COALESCE(MIN(ch.Choice_Id), 0),
+               CASE WHEN MAX(ch.Choice_Id) - MIN(ch.Choice_Id) + 1 = COUNT(ch.Choice_Id)
+                    THEN COUNT(ch.Choice_Id) ELSE 0 END,
+               COALESCE(MAX(CASE WHEN ch.Is_Correct = 1 THEN ch.Choice_Id END), 0)
+        FROM Question q
+        LEFT JOIN Choice ch ON ch.Q_Id = q.Q_Id
+        GROUP BY q.Q_Id, q.C_Id
+        ORDER BY q.Q_Id
+    """, ('Q_Id', 'C_Id', 'First_Choice_Id', 'Choice_Count', 'Correct_Choice_Id')),
+    'exam_questions': ("SELECT E_Id, Q_Id FROM Exam_Questions ORDER BY E_Id, Q_Id", ('E_Id', 'Q_Id')),
+}
+
+# Reference stages whose result is IdColumns rather than a list of dicts
+ID_COLUMN_STAGES = {'questions'}
+
+# Reference-only stages nothing downstream needs, skipped by --append
+APPEND_SKIPPED_STAGES = {'track_job_profiles', 'instructor_phones', 'topics', 'course_topics'}
+
+def existing_table_state(db: DatabaseConnection):
+    """{table: (row count, max id or None)} for every seeded table"""
+    state = {}
+    for table in LOAD_ORDER:
+        id_column = ID_COLUMNS.get(table)
+        max_sql = f"MAX({id_column})" if id_column else "NULL"
+        db.cursor.execute(f"SELECT COUNT(*), {max_sql} FROM {table}")
+        count, max_id = db.cursor.fetchone()
+        state[table] = (count, max_id)
+    return state
+
+def load_reference_rows(db: DatabaseConnection, stage_name):
+    """Read back the rows of a reference stage in the shape its insert function returns"""
+    query, keys = REFERENCE_QUERIES[stage_name]
+    db.cursor.execute(query)
+    if stage_name in ID_COLUMN_STAGES:
+        rows = IdColumns(*keys)
+        for row in db.cursor:
+            rows.append(*row)
+        print(f"\n📥 Read {len(rows)} existing {stage_name.replace('_', ' ')}")
+        return rows
+    rows = [dict(zip(keys, row)) for row in db.cursor.fetchall()]
+    for row in rows:
+        if 'E_Date' in row and row['E_Date'] is not None:
+            # DATE columns come back as date objects from pyodbc and as text from SQLite
+            row['E_Date'] = str(row['E_Date'])[:10]
+    print(f"\n📥 Read {len(rows)} existing {stage_name.replace('_', ' ')}")
+    return rows
+
+# ============================================================================
+# PIPELINE SCHEDULER
+# ============================================================================
+
+class Stage:
+    """One step of the seeding pipeline and the stages whose results it needs"""
+    def __init__(self, name, depends_on, run):
+        self.name = name
+        self.depends_on = tuple(depends_on)
+        self.run = run  # run(db, results, rng) -> stage result
+    
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+def course_catalog(args):
+    """Course names to seed: the built-in COURSES, or every course of the question bank"""
+    if args.course_catalog == 'bank':
+        return QuestionBank(args.question_bank).courses()
+    return COURSES
+
+def build_pipeline(args, existing=None):
+    """Describe the seeding pipeline as a dependency graph of stages
+    
+    With `existing` (existing_table_state of the target, for --append) the reference
+    tables are read back instead of generated, and only new students - numbered after the
+    current MAX(S_Id) - are written together with their phones, enrollments, teaching,
+    exams and answers.
+    """
+    ref = args.reference_date
+    first_student = 1
+    if existing is not None:
+        first_student = (existing["Student"][1] or 0) + 1
+    
+    def columns(rng):
+        return make_columns(args.engine, rng)
+    
+    stages = [
+        Stage('departments', [], lambda db, r, rng: insert_departments(db, rng)),
+        Stage('tracks', ['departments'],
+              lambda db, r, rng: insert_tracks(db, r['departments'], rng)),
+        Stage('track_job_profiles', ['tracks'],
+              lambda db, r, rng: insert_track_job_profiles(db, r['tracks'], rng)),
+        Stage('instructors', ['departments'],
+              lambda db, r, rng: insert_instructors(db, r['departments'], args.instructors, rng)),
+        Stage('instructor_phones', ['instructors'],
+              lambda db, r, rng: insert_instructor_phones(db, r['instructors'], rng)),
+        Stage('students', ['departments', 'tracks'],
+              lambda db, r, rng: insert_students(db, r['departments'], r['tracks'], args.students, rng,
+                                                 columns(rng), first_student)),
+        Stage('student_phones', ['students'],
+              lambda db, r, rng: insert_student_phones(db, r['students'], rng, columns(rng))),
+        Stage('courses', ['tracks'],
+              lambda db, r, rng: insert_courses(db, r['tracks'], rng, course_catalog(args))),
+        Stage('topics', [], lambda db, r, rng: insert_topics(db, rng)),
+        Stage('course_topics', ['courses', 'topics'],
+              lambda db, r, rng: insert_course_topics(db, r['courses'], r['topics'], rng)),
+        Stage('enrollments', ['students', 'courses'],
+              lambda db, r, rng: insert_student_courses(db, r['students'], r['courses'], rng, ref,
+                                                        columns(rng))),
+        Stage('teaching', ['enrollments', 'instructors'],
+              lambda db, r, rng: insert_teaching(db, r['enrollments'], r['instructors'], rng)),
+        Stage('exams', ['courses'], lambda db, r, rng: insert_exams(db, r['courses'], rng, ref)),
+        Stage('questions', ['courses'],
+              lambda db, r, rng: insert_questions(db, r['courses'], rng, QuestionBank(args.question_bank))),
+        Stage('exam_questions', ['exams', 'questions'],
+              lambda db, r, rng: insert_exam_questions(db, r['exams'], r['questions'], rng)),
+        Stage('student_exams', ['students', 'exams', 'enrollments'],
+              lambda db, r, rng: insert_student_exams(db, r['students'], r['exams'], r['enrollments'],
+                                                      args.exam_takers, rng, columns(rng))),
+        # Choice rows are written by the questions stage with their final Choice_Ids, so every
+        # Student_Answer row is written once - constraints are off while the pipeline runs
+        Stage('student_answers', ['student_exams', 'exam_questions', 'questions'],
+              lambda db, r, rng: seed_student_answers(db, r['student_exams'], r['exam_questions'],
+                                                      r['questions'], rng, columns(rng))),
+    ]
+    if existing is None:
+        return stages
+    
+    def reference_stage(name):
+        return Stage(name, [], lambda db, r, rng: load_reference_rows(db, name))
+    
+    return [reference_stage(stage.name) if stage.name in REFERENCE_QUERIES else stage
+            for stage in stages if stage.name not in APPEND_SKIPPED_STAGES]
+
+def merge_checksums(connections):
+    """Combine per-connection table checksums (each table is written by one stage)"""
+    row_counts, digests = {}, {}
+    for conn in connections:
+        row_counts.update(conn.checksums.row_counts)
+        digests.update(conn.checksums.digests())
+    return row_counts, digests
+
+def dataset_checksum(digests):
+    """Single fingerprint over every table checksum"""
+    combined = hashlib.sha256()
+    for table in sorted(digests):
+        combined.update(f"{table}={digests[table]};".encode("utf-8"))
+    return combined.hexdigest()[:16]
+
+def stage_rng(seed, stage_name):
+    """Independent Random per stage, so seeded output does not depend on scheduling"""
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}:{stage_name}")
+
+def run_pipeline(stages, connections, seed=None, query_stats=None):
+    """Run each stage on a pooled connection as soon as all of its dependencies finished
+    
+    Returns the stage results and, per stage, its wall time, rows written and round trips
+    (rows/round trips are deltas on the stage's connection, exact unless a shared
+    BulkFileWriter runs stages concurrently). With a QueryStats, each stage's statements
+    are attributed to it (and profiled, if enabled).
+    """
+    results, stats = {}, {}
+    idle = queue.Queue()
+    for db in connections:
+        idle.put(db)
+    
+    def run_stage(stage):
+        db = idle.get()
+        try:
+            started = time.perf_counter()
+            rows, round_trips = db.checksums.total_rows, db.round_trips
+            with query_stats.stage(stage.name) if query_stats is not None else nullcontext():
+                result = stage.run(db, results, stage_rng(seed, stage.name))
+                db.commit()
+            return result, {
+                'seconds': time.perf_counter() - started,
+                'rows': db.checksums.total_rows - rows,
+                'round_trips': db.round_trips - round_trips,
+            }
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            idle.put(db)
+    
+    pending = list(stages)
+    running = {}
+    with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+        while pending or running:
+            ready = [stage for stage in pending if all(dep in results for dep in stage.depends_on)]
+            for stage in ready:
+                pending.remove(stage)
+                running[executor.submit(run_stage, stage)] = stage
+            if not running:
+                raise RuntimeError(f"Unresolvable stage dependencies: {pending}")
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                results[stage.name], stats[stage.name] = future.result()
+    
+    return results, stats
 
 # ============================================================================
 # MAIN FUNCTION
 # ============================================================================
 
-def main():
-    parser = argparse.ArgumentParser(description='Insert Egyptian mock data into ITI database')
+def add_connection_arguments(parser):
+    """Options selecting the database backend, shared by the ITI command line tools"""
+    parser.add_argument('--backend', choices=list(BACKENDS), default='sqlserver',
+                        help='Target database (sqlite creates the ITI schema in a local file)')
+    parser.add_argument('--sqlite-path', default='iti_mock.db', help='Database file for --backend sqlite')
     parser.add_argument('--server', default='localhost', help='SQL Server instance name')
     parser.add_argument('--database', default='ITI_E', help='Database name')
     parser.add_argument('--username', default='', help='Username (leave empty for Windows Auth)')
     parser.add_argument('--password', default='', help='Password')
-    parser.add_argument('--students', type=int, default=100, help='Number of students to generate')
-    parser.add_argument('--instructors', type=int, default=20, help='Number of instructors to generate')
+
+def add_latency_arguments(parser):
+    """--simulated-latency-ms, shared by the ITI tools that compare round trips"""
+    parser.add_argument('--simulated-latency-ms', type=float, default=0.0,
+                        help='Network round trip added to every statement and procedure call (for local backends)')
+
+def parse_id_range(text):
+    """'1-12' -> range(1, 13)"""
+    first, _, last = text.partition('-')
+    return range(int(first), int(last or first) + 1)
+
+def parse_args(argv=None):
+    """Parse the command line, filling unset volumes from the --scale preset"""
+    parser = argparse.ArgumentParser(description='Insert Egyptian mock data into ITI database')
+    add_connection_arguments(parser)
+    parser.add_argument('--scale', choices=list(SCALE_PRESETS), default='small',
+                        help='Data volume preset (small=100 students ... xl=1M students)')
+    parser.add_argument('--students', type=int, help='Number of students to generate')
+    parser.add_argument('--instructors', type=int, help='Number of instructors to generate')
+    parser.add_argument('--exam-takers', type=int, help='Number of students that sit exams')
     parser.add_argument('--clear', action='store_true', help='Clear existing data before insertion')
+    parser.add_argument('--append', action='store_true',
+                        help='Top up an existing database: keep its reference data and add --students '
+                             'new students (ids after the current maximum) with their activity')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Rows buffered per table before each executemany() flush')
+    parser.add_argument('--row-by-row', action='store_true',
+                        help='Disable batching and issue one INSERT round trip per row')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of connections used to run independent stages concurrently')
+    parser.add_argument('--engine', choices=list(COLUMN_ENGINES), default='python',
+                        help='Generator for bulk numeric columns (numpy draws whole arrays per chunk)')
+    parser.add_argument('--seed', help='Seed for reproducible data (same seed => identical tables)')
+    parser.add_argument('--question-bank', default=DEFAULT_BANK_PATH,
+                        help='JSON Lines question bank (indexed per course on first use)')
+    parser.add_argument('--course-catalog', choices=['builtin', 'bank'], default='builtin',
+                        help='Seed the built-in course list, or one course per question bank course')
+    parser.add_argument('--reference-date', type=lambda d: datetime.strptime(d, '%Y-%m-%d'),
+                        help='Date (YYYY-MM-DD) that enrollment and exam dates count back from')
+    parser.add_argument('--output-dir',
+                        help='Write bcp files, format files and load.sql here instead of connecting')
     parser.add_argument('--test-connection', action='store_true', help='Test connection only')
+    add_instrumentation_arguments(parser)
     
-    args = parser.parse_args()
-    
-    # Build connection string
-    if args.username:
-        connection_string = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={args.server};"
-            f"DATABASE={args.database};"
-            f"UID={args.username};"
-            f"PWD={args.password}"
-        )
-    else:
-        connection_string = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={args.server};"
-            f"DATABASE={args.database};"
-            f"Trusted_Connection=yes;"
-        )
+    args = parser.parse_args(argv)
+    for option, value in SCALE_PRESETS[args.scale].items():
+        if getattr(args, option) is None:
+            setattr(args, option, value)
+    if args.append and (args.clear or args.output_dir):
+        parser.error("--append adds to a live database; it cannot be combined with --clear or --output-dir")
+    if args.engine == 'numpy' and numpy is None:
+        parser.error("--engine numpy requires NumPy (pip install numpy)")
+    if args.reference_date is None:
+        args.reference_date = datetime.combine(date.today(), datetime.min.time())
+    return args
+
+# (label, stage[, IdColumns column whose sum is the count])
+SUMMARY_STAGES = [
+    ("Departments", 'departments'), ("Tracks", 'tracks'), ("Instructors", 'instructors'),
+    ("Students", 'students'), ("Courses", 'courses'), ("Topics", 'topics'), ("Exams", 'exams'),
+    ("Questions", 'questions'), ("Choices", 'questions', 'Choice_Count'), ("Student Exams", 'student_exams'),
+    ("Student Answers", 'student_answers'),
+]
+
+def make_backend(args):
+    """Backend selected by --backend"""
+    if args.backend == 'sqlite':
+        return SqliteBackend(args.sqlite_path)
+    return SqlServerBackend(args.server, args.database, args.username, args.password)
+
+def main():
+    args = parse_args()
+    backend = make_backend(args)
+    stats = make_query_stats(args)
     
     print("=" * 80)
     print("🇪🇬 ITI Egyptian Mock Data Insertion Script")
     print("=" * 80)
-    print(f"\nServer: {args.server}")
-    print(f"Database: {args.database}")
-    print(f"Authentication: {'SQL Server' if args.username else 'Windows'}")
+    if args.output_dir:
+        print(f"\nOutput directory: {args.output_dir} (offline bulk-load export)")
+    else:
+        print(f"\n{backend.describe()}")
+    print(f"Write mode: {'row-by-row' if args.row_by_row else f'batched ({args.batch_size} rows)'}")
+    print(f"Scale: {args.scale} ({args.students} students, {args.exam_takers} exam takers)")
+    print(f"Column engine: {args.engine}")
+    print(f"Seed: {args.seed if args.seed is not None else 'random'}, "
+          f"reference date: {args.reference_date:%Y-%m-%d}")
     
-    # Create database connection
-    db = DatabaseConnection(connection_string)
+    # Create one database connection per worker (file export shares one writer)
+    if args.output_dir:
+        connections = [BulkFileWriter(args.output_dir)] * max(1, args.workers)
+    else:
+        connections = [
+            DatabaseConnection(backend, batch_size=args.batch_size,
+                               use_batching=not args.row_by_row, stats=stats)
+            for _ in range(max(1, args.workers))
+        ]
+    db = connections[0]
+    unique_connections = list(dict.fromkeys(connections))
     
-    if not db.connect():
+    if not all(conn.connect() for conn in unique_connections):
         return
     
     if args.test_connection:
         print("\n✅ Connection test successful!")
-        db.close()
+        for conn in unique_connections:
+            conn.close()
         return
     
+    start_time = time.perf_counter()
     try:
-        # Disable foreign key constraints temporarily
-        print("\n🔓 Temporarily disabling foreign key constraints...")
-        db.cursor.execute("EXEC sp_MSforeachtable 'ALTER TABLE ? NOCHECK CONSTRAINT ALL'")
-        db.commit()
+        existing = None
+        seed = args.seed
+        if args.append:
+            existing = existing_table_state(db)
+            print("\n📦 Existing data (rows, max id):")
+            for table, (count, max_id) in existing.items():
+                print(f"   • {table:<18} {count:>10}  {max_id if max_id is not None else '-'}")
+            missing = [table for table in ("Department", "Track", "Course", "Exam", "Question")
+                       if not existing[table][0]]
+            if missing:
+                print(f"\n❌ Nothing to append to: {', '.join(missing)} empty - seed the database first")
+                return
+            if seed is not None:
+                # Same seed on a bigger database must not regenerate the first batch's students
+                seed = f"{seed}@{existing['Student'][1] or 0}"
         
-        # Clear existing data if requested
-        if args.clear:
-            clear_tables(db)
-        
-        # Insert data in proper foreign key order
-        departments = insert_departments(db)
-        tracks = insert_tracks(db, departments)
-        insert_track_job_profiles(db, tracks)
-        instructors = insert_instructors(db, departments, args.instructors)
-        insert_instructor_phones(db, instructors)
-        students = insert_students(db, departments, tracks, args.students)
-        insert_student_phones(db, students)
-        courses = insert_courses(db, tracks)
-        topics = insert_topics(db)
-        insert_course_topics(db, courses, topics)
-        enrollments = insert_student_courses(db, students, courses)
-        insert_teaching(db, enrollments, instructors)
-        exams = insert_exams(db, courses)
-        questions = insert_questions(db, courses)
-        insert_exam_questions(db, exams, questions)
-        student_exams = insert_student_exams(db, students, exams, enrollments)
-        
-        # Insert Student_Answer BEFORE Choice (due to FK_Choice_Student_Answer constraint)
-        insert_student_answers(db, student_exams, questions, [])  # Pass empty choices list
-        
-        # Now insert Choice with actual data
-        choices = insert_choices(db, questions)
+        if db.can_query:
+            # Disable foreign key constraints temporarily
+            print("\n🔓 Temporarily disabling foreign key constraints...")
+            db.disable_constraints()
+            
+            # Clear existing data if requested
+            if args.clear:
+                clear_tables(db)
         
-        # Update Student_Answer with actual choice IDs
-        print("\n🔄 Updating Student Answers with Choice IDs...")
-        db.cursor.execute("SELECT E_Id, Q_Id FROM Exam_Questions")
-        exam_questions = [{'E_Id': row[0], 'Q_Id': row[1]} for row in db.cursor.fetchall()]
-        
-        for student_exam in student_exams:
-            exam_qs = [eq for eq in exam_questions if eq['E_Id'] == student_exam['E_Id']]
-            for eq in exam_qs:
-                question = next((q for q in questions if q['Q_Id'] == eq['Q_Id']), None)
-                if question and question['Q_Type'] == 'MCQ':
-                    q_choices = [c for c in choices if c['Q_Id'] == question['Q_Id']]
-                    if q_choices:
-                        choice_id_val = random.choice(q_choices)['Choice_Id']
-                        db.cursor.execute(
-                            "UPDATE Student_Answer SET Choice_Id = ? WHERE Question_Id = ? AND Exam_Id = ? AND S_Id = ?",
-                            (choice_id_val, question['Q_Id'], student_exam['E_Id'], student_exam['S_Id'])
-                        )
-        db.commit()
-        print("   ✅ Updated student answers with choice IDs")
+        # Insert data in dependency order; independent stages share the worker pool
+        stages = build_pipeline(args, existing)
+        results, stage_stats = run_pipeline(stages, connections, seed, stats)
         
         # Re-enable foreign key constraints (may fail if there are orphaned references)
-        print("\n🔒 Re-enabling foreign key constraints...")
-        try:
-            db.cursor.execute("EXEC sp_MSforeachtable 'ALTER TABLE ? WITH CHECK CHECK CONSTRAINT ALL'")
-            db.commit()
-            print("   ✅ Constraints re-enabled")
-        except Exception as e:
-            print(f"   ⚠️  Warning: Some constraints could not be re-enabled: {e}")
-            print("   Note: This is usually fine - data was inserted successfully.")
+        if db.can_query:
+            print("\n🔒 Re-enabling foreign key constraints...")
+            try:
+                db.enable_constraints()
+                print("   ✅ Constraints re-enabled")
+            except Exception as e:
+                print(f"   ⚠️  Warning: Some constraints could not be re-enabled: {e}")
+                print("   Note: This is usually fine - data was inserted successfully.")
         
         
         print("\n" + "=" * 80)
         print("✅ ALL DATA INSERTED SUCCESSFULLY!")
         print("=" * 80)
-        print("\n📊 Summary:")
-        print(f"   • Departments: {len(departments)}")
-        print(f"   • Tracks: {len(tracks)}")
-        print(f"   • Instructors: {len(instructors)}")
-        print(f"   • Students: {len(students)}")
-        print(f"   • Courses: {len(courses)}")
-        print(f"   • Topics: {len(topics)}")
-        print(f"   • Exams: {len(exams)}")
-        print(f"   • Questions: {len(questions)}")
-        print(f"   • Choices: {len(choices)}")
-        print(f"   • Student Exams: {len(student_exams)}")
+        print(f"\n📊 Summary{' (existing reference data + appended rows)' if args.append else ''}:")
+        for label, stage, *column in SUMMARY_STAGES:
+            if stage in results:
+                result = results[stage]
+                if column:
+                    result = sum(result.column(column[0]))
+                print(f"   • {label}: {result if isinstance(result, int) else len(result)}")
+        print(f"\n⏱️  Stage timings ({args.workers} worker{'s' if args.workers != 1 else ''}):")
+        for stage in stages:
+            stat = stage_stats[stage.name]
+            rate = stat['rows'] / stat['seconds'] if stat['seconds'] else 0
+            print(f"   • {stage.name:<20} {stat['seconds']:8.2f}s {stat['rows']:>10} rows "
+                  f"{rate:>12,.0f} rows/s {stat['round_trips']:>8} round trips")
+        print("\n🔐 Table checksums (rows, sha256 prefix):")
+        row_counts, digests = merge_checksums(unique_connections)
+        for table in LOAD_ORDER:
+            if table in digests:
+                print(f"   • {table:<18} {row_counts[table]:>10}  {digests[table]}")
+        print(f"   • {'dataset':<18} {sum(row_counts.values()):>10}  {dataset_checksum(digests)}")
+        print(f"\n⏱️  Elapsed: {time.perf_counter() - start_time:.2f}s")
+        rss = peak_rss_mb()
+        if rss is not None:
+            print(f"🧠 Peak RSS: {rss:.1f} MB")
+        if stats is not None and stats.statements:
+            print("\n📈 Hottest statements (total ms, calls):")
+            for entry in stats.to_dict()['statements'][:5]:
+                print(f"   • {entry['total_ms']:>10,.1f} {entry['calls']:>8}  {entry['shape'][:90]}")
+            print(f"   {stats.slow_count} statements at or above {args.slow_ms:g} ms")
         
     except Exception as e:
         print(f"\n❌ Error occurred: {e}")
         print("🔄 Rolling back transaction...")
-        db.rollback()
+        for conn in unique_connections:
+            conn.rollback()
         raise
     finally:
-        db.close()
+        for conn in unique_connections:
+            conn.close()
 
 if __name__ == "__main__":
     main()
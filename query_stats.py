@@ -0,0 +1,313 @@
+"""
+ITI Database - Query Instrumentation
+Opt-in statistics for DatabaseConnection: round trips, latency histograms and rows per
+statement shape, a slow statement log, and per pipeline stage timings with optional
+cProfile and tracemalloc samples. Everything is written to one JSON report.
+"""
+
+import atexit
+import cProfile
+import io
+import json
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+SLOW_LOG_SIZE = 500  # most recent slow statements kept
+SHAPE_LENGTH = 300
+PROFILE_TOP = 15  # functions / allocation sites kept per stage
+
+STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w@#.])-?\d+(?:\.\d+)?\b")
+PARAMETER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+ROW_LIST = re.compile(r"\((\?(?:, \.\.\.)?)\)(?:\s*,\s*\(\1\))+")
+WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(sql):
+    """SQL with literals replaced by ? and parameter/row lists collapsed, so a statement's
+    executions group together whatever values or batch size they ran with"""
+    shape = STRING_LITERAL.sub("?", sql)
+    shape = NUMBER_LITERAL.sub("?", shape)
+    shape = WHITESPACE.sub(" ", shape).strip()
+    shape = PARAMETER_LIST.sub("?, ...", shape)
+    shape = ROW_LIST.sub(r"(\1), ...", shape)
+    return shape if len(shape) <= SHAPE_LENGTH else shape[:SHAPE_LENGTH] + "..."
+
+class LatencyStats:
+    """Calls, errors, rows and a latency histogram of one statement shape or procedure"""
+    def __init__(self):
+        self.calls = self.errors = 0
+        self.rows_affected = self.rows_fetched = self.rows_sent = 0
+        self.total_ms = self.max_ms = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, elapsed_ms, rows_affected=0, rows_sent=0, error=False):
+        self.calls += 1
+        self.errors += error
+        self.rows_affected += max(rows_affected, 0)
+        self.rows_sent += rows_sent
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= bound),
+                      len(LATENCY_BUCKETS_MS))
+        self.histogram[bucket] += 1
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'calls': self.calls, 'errors': self.errors,
+            'rows_affected': self.rows_affected, 'rows_fetched': self.rows_fetched,
+            'rows_sent': self.rows_sent,
+            'total_ms': round(self.total_ms, 3), 'mean_ms': round(self.total_ms / self.calls, 3) if self.calls else None,
+            'max_ms': round(self.max_ms, 3),
+            'histogram': {label: count for label, count in zip(labels, self.histogram) if count},
+        }
+
+class QueryStats:
+    """Statistics shared by any number of instrumented connections (thread-safe)
+
+    slow_ms: statements at or above this many milliseconds go to the slow log (None: off)
+    profile: run cProfile around each pipeline stage
+    trace_memory: sample tracemalloc around each pipeline stage that runs alone (tracemalloc
+        is process-wide, so a stage overlapping another would be charged for both)
+    """
+    def __init__(self, slow_ms=None, profile=False, trace_memory=False):
+        self.slow_ms = slow_ms
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.started_at = datetime.now()
+        self.statements = {}  # shape -> LatencyStats
+        self.procedures = {}  # procedure name -> LatencyStats
+        self.stages = {}  # stage name -> report
+        self.slow_log = deque(maxlen=SLOW_LOG_SIZE)
+        self.slow_count = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()  # current stage of each thread
+        self._profiling = threading.Lock()  # one cProfile profiler may run at a time
+        self._running = 0  # stages in progress, on any thread
+        self._memory_stage = None  # name of the stage being memory-sampled
+        self._memory_overlapped = False  # another stage started while it ran
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def current_stage(self):
+        return getattr(self._local, 'stage', None)
+
+    def record_statement(self, sql, elapsed, rows_affected=0, rows_sent=0, params=None, error=False):
+        """Add one execute/executemany; returns the LatencyStats it was counted in"""
+        shape = statement_shape(sql)
+        elapsed_ms = elapsed * 1000
+        stage = self.current_stage
+        with self._lock:
+            stats = self.statements.get(shape)
+            if stats is None:
+                stats = self.statements[shape] = LatencyStats()
+            stats.add(elapsed_ms, rows_affected, rows_sent, error)
+            if stage is not None:
+                stage_report = self.stages.setdefault(stage, {})
+                stage_report['statements'] = stage_report.get('statements', 0) + 1
+                stage_report['statement_ms'] = stage_report.get('statement_ms', 0.0) + elapsed_ms
+            if self.slow_ms is not None and elapsed_ms >= self.slow_ms:
+                self.slow_count += 1
+                self.slow_log.append({
+                    'at': datetime.now().isoformat(timespec='milliseconds'),
+                    'ms': round(elapsed_ms, 3), 'stage': stage, 'shape': shape,
+                    'sql': sql if len(sql) <= 2000 else sql[:2000] + "...",
+                    'params': f"{rows_sent} rows" if rows_sent else preview(params),
+                    'error': error,
+                })
+        return stats
+
+    def record_fetch(self, stats, rows):
+        if stats is not None:
+            with self._lock:
+                stats.rows_fetched += rows
+
+    def record_procedure(self, name, elapsed, error=False):
+        with self._lock:
+            stats = self.procedures.get(name)
+            if stats is None:
+                stats = self.procedures[name] = LatencyStats()
+            stats.add(elapsed * 1000, error=error)
+
+    @contextmanager
+    def stage(self, name):
+        """Attribute statements run by this thread to stage `name`, profiling it if enabled"""
+        previous = self.current_stage
+        self._local.stage = name
+        profiler = None
+        # cProfile can only run one profiler at a time; concurrent stages go unprofiled
+        if self.profile and self._profiling.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        sample_memory = False
+        with self._lock:
+            self._running += 1
+            if self.trace_memory and self._running == 1:
+                sample_memory = True
+                self._memory_stage, self._memory_overlapped = name, False
+            elif self._memory_stage is not None:
+                self._memory_overlapped = True
+        before = tracemalloc.take_snapshot() if sample_memory else None
+        if before is not None:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                self._profiling.release()
+            report = {'seconds': round(seconds, 3)}
+            if profiler is not None:
+                report['profile'] = top_functions(profiler)
+            elif self.profile:
+                report['profile'] = "skipped: another stage was being profiled"
+            if before is not None and not self._memory_overlapped:
+                report['memory'] = memory_report(before)
+            elif self.trace_memory:
+                report['memory'] = "skipped: another stage ran at the same time"
+            with self._lock:
+                self._running -= 1
+                if sample_memory:
+                    self._memory_stage = None
+                stage_report = self.stages.setdefault(name, {})
+                stage_report.update(report)
+                stage_report.setdefault('statements', 0)
+                stage_report['statement_ms'] = round(stage_report.get('statement_ms', 0.0), 3)
+            self._local.stage = previous
+
+    def to_dict(self):
+        with self._lock:
+            by_time = sorted(self.statements.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+                'slow_ms': self.slow_ms,
+                'round_trips': sum(stats.calls for stats in self.statements.values()),
+                'statements': [{'shape': shape, **stats.to_dict()} for shape, stats in by_time],
+                'procedures': {name: stats.to_dict() for name, stats in sorted(self.procedures.items())},
+                'stages': dict(self.stages),
+                'slow_statements': {'count': self.slow_count, 'kept': list(self.slow_log)},
+            }
+
+    def dump(self, path):
+        """Write the report as JSON to path"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    def dump_at_exit(self, path):
+        """Write the report when the process exits, also after an error"""
+        def dump():
+            self.dump(path)
+            print(f"📄 Query statistics written to {path}")
+        atexit.register(dump)
+
+def preview(params, limit=200):
+    """Short repr of statement parameters for the slow log"""
+    if params is None:
+        return None
+    text = repr(params)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+def top_functions(profiler, limit=PROFILE_TOP):
+    """The stage's most expensive functions by cumulative time"""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({'function': f"{filename}:{line}({function})", 'calls': calls,
+                     'total_s': round(total, 4), 'cumulative_s': round(cumulative, 4)})
+    rows.sort(key=lambda row: row['cumulative_s'], reverse=True)
+    return rows[:limit]
+
+def memory_report(before, limit=PROFILE_TOP):
+    """Peak traced memory since the stage started and its largest allocation sites still alive"""
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    diffs = after.compare_to(before, 'lineno')
+    growth = [
+        {'site': str(diff.traceback), 'size_kb': round(diff.size_diff / 1024, 1), 'count': diff.count_diff}
+        for diff in diffs[:limit] if diff.size_diff
+    ]
+    return {'peak_mb': round(peak / (1024 * 1024), 2),
+            'retained_kb': round(sum(diff.size_diff for diff in diffs) / 1024, 1),
+            'top_growth': growth}
+
+class InstrumentedCursor:
+    """DB-API cursor proxy recording every execute/executemany (and rows fetched) in a QueryStats"""
+    def __init__(self, cursor, stats: QueryStats):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_stats', stats)
+        object.__setattr__(self, '_last', None)  # LatencyStats of the statement being fetched
+
+    def execute(self, sql, *args):
+        return self._run(self._cursor.execute, sql, args, 0)
+
+    def executemany(self, sql, rows):
+        rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+        return self._run(self._cursor.executemany, sql, (rows,), len(rows))
+
+    def _run(self, method, sql, args, rows_sent):
+        started = time.perf_counter()
+        try:
+            result = method(sql, *args)
+        except Exception:
+            self._stats.record_statement(sql, time.perf_counter() - started, rows_sent=rows_sent,
+                                         params=args[0] if args and not rows_sent else None, error=True)
+            raise
+        last = self._stats.record_statement(sql, time.perf_counter() - started, self._cursor.rowcount,
+                                            rows_sent, args[0] if args and not rows_sent else None)
+        object.__setattr__(self, '_last', last)
+        return self if result is self._cursor else result
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._stats.record_fetch(self._last, row is not None)
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._stats.record_fetch(self._last, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.record_fetch(self._last, len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+def add_instrumentation_arguments(parser):
+    """--query-stats and friends, shared by the ITI command line tools"""
+    parser.add_argument('--query-stats', metavar='PATH',
+                        help='Record per-statement statistics and write them to this JSON file at exit')
+    parser.add_argument('--slow-ms', type=float, default=100.0,
+                        help='Log statements taking at least this many ms (with --query-stats)')
+    parser.add_argument('--profile-stages', action='store_true',
+                        help='cProfile each pipeline stage (with --query-stats)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='tracemalloc each pipeline stage that runs alone (with --query-stats)')
+
+def make_query_stats(args):
+    """QueryStats for --query-stats (dumped at exit), or None when instrumentation is off"""
+    if not args.query_stats:
+        return None
+    stats = QueryStats(args.slow_ms, args.profile_stages, args.trace_memory)
+    stats.dump_at_exit(args.query_stats)
+    return stats
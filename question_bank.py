@@ -0,0 +1,122 @@
+"""
+ITI Database - Question Bank
+Questions live in a JSON Lines file, one question per line:
+    {"course": ..., "type": "MCQ", "q": ..., "choices": [...], "correct": 0, "difficulty": ..., "points": ...}
+    {"course": ..., "type": "TF", "q": ..., "answer": true, "difficulty": ..., "points": ...}
+A sidecar index (<bank>.idx) records the byte ranges of each course's lines, so opening a
+bank reads the index only and a course's questions are streamed from disk when asked for.
+The index is rebuilt automatically when the bank file changes.
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "question_bank.jsonl")
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+class QuestionBank:
+    """Read access to a JSON Lines question bank through its per-course offset index"""
+    def __init__(self, path=DEFAULT_BANK_PATH):
+        self.path = path
+        self.index = load_index(path)  # course -> [[start, end, count], ...] byte ranges
+
+    def __contains__(self, course):
+        return course in self.index
+
+    def courses(self):
+        return list(self.index)
+
+    def count(self, course):
+        return sum(count for _, _, count in self.index.get(course, ()))
+
+    def questions(self, course):
+        """Yield the questions of one course in file order, reading only that course's lines"""
+        ranges = self.index.get(course)
+        if not ranges:
+            return
+        with open(self.path, 'rb') as f:
+            for start, end, _ in ranges:
+                f.seek(start)
+                while f.tell() < end:
+                    line = f.readline()
+                    if line.strip():
+                        yield json.loads(line)
+
+    def as_dict(self):
+        """The whole bank as {course: {"MCQ": [...], "TF": [...]}} (loads every question)"""
+        bank = {}
+        for course in self.index:
+            for question in self.questions(course):
+                question = dict(question)
+                q_type = question.pop('type')
+                del question['course']
+                bank.setdefault(course, {}).setdefault(q_type, []).append(question)
+        return bank
+
+def index_path(path):
+    return path + INDEX_SUFFIX
+
+def bank_signature(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def build_index(path):
+    """Scan the bank once: consecutive lines of a course become one [start, end, count] range"""
+    index = {}
+    with open(path, 'rb') as f:
+        offset = 0
+        for line_number, line in enumerate(f, 1):
+            start, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                course = json.loads(line)['course']
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"{path}:{line_number}: not a question line ({e})") from None
+            ranges = index.setdefault(course, [])
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = offset
+                ranges[-1][2] += 1
+            else:
+                ranges.append([start, offset, 1])
+    return index
+
+def load_index(path):
+    """The bank's index from its sidecar file, rebuilding (and saving) it if missing or stale"""
+    signature = bank_signature(path)
+    try:
+        with open(index_path(path), encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved.get('version') == INDEX_VERSION and saved.get('bank') == signature:
+            return saved['courses']
+    except (OSError, ValueError):
+        pass
+    index = build_index(path)
+    try:
+        with open(index_path(path), 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'bank': signature, 'courses': index}, f)
+    except OSError:
+        pass  # read-only location: keep the index in memory for this run
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description='Index and inspect a JSON Lines question bank')
+    parser.add_argument('bank', nargs='?', default=DEFAULT_BANK_PATH, help='Question bank file')
+    parser.add_argument('--reindex', action='store_true', help='Rebuild the index even if it is current')
+    args = parser.parse_args()
+
+    if args.reindex and os.path.exists(index_path(args.bank)):
+        os.remove(index_path(args.bank))
+    bank = QuestionBank(args.bank)
+    print(f"\n📚 {args.bank}: {len(bank.courses())} courses, "
+          f"{sum(bank.count(course) for course in bank.courses())} questions")
+    for course in bank.courses():
+        types = Counter(question['type'] for question in bank.questions(course))
+        print(f"   • {course:<32} {bank.count(course):>8}  "
+              f"({', '.join(f'{count} {q_type}' for q_type, count in sorted(types.items()))})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+ITI Database - Mock Data Pipeline Benchmark
+Runs the seeding pipeline at several scales against a local SQLite database and reports
+wall time, rows/sec, peak memory and round trips per stage as JSON (median of --repeat runs)
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from insert_egyptian_mock_data_v2 import (
+    SCALE_PRESETS, DatabaseConnection, build_pipeline, make_backend, parse_args, run_pipeline
+)
+from query_stats import QueryStats
+
+# Allowed slowdown per stage before --baseline reports a regression
+DEFAULT_TOLERANCE = 0.25
+# Stages faster than this in both reports are timer noise, not compared
+DEFAULT_MIN_STAGE_MS = 20.0
+DEFAULT_REPEAT = 3
+
+def git_revision():
+    """Short commit hash of the working tree (None outside a git checkout)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def benchmark_scale(scale, options, workdir):
+    """Seed a fresh SQLite database at one scale and collect per-stage measurements"""
+    path = os.path.join(workdir, f"bench_{scale}.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    args = parse_args([
+        "--backend", "sqlite", "--sqlite-path", path, "--scale", scale,
+        "--seed", str(options.seed), "--batch-size", str(options.batch_size),
+        "--engine", options.engine, "--reference-date", "2025-01-01",
+    ] + (["--row-by-row"] if options.row_by_row else []))
+
+    backend = make_backend(args)
+    db = DatabaseConnection(backend, batch_size=args.batch_size, use_batching=not args.row_by_row)
+    stages = build_pipeline(args)
+
+    # Stages print progress; keep the benchmark output to the report itself
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if not db.connect():
+            raise RuntimeError(f"Could not open {path}")
+        try:
+            db.disable_constraints()
+            # One connection, so stages run one at a time and every stage gets a memory sample
+            query_stats = QueryStats(trace_memory=True) if options.memory else None
+            started = time.perf_counter()
+            _, stage_stats = run_pipeline(stages, [db], args.seed, query_stats)
+            wall_time = time.perf_counter() - started
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            db.close()
+
+    memory = {}
+    if query_stats is not None:
+        memory = {name: stage['memory']['peak_mb'] for name, stage in query_stats.stages.items()
+                  if isinstance(stage.get('memory'), dict)}
+    stages_report = {}
+    for stage in stages:
+        stat = stage_stats[stage.name]
+        stages_report[stage.name] = {
+            "wall_time_s": round(stat["seconds"], 4),
+            "rows": stat["rows"],
+            "rows_per_sec": round(stat["rows"] / stat["seconds"], 1) if stat["seconds"] else None,
+            "round_trips": stat["round_trips"],
+            "peak_memory_mb": round(memory[stage.name], 2) if stage.name in memory else None,
+        }
+
+    total_rows = sum(stage["rows"] for stage in stages_report.values())
+    return {
+        "scale": scale,
+        "students": args.students,
+        "exam_takers": args.exam_takers,
+        "wall_time_s": round(wall_time, 4),
+        "rows": total_rows,
+        "rows_per_sec": round(total_rows / wall_time, 1) if wall_time else None,
+        "round_trips": sum(stage["round_trips"] for stage in stages_report.values()),
+        "peak_memory_mb": round(max(memory.values()), 2) if memory else None,
+        "stages": stages_report,
+    }
+
+def median_run(runs):
+    """Combine repeated runs of one scale: median wall times, the highest memory peaks
+
+    The seed is fixed, so every run writes the same rows and makes the same round trips.
+    """
+    stages = {}
+    for name, stage in runs[0]["stages"].items():
+        samples = [run["stages"][name]["wall_time_s"] for run in runs]
+        seconds = statistics.median(samples)
+        peaks = [run["stages"][name]["peak_memory_mb"] for run in runs
+                 if run["stages"][name]["peak_memory_mb"] is not None]
+        stages[name] = dict(stage, wall_time_s=round(seconds, 4),
+                            rows_per_sec=round(stage["rows"] / seconds, 1) if seconds else None,
+                            peak_memory_mb=max(peaks) if peaks else None, wall_time_samples_s=samples)
+    wall_time = statistics.median(run["wall_time_s"] for run in runs)
+    peaks = [run["peak_memory_mb"] for run in runs if run["peak_memory_mb"] is not None]
+    return dict(runs[0], wall_time_s=round(wall_time, 4), repeats=len(runs),
+                rows_per_sec=round(runs[0]["rows"] / wall_time, 1) if wall_time else None,
+                peak_memory_mb=max(peaks) if peaks else None, stages=stages)
+
+def compare_to_baseline(report, baseline, tolerance, min_stage_ms=DEFAULT_MIN_STAGE_MS):
+    """List stages whose rows/sec dropped by more than `tolerance` versus a previous report
+
+    Stages that took under min_stage_ms in both reports are skipped: at that length the
+    timer and scheduler noise is larger than any change worth reporting.
+    """
+    previous = {run["scale"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in report["runs"]:
+        old_run = previous.get(run["scale"])
+        if not old_run:
+            continue
+        for name, stage in run["stages"].items():
+            old_stage = old_run["stages"].get(name, {})
+            if max(old_stage.get("wall_time_s") or 0, stage["wall_time_s"]) * 1000 < min_stage_ms:
+                continue
+            old_rate = old_stage.get("rows_per_sec")
+            new_rate = stage["rows_per_sec"]
+            if old_rate and new_rate and new_rate < old_rate * (1 - tolerance):
+                regressions.append(
+                    f"{run['scale']}/{name}: {new_rate:,.0f} rows/s (was {old_rate:,.0f}, "
+                    f"{(1 - new_rate / old_rate) * 100:.0f}% slower)"
+                )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the mock data pipeline on SQLite')
+    parser.add_argument('--scales', default='small,medium',
+                        help=f"Comma-separated presets to run ({', '.join(SCALE_PRESETS)})")
+    parser.add_argument('--seed', type=int, default=42, help='Seed so every run generates the same data')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per executemany() flush')
+    parser.add_argument('--row-by-row', action='store_true', help='Benchmark unbatched inserts')
+    parser.add_argument('--engine', choices=['python', 'numpy'], default='python',
+                        help='Column generation engine')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='Skip tracemalloc (it slows generation down noticeably)')
+    parser.add_argument('--workdir', help='Directory for the benchmark databases (default: temp dir)')
+    parser.add_argument('--output', help='Write the JSON report here (default: stdout)')
+    parser.add_argument('--baseline', help='Previous JSON report to check for per-stage regressions')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed rows/sec drop versus --baseline (0.25 = 25%%)')
+    parser.add_argument('--min-stage-ms', type=float, default=DEFAULT_MIN_STAGE_MS,
+                        help='Only compare stages taking at least this long in either report')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='Runs per scale; stage times are the median')
+    options = parser.parse_args()
+    if options.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    scales = [scale.strip() for scale in options.scales.split(',') if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALE_PRESETS]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": "sqlite",
+        "settings": {
+            "seed": options.seed, "batch_size": options.batch_size,
+            "row_by_row": options.row_by_row, "engine": options.engine,
+            "tracemalloc": options.memory, "repeat": options.repeat,
+        },
+        "runs": [],
+    }
+
+    with contextlib.ExitStack() as stack:
+        workdir = options.workdir or stack.enter_context(tempfile.TemporaryDirectory())
+        for scale in scales:
+            print(f"⏱️  Benchmarking scale '{scale}'...", file=sys.stderr)
+            run = median_run([benchmark_scale(scale, options, workdir) for _ in range(options.repeat)])
+            print(f"   ✅ {run['rows']} rows in {run['wall_time_s']:.2f}s "
+                  f"({run['rows_per_sec']:,.0f} rows/s, median of {run['repeats']})", file=sys.stderr)
+            report["runs"].append(run)
+
+    output = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"📄 Report written to {options.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(report, json.load(f), options.tolerance, options.min_stage_ms)
+        if regressions:
+            print("❌ Regressions against baseline:", file=sys.stderr)
+            for regression in regressions:
+                print(f"   • {regression}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ No regressions against baseline", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
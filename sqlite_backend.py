@@ -0,0 +1,920 @@
+"""
+ITI Database - SQLite backend
+Creates the ITI exam schema in a local SQLite file so the mock data pipeline can run
+(and be benchmarked) on a machine without SQL Server
+"""
+
+import sqlite3
+
+# ============================================================================
+# SCHEMA (mirrors the SQL Server tables used by the stored procedures)
+# ============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Department (
+    D_Id INTEGER PRIMARY KEY,
+    D_Name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS Track (
+    Track_Id INTEGER PRIMARY KEY,
+    Track_Name TEXT,
+    Track_Des TEXT,
+    Dep_Id INTEGER REFERENCES Department (D_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Track_JobProfile (
+    Track_Id INTEGER NOT NULL REFERENCES Track (Track_Id),
+    T_JobProfiles TEXT NOT NULL,
+    PRIMARY KEY (Track_Id, T_JobProfiles)
+);
+
+CREATE TABLE IF NOT EXISTS Instructor (
+    Ins_Id INTEGER PRIMARY KEY,
+    Ins_FName TEXT,
+    Ins_LName TEXT,
+    Ins_Email TEXT,
+    Password TEXT,
+    Salary REAL,
+    Ins_Gender TEXT,
+    Dep_Id INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS Instructor_Phones (
+    Ins_Id INTEGER NOT NULL REFERENCES Instructor (Ins_Id),
+    Phone TEXT NOT NULL,
+    PRIMARY KEY (Ins_Id, Phone)
+);
+
+CREATE TABLE IF NOT EXISTS Student (
+    S_Id INTEGER PRIMARY KEY,
+    S_FName TEXT,
+    S_LName TEXT,
+    S_Age INTEGER,
+    S_Email TEXT,
+    Password TEXT,
+    S_GPA NUMERIC,
+    D_Id INTEGER REFERENCES Department (D_Id),
+    Track_Id INTEGER REFERENCES Track (Track_Id),
+    Dep_Id INTEGER REFERENCES Department (D_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Student_Phones (
+    S_Id INTEGER NOT NULL REFERENCES Student (S_Id),
+    S_Phone TEXT NOT NULL,
+    PRIMARY KEY (S_Id, S_Phone)
+);
+
+CREATE TABLE IF NOT EXISTS Course (
+    C_Id INTEGER PRIMARY KEY,
+    C_Name TEXT,
+    C_Des TEXT,
+    C_Duration REAL,
+    Track_Id INTEGER REFERENCES Track (Track_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Topic (
+    Topic_Id INTEGER PRIMARY KEY,
+    Topic_Name TEXT,
+    Topic_Des TEXT
+);
+
+CREATE TABLE IF NOT EXISTS Course_Topic (
+    C_Id INTEGER NOT NULL REFERENCES Course (C_Id),
+    Topic_Id INTEGER NOT NULL REFERENCES Topic (Topic_Id),
+    PRIMARY KEY (C_Id, Topic_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Student_Course (
+    S_Id INTEGER NOT NULL REFERENCES Student (S_Id),
+    Course_Id INTEGER NOT NULL REFERENCES Course (C_Id),
+    Enrollment_Date TEXT,
+    PRIMARY KEY (S_Id, Course_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Teaching (
+    S_Id INTEGER NOT NULL REFERENCES Student (S_Id),
+    Ins_Id INTEGER NOT NULL REFERENCES Instructor (Ins_Id),
+    C_Id INTEGER NOT NULL REFERENCES Course (C_Id),
+    PRIMARY KEY (S_Id, Ins_Id, C_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Exam (
+    E_Id INTEGER PRIMARY KEY,
+    E_Title TEXT,
+    E_Total_Marks REAL,
+    E_Duaration REAL,
+    E_Date TEXT,
+    C_Id INTEGER REFERENCES Course (C_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Question (
+    Q_Id INTEGER PRIMARY KEY,
+    Q_Content TEXT,
+    Q_Type TEXT,
+    Q_Points REAL,
+    Q_hardness TEXT,
+    C_Id INTEGER REFERENCES Course (C_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Exam_Questions (
+    E_Id INTEGER NOT NULL REFERENCES Exam (E_Id),
+    Q_Id INTEGER NOT NULL REFERENCES Question (Q_Id),
+    PRIMARY KEY (E_Id, Q_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Student_Exam (
+    S_Id INTEGER NOT NULL REFERENCES Student (S_Id),
+    E_Id INTEGER NOT NULL REFERENCES Exam (E_Id),
+    Grade REAL,
+    Date_Taken TEXT,
+    PRIMARY KEY (S_Id, E_Id)
+);
+
+CREATE TABLE IF NOT EXISTS Student_Answer (
+    A_Id INTEGER PRIMARY KEY,
+    Question_Id INTEGER REFERENCES Question (Q_Id),
+    Exam_Id INTEGER REFERENCES Exam (E_Id),
+    Choice_Id INTEGER,
+    S_Id INTEGER REFERENCES Student (S_Id)
+);
+
+-- Choice_Id also references Student_Answer (FK_Choice_Student_Answer), as on SQL Server
+CREATE TABLE IF NOT EXISTS Choice (
+    Choice_Id INTEGER NOT NULL REFERENCES Student_Answer (A_Id),
+    Q_Id INTEGER NOT NULL REFERENCES Question (Q_Id),
+    Is_Correct INTEGER,
+    Choice_Content TEXT,
+    PRIMARY KEY (Choice_Id, Q_Id)
+);
+
+-- Per-(student, course) grade summary, maintained by the Student_Exam triggers below
+CREATE TABLE IF NOT EXISTS Student_Course_Grade (
+    S_Id INTEGER NOT NULL,
+    C_Id INTEGER NOT NULL,
+    Grade_Sum REAL NOT NULL,
+    Graded_Exams INTEGER NOT NULL,
+    PRIMARY KEY (S_Id, C_Id)
+);
+
+-- SQLite triggers fire per row; together they do what TR_Student_Exam_Grade_Summary does
+CREATE TRIGGER IF NOT EXISTS TR_Student_Exam_Grade_Insert AFTER INSERT ON Student_Exam
+WHEN NEW.Grade IS NOT NULL
+BEGIN
+    INSERT INTO Student_Course_Grade (S_Id, C_Id, Grade_Sum, Graded_Exams)
+    SELECT NEW.S_Id, e.C_Id, NEW.Grade, 1 FROM Exam e WHERE e.E_Id = NEW.E_Id AND e.C_Id IS NOT NULL
+    ON CONFLICT (S_Id, C_Id) DO UPDATE SET Grade_Sum = Grade_Sum + excluded.Grade_Sum,
+                                           Graded_Exams = Graded_Exams + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_Student_Exam_Grade_Delete AFTER DELETE ON Student_Exam
+WHEN OLD.Grade IS NOT NULL
+BEGIN
+    UPDATE Student_Course_Grade
+    SET Grade_Sum = Grade_Sum - OLD.Grade, Graded_Exams = Graded_Exams - 1
+    WHERE S_Id = OLD.S_Id AND C_Id = (SELECT C_Id FROM Exam WHERE E_Id = OLD.E_Id);
+    DELETE FROM Student_Course_Grade WHERE S_Id = OLD.S_Id AND Graded_Exams <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS TR_Student_Exam_Grade_Update AFTER UPDATE OF S_Id, E_Id, Grade ON Student_Exam
+BEGIN
+    UPDATE Student_Course_Grade
+    SET Grade_Sum = Grade_Sum - OLD.Grade, Graded_Exams = Graded_Exams - 1
+    WHERE OLD.Grade IS NOT NULL
+      AND S_Id = OLD.S_Id AND C_Id = (SELECT C_Id FROM Exam WHERE E_Id = OLD.E_Id);
+    DELETE FROM Student_Course_Grade WHERE S_Id = OLD.S_Id AND Graded_Exams <= 0;
+    INSERT INTO Student_Course_Grade (S_Id, C_Id, Grade_Sum, Graded_Exams)
+    SELECT NEW.S_Id, e.C_Id, NEW.Grade, 1 FROM Exam e
+    WHERE NEW.Grade IS NOT NULL AND e.E_Id = NEW.E_Id AND e.C_Id IS NOT NULL
+    ON CONFLICT (S_Id, C_Id) DO UPDATE SET Grade_Sum = Grade_Sum + excluded.Grade_Sum,
+                                           Graded_Exams = Graded_Exams + 1;
+END;
+
+-- Stand-in for SQL Server SEQUENCE objects (dbo.Seq_Student_Answer_Id): next value per sequence
+CREATE TABLE IF NOT EXISTS Sequences (
+    Name TEXT PRIMARY KEY,
+    Next_Value INTEGER NOT NULL
+);
+"""
+
+# ============================================================================
+# BACKEND
+# ============================================================================
+
+class SqliteBackend:
+    """Local SQLite file with the ITI schema; stands in for SQL Server"""
+    name = "SQLite"
+
+    def __init__(self, path="iti_mock.db", timeout=300):
+        self.path = path
+        self.timeout = timeout
+
+    def describe(self):
+        return f"SQLite file: {self.path}"
+
+    def connect(self):
+        """Open a connection, creating the schema on first use"""
+        # Worker threads hand connections around, so allow cross-thread use
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        had_summary = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Student_Course_Grade'"
+        ).fetchone()
+        conn.executescript(SCHEMA)
+        if not had_summary:
+            # Database created before the grade summary existed: fill it from Student_Exam once
+            sp_rebuild_student_grade_summary(conn.cursor())
+            conn.commit()
+        return conn
+
+    def prepare_cursor(self, cursor):
+        """sqlite3 executemany() already runs a prepared statement per batch"""
+
+    def identity_insert(self, cursor, table, enabled):
+        """INTEGER PRIMARY KEY columns accept explicit ids, nothing to toggle"""
+
+    def disable_constraints(self, cursor):
+        cursor.execute("PRAGMA foreign_keys = OFF")
+
+    def enable_constraints(self, cursor):
+        """Turn enforcement on and fail if the loaded rows break a foreign key"""
+        cursor.execute("PRAGMA foreign_keys = ON")
+        violations = cursor.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            tables = sorted({row[0] for row in violations})
+            raise RuntimeError(f"{len(violations)} foreign key violations in {', '.join(tables)}")
+
+    def foreign_key_enabled(self, cursor, name):
+        """SQLite enforces all foreign keys or none, per connection"""
+        return bool(cursor.execute("PRAGMA foreign_keys").fetchone()[0])
+
+    def reserve_ids(self, cursor, sequence, table, column, count):
+        return reserve_range(cursor, sequence, table, column, count)
+    
+    def restart_sequence(self, cursor, sequence, table, column, start):
+        cursor.execute("""
+            INSERT INTO Sequences (Name, Next_Value) VALUES (?, ?)
+            ON CONFLICT (Name) DO UPDATE SET Next_Value = excluded.Next_Value
+        """, (sequence, start))
+    
+    def truncate_tables(self, cursor, tables):
+        # No TRUNCATE: an unfiltered DELETE uses SQLite's truncate optimization instead
+        for table in tables:
+            cursor.execute(f"DELETE FROM {table}")
+    
+    def create_index(self, cursor, name, table, columns, include=()):
+        # No INCLUDE in SQLite: included columns become trailing key columns (still covering)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join([*columns, *include])})")
+    
+    def drop_index(self, cursor, name, table):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    
+    def call_procedure(self, cursor, name, params, outputs=()):
+        """Run the Python emulation of a stored procedure; OUTPUT values come back as rows"""
+        procedure = PROCEDURES.get(name)
+        if procedure is None:
+            raise NotImplementedError(f"{name} has no SQLite emulation")
+        return procedure(cursor, *params)
+
+    def fetch_page(self, cursor, name, params, size):
+        """Run a paged list emulation (which leaves its SELECT open) and fetchmany `size` rows"""
+        procedure = PROCEDURES.get(name)
+        if procedure is None:
+            raise NotImplementedError(f"{name} has no SQLite emulation")
+        result = procedure(cursor, *params)
+        return result.fetchmany(size), [column[0] for column in result.description]
+
+# ============================================================================
+# STORED PROCEDURE EMULATIONS (same queries as StoredP/all_v2_formatted.sql)
+# ============================================================================
+
+def reserve_range(cursor, sequence, table, column, count):
+    """sp_sequence_get_range: reserve `count` ids and return the first one
+
+    A sequence seen for the first time starts after the table's current MAX(column).
+    """
+    cursor.execute(
+        f"INSERT OR IGNORE INTO Sequences (Name, Next_Value) SELECT ?, IFNULL(MAX({column}), 0) + 1 FROM {table}",
+        (sequence,)
+    )
+    return cursor.execute(
+        "UPDATE Sequences SET Next_Value = Next_Value + ? WHERE Name = ? RETURNING Next_Value - ?",
+        (count, sequence, count)
+    ).fetchone()[0]
+
+def begin_immediate(cursor):
+    """Take the write lock up front, as a procedure's transaction holds its locks on SQL Server"""
+    if not cursor.connection.in_transaction:
+        cursor.execute("BEGIN IMMEDIATE")
+
+EARNED_POINTS = """
+    SUM(CASE WHEN sc.Choice_Id = cc.Choice_Id THEN q.Q_Points ELSE 0 END)
+"""
+
+ANSWER_JOINS = """
+    LEFT JOIN Student_Answer sa
+        ON sa.Question_Id = q.Q_Id AND sa.Exam_Id = {exam} AND sa.S_Id = {student}
+    LEFT JOIN Choice sc ON sc.Choice_Id = sa.Choice_Id AND sc.Q_Id = q.Q_Id
+    JOIN Choice cc ON cc.Q_Id = q.Q_Id AND cc.Is_Correct = 1
+"""
+
+# @ScorePercentage DECIMAL(5,2); NULL when the exam has no correct choices, as on SQL Server
+SCORE_PERCENTAGE = """
+    CASE WHEN {total} = 0 THEN 0 ELSE ROUND({earned} * 1.0 / {total} * 100, 2) END
+"""
+
+def sp_correct_exam(cursor, e_id, s_id):
+    """SP_CorrectExam: detail rows, total points, earned points, then upsert Student_Exam"""
+    begin_immediate(cursor)
+    answer_joins = ANSWER_JOINS.format(exam="?", student="?")
+    cursor.execute(f"""
+        SELECT q.Q_Id, q.Q_Content, sa.Choice_Id, sc.Choice_Content, cc.Choice_Id, cc.Choice_Content,
+               CASE WHEN sc.Choice_Id = cc.Choice_Id THEN q.Q_Points ELSE 0 END, q.Q_Points
+        FROM Exam_Questions eq
+        JOIN Question q ON eq.Q_Id = q.Q_Id
+        {answer_joins}
+        WHERE eq.E_Id = ?
+    """, (e_id, s_id, e_id)).fetchall()
+    total = cursor.execute("""
+        SELECT SUM(q.Q_Points)
+        FROM Exam_Questions eq JOIN Question q ON eq.Q_Id = q.Q_Id
+        WHERE eq.E_Id = ?
+    """, (e_id,)).fetchone()[0]
+    earned = cursor.execute(f"""
+        SELECT {EARNED_POINTS}
+        FROM Exam_Questions eq
+        JOIN Question q ON eq.Q_Id = q.Q_Id
+        {answer_joins}
+        WHERE eq.E_Id = ?
+    """, (e_id, s_id, e_id)).fetchone()[0]
+
+    score = cursor.execute(
+        f"SELECT {SCORE_PERCENTAGE.format(total='?1', earned='?2')}", (total, earned)
+    ).fetchone()[0]
+    cursor.execute("""
+        INSERT INTO Student_Exam (S_Id, E_Id, Grade, Date_Taken) VALUES (?, ?, ?, DATE('now'))
+        ON CONFLICT (S_Id, E_Id) DO UPDATE SET Grade = excluded.Grade, Date_Taken = excluded.Date_Taken
+    """, (s_id, e_id, score))
+    return [(score,)]
+
+def sp_correct_exams_bulk(cursor, exam_ids):
+    """SP_CorrectExamsBulk: grade every submission of the listed exams with one upsert"""
+    begin_immediate(cursor)
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS ExamIds (E_Id INTEGER PRIMARY KEY)")
+    cursor.execute("DELETE FROM ExamIds")
+    cursor.executemany("INSERT OR IGNORE INTO ExamIds (E_Id) VALUES (?)", exam_ids)
+
+    answer_joins = ANSWER_JOINS.format(exam="s.E_Id", student="s.S_Id")
+    grades_query = f"""
+        WITH Submissions AS (
+            SELECT se.S_Id, se.E_Id FROM Student_Exam se JOIN ExamIds ids ON ids.E_Id = se.E_Id
+            UNION
+            SELECT sa.S_Id, sa.Exam_Id FROM Student_Answer sa JOIN ExamIds ids ON ids.E_Id = sa.Exam_Id
+        ),
+        ExamTotals AS (
+            SELECT eq.E_Id, SUM(q.Q_Points) AS TotalPoints
+            FROM Exam_Questions eq
+            JOIN ExamIds ids ON ids.E_Id = eq.E_Id
+            JOIN Question q ON eq.Q_Id = q.Q_Id
+            GROUP BY eq.E_Id
+        ),
+        Earned AS (
+            SELECT s.S_Id, s.E_Id, {EARNED_POINTS} AS EarnedPoints
+            FROM Submissions s
+            JOIN Exam_Questions eq ON eq.E_Id = s.E_Id
+            JOIN Question q ON eq.Q_Id = q.Q_Id
+            {answer_joins}
+            GROUP BY s.S_Id, s.E_Id
+        )
+        SELECT s.S_Id, s.E_Id,
+               {SCORE_PERCENTAGE.format(total='t.TotalPoints', earned='e.EarnedPoints')} AS Grade
+        FROM Submissions s
+        LEFT JOIN ExamTotals t ON t.E_Id = s.E_Id
+        LEFT JOIN Earned e ON e.S_Id = s.S_Id AND e.E_Id = s.E_Id
+    """
+    # SQLite's upsert plays the role of MERGE; WHERE true disambiguates ON CONFLICT after a SELECT
+    cursor.execute(f"""
+        INSERT INTO Student_Exam (S_Id, E_Id, Grade, Date_Taken)
+        SELECT S_Id, E_Id, Grade, DATE('now') FROM ({grades_query}) WHERE true
+        ON CONFLICT (S_Id, E_Id) DO UPDATE SET Grade = excluded.Grade, Date_Taken = excluded.Date_Taken
+    """)
+    return cursor.execute("""
+        SELECT se.S_Id, se.E_Id, se.Grade
+        FROM Student_Exam se JOIN ExamIds ids ON ids.E_Id = se.E_Id
+        ORDER BY se.E_Id, se.S_Id
+    """).fetchall()
+
+def sp_get_exam_questions_with_choices(cursor, e_id):
+    """SP_GetExamQuestionsWithChoices: one row per (question, choice) of the exam"""
+    return cursor.execute("""
+        SELECT e.E_Id, eq.Q_Id, q.Q_Content, q.Q_Type, q.Q_Points,
+               c.Choice_Id, c.Choice_Content, c.Is_Correct
+        FROM Exam e
+        JOIN Exam_Questions eq ON e.E_Id = eq.E_Id
+        JOIN Question q ON eq.Q_Id = q.Q_Id
+        LEFT JOIN Choice c ON q.Q_Id = c.Q_Id
+        WHERE e.E_Id = ?
+        ORDER BY eq.Q_Id, c.Choice_Id
+    """, (e_id,)).fetchall()
+
+def sp_update_question(cursor, q_id, content, q_type, points, hardness):
+    cursor.execute("""
+        UPDATE Question SET Q_Content = ?, Q_hardness = ?, Q_Points = ?, Q_Type = ? WHERE Q_Id = ?
+    """, (content, hardness, points, q_type, q_id))
+    return []
+
+def sp_delete_question(cursor, q_id):
+    """SP_DeleteQuestion: answers, then choices, then the question itself"""
+    cursor.execute("DELETE FROM Student_Answer WHERE Question_Id = ?", (q_id,))
+    cursor.execute("DELETE FROM Choice WHERE Q_Id = ?", (q_id,))
+    cursor.execute("DELETE FROM Question WHERE Q_Id = ?", (q_id,))
+    return []
+
+def sp_update_choice(cursor, choice_id, q_id, is_correct, content):
+    cursor.execute("""
+        UPDATE Choice SET Q_Id = ?, Is_Correct = ?, Choice_Content = ? WHERE Choice_Id = ?
+    """, (q_id, is_correct, content, choice_id))
+    return []
+
+def sp_update_exam(cursor, e_id, title, total_marks, duration, exam_date):
+    cursor.execute("""
+        UPDATE Exam SET E_Title = ?, E_Total_Marks = ?, E_Duaration = ?, E_Date = ? WHERE E_Id = ?
+    """, (title, total_marks, duration, exam_date, e_id))
+    return []
+
+def sp_login_student(cursor, email, password):
+    return cursor.execute("""
+        SELECT S_Id, S_FName, S_LName, S_Email FROM Student WHERE S_Email = ? AND Password = ?
+    """, (email, password)).fetchall()
+
+def sp_rebuild_student_grade_summary(cursor):
+    """SP_RebuildStudentGradeSummary: recompute Student_Course_Grade from Student_Exam"""
+    begin_immediate(cursor)
+    cursor.execute("DELETE FROM Student_Course_Grade")
+    cursor.execute("""
+        INSERT INTO Student_Course_Grade (S_Id, C_Id, Grade_Sum, Graded_Exams)
+        SELECT se.S_Id, e.C_Id, SUM(se.Grade), COUNT(*)
+        FROM Student_Exam se JOIN Exam e ON se.E_Id = e.E_Id
+        WHERE se.Grade IS NOT NULL AND e.C_Id IS NOT NULL
+        GROUP BY se.S_Id, e.C_Id
+    """)
+    return []
+
+def sp_get_student_grades(cursor, s_id):
+    """SP_GetStudentGrades, read from the grade summary"""
+    if cursor.execute("SELECT 1 FROM Student WHERE S_Id = ?", (s_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student ID {s_id} does not exist")
+    return cursor.execute("""
+        SELECT s.S_FName || ' ' || s.S_LName AS StudentName, c.C_Id, c.C_Name AS CourseName,
+               g.AverageGrade, g.Graded_Exams AS ExamsTaken,
+               CASE WHEN g.AverageGrade >= 90 THEN 'A'
+                    WHEN g.AverageGrade >= 80 THEN 'B'
+                    WHEN g.AverageGrade >= 70 THEN 'C'
+                    WHEN g.AverageGrade >= 60 THEN 'D'
+                    ELSE 'F' END AS LetterGrade,
+               CASE WHEN g.AverageGrade >= 60 THEN 'Pass' ELSE 'Fail' END AS Status
+        FROM (
+            SELECT S_Id, C_Id, Graded_Exams, Grade_Sum / Graded_Exams AS AverageGrade
+            FROM Student_Course_Grade WHERE S_Id = ?
+        ) AS g
+        JOIN Student s ON s.S_Id = g.S_Id
+        JOIN Course c ON c.C_Id = g.C_Id
+        ORDER BY c.C_Name
+    """, (s_id,)).fetchall()
+
+def sp_get_available_exams_for_student(cursor, s_id):
+    """SP_GetAvailableExamsForStudent: every exam of the student's courses, taken or not"""
+    if cursor.execute("SELECT 1 FROM Student WHERE S_Id = ?", (s_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student ID {s_id} does not exist")
+    return cursor.execute("""
+        SELECT e.E_Id, e.E_Title, e.E_Total_Marks, e.E_Duaration AS Duration_Minutes, e.E_Date,
+               c.C_Name AS CourseName, c.C_Id,
+               CASE WHEN se.E_Id IS NOT NULL THEN 'Taken' ELSE 'Available' END AS ExamStatus,
+               se.Grade, se.Date_Taken,
+               (SELECT COUNT(*) FROM Exam_Questions WHERE E_Id = e.E_Id) AS TotalQuestions
+        FROM Student_Course sc
+        JOIN Course c ON sc.Course_Id = c.C_Id
+        JOIN Exam e ON c.C_Id = e.C_Id
+        LEFT JOIN Student_Exam se ON e.E_Id = se.E_Id AND se.S_Id = ?
+        WHERE sc.S_Id = ?
+        ORDER BY e.E_Date DESC, c.C_Name
+    """, (s_id, s_id)).fetchall()
+
+def sp_submit_student_answers(cursor, e_id, s_id, answers):
+    """SP_SubmitStudentAnswers: answers is the AnswerListType TVP as (Q_Id, Choice_Id) rows"""
+    begin_immediate(cursor)
+    if cursor.execute("SELECT 1 FROM Exam WHERE E_Id = ?", (e_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Exam ID {e_id} does not exist")
+    if cursor.execute("SELECT 1 FROM Student WHERE S_Id = ?", (s_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student ID {s_id} does not exist")
+    if cursor.execute("""
+        SELECT 1 FROM Student_Course sc JOIN Exam e ON sc.Course_Id = e.C_Id
+        WHERE sc.S_Id = ? AND e.E_Id = ?
+    """, (s_id, e_id)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student {s_id} is not enrolled in the course for exam {e_id}")
+
+    answers = sorted(answers, key=lambda answer: answer[0])
+    next_a_id = reserve_range(cursor, "dbo.Seq_Student_Answer_Id", "Student_Answer", "A_Id", len(answers))
+    cursor.executemany(
+        "INSERT INTO Student_Answer (A_Id, Question_Id, Exam_Id, Choice_Id, S_Id) VALUES (?, ?, ?, ?, ?)",
+        [(next_a_id + i, q_id, e_id, choice_id, s_id) for i, (q_id, choice_id) in enumerate(answers)]
+    )
+    cursor.execute("""
+        INSERT INTO Student_Exam (S_Id, E_Id, Grade, Date_Taken) VALUES (?, ?, NULL, DATE('now'))
+        ON CONFLICT (S_Id, E_Id) DO UPDATE SET Date_Taken = excluded.Date_Taken
+    """, (s_id, e_id))
+    return []
+
+def sp_enroll_student_in_course(cursor, s_id, course_id, enrollment_date=None):
+    """SP_EnrollStudentInCourse"""
+    begin_immediate(cursor)
+    if cursor.execute("SELECT 1 FROM Student WHERE S_Id = ?", (s_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student ID {s_id} does not exist")
+    if cursor.execute("SELECT 1 FROM Course WHERE C_Id = ?", (course_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Course ID {course_id} does not exist")
+    if cursor.execute("SELECT 1 FROM Student_Course WHERE S_Id = ? AND Course_Id = ?",
+                      (s_id, course_id)).fetchone() is not None:
+        raise sqlite3.DatabaseError(f"Student {s_id} is already enrolled in course {course_id}")
+    cursor.execute(
+        "INSERT INTO Student_Course (S_Id, Course_Id, Enrollment_Date) VALUES (?, ?, COALESCE(?, DATE('now')))",
+        (s_id, course_id, enrollment_date)
+    )
+    return []
+
+def sp_enroll_student_in_track_courses(cursor, s_id, track_id):
+    """SP_EnrollStudentInTrackCourses: every course of the track the student is not in yet"""
+    begin_immediate(cursor)
+    if cursor.execute("SELECT 1 FROM Student WHERE S_Id = ?", (s_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student ID {s_id} does not exist")
+    if cursor.execute("SELECT 1 FROM Track WHERE Track_Id = ?", (track_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Track ID {track_id} does not exist")
+    cursor.execute("""
+        INSERT OR IGNORE INTO Student_Course (S_Id, Course_Id, Enrollment_Date)
+        SELECT ?, C_Id, DATE('now') FROM Course WHERE Track_Id = ?
+    """, (s_id, track_id))
+    return []
+
+def sp_enroll_students_bulk(cursor, enrollments):
+    """SP_EnrollStudentsBulk: enrollments is the EnrollmentListType TVP as
+    (S_Id, Track_Id, Course_Id, Enrollment_Date) rows; returns [(RequestedCount, EnrolledCount)]"""
+    begin_immediate(cursor)
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS Enrollments (
+            S_Id INTEGER NOT NULL, Track_Id INTEGER, Course_Id INTEGER, Enrollment_Date TEXT
+        )
+    """)
+    cursor.execute("DELETE FROM Enrollments")
+    cursor.executemany("INSERT INTO Enrollments VALUES (?, ?, ?, ?)", enrollments)
+
+    if cursor.execute("""
+        SELECT 1 FROM Enrollments WHERE (Track_Id IS NULL) = (Course_Id IS NULL)
+    """).fetchone() is not None:
+        raise sqlite3.DatabaseError("Each enrollment row needs exactly one of Track_Id or Course_Id")
+    for column, table, key, label in (("S_Id", "Student", "S_Id", "Student"),
+                                      ("Course_Id", "Course", "C_Id", "Course"),
+                                      ("Track_Id", "Track", "Track_Id", "Track")):
+        bad = cursor.execute(f"""
+            SELECT en.{column} FROM Enrollments en
+            WHERE en.{column} IS NOT NULL AND NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{key} = en.{column})
+            LIMIT 1
+        """).fetchone()
+        if bad is not None:
+            raise sqlite3.DatabaseError(f"{label} ID {bad[0]} does not exist")
+
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS Requested "
+                   "(S_Id INTEGER, Course_Id INTEGER, Enrollment_Date TEXT, PRIMARY KEY (S_Id, Course_Id))")
+    cursor.execute("DELETE FROM Requested")
+    cursor.execute("""
+        INSERT INTO Requested (S_Id, Course_Id, Enrollment_Date)
+        SELECT S_Id, Course_Id, MIN(Enrollment_Date)
+        FROM (
+            SELECT S_Id, Course_Id, COALESCE(Enrollment_Date, DATE('now')) AS Enrollment_Date
+            FROM Enrollments WHERE Course_Id IS NOT NULL
+            UNION ALL
+            SELECT en.S_Id, c.C_Id, COALESCE(en.Enrollment_Date, DATE('now'))
+            FROM Enrollments en JOIN Course c ON c.Track_Id = en.Track_Id
+            WHERE en.Track_Id IS NOT NULL
+        )
+        GROUP BY S_Id, Course_Id
+    """)
+    enrolled = cursor.execute("""
+        INSERT OR IGNORE INTO Student_Course (S_Id, Course_Id, Enrollment_Date)
+        SELECT S_Id, Course_Id, Enrollment_Date FROM Requested
+    """).rowcount
+    requested = cursor.execute("SELECT COUNT(*) FROM Requested").fetchone()[0]
+    return [(requested, enrolled)]
+
+def sp_generate_exam(cursor, c_id, num_true_false, num_mcq):
+    """SP_GenerateExam: returns [(E_Id,)], the OUTPUT parameter"""
+    begin_immediate(cursor)
+    cursor.execute("""
+        INSERT INTO Exam (E_Title, E_Total_Marks, E_Duaration, E_Date, C_Id)
+        VALUES ('Auto Generated Exam', 0, 60, DATE('now'), ?)
+    """, (c_id,))
+    e_id = cursor.lastrowid
+    for q_type, count in (("TF", num_true_false), ("MCQ", num_mcq)):
+        cursor.execute("""
+            INSERT INTO Exam_Questions (E_Id, Q_Id)
+            SELECT ?, Q_Id FROM Question WHERE Q_Type = ? AND C_Id = ? ORDER BY RANDOM() LIMIT ?
+        """, (e_id, q_type, c_id, count))
+    cursor.execute("""
+        UPDATE Exam SET E_Total_Marks = (
+            SELECT SUM(q.Q_Points) FROM Exam_Questions eq JOIN Question q ON eq.Q_Id = q.Q_Id
+            WHERE eq.E_Id = ?
+        )
+        WHERE E_Id = ?
+    """, (e_id, e_id))
+    return [(e_id,)]
+
+def sp_generate_exams_bulk(cursor, requests, questions=()):
+    """SP_GenerateExamsBulk: requests is the ExamRequestListType TVP as (Request_Id, C_Id,
+    NumTrueFalse, NumMCQ, E_Title, E_Duaration, E_Date) rows, questions the optional
+    ExamQuestionPlanType TVP as (Request_Id, Q_Id) rows.
+    Returns [(Request_Id, E_Id, E_Total_Marks, QuestionCount)]"""
+    begin_immediate(cursor)
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS Exam_Requests (
+            Request_Id INTEGER PRIMARY KEY, C_Id INTEGER NOT NULL, NumTrueFalse INTEGER NOT NULL,
+            NumMCQ INTEGER NOT NULL, E_Title TEXT, E_Duaration REAL, E_Date TEXT
+        )
+    """)
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS Planned_Questions "
+                   "(Request_Id INTEGER, Q_Id INTEGER, PRIMARY KEY (Request_Id, Q_Id))")
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS Picked "
+                   "(Request_Id INTEGER, Q_Id INTEGER, PRIMARY KEY (Request_Id, Q_Id))")
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS Pool (C_Id INTEGER, Q_Type TEXT, Pool_Rank INTEGER, "
+                   "Q_Id INTEGER UNIQUE, PRIMARY KEY (C_Id, Q_Type, Pool_Rank))")
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS Wanted (Request_Id INTEGER, Q_Type TEXT, C_Id INTEGER, "
+                   "Wanted INTEGER, Pool_Count INTEGER, Picked INTEGER, PRIMARY KEY (Request_Id, Q_Type))")
+    for table in ("Exam_Requests", "Planned_Questions", "Picked", "Pool", "Wanted"):
+        cursor.execute(f"DELETE FROM {table}")
+    cursor.executemany("INSERT INTO Exam_Requests VALUES (?, ?, ?, ?, ?, ?, ?)", requests)
+    cursor.executemany("INSERT INTO Planned_Questions VALUES (?, ?)", questions)
+
+    bad = cursor.execute("""
+        SELECT r.C_Id FROM Exam_Requests r WHERE NOT EXISTS (SELECT 1 FROM Course c WHERE c.C_Id = r.C_Id) LIMIT 1
+    """).fetchone()
+    if bad is not None:
+        raise sqlite3.DatabaseError(f"Course ID {bad[0]} does not exist")
+    bad = cursor.execute("""
+        SELECT pq.Q_Id FROM Planned_Questions pq
+        LEFT JOIN Exam_Requests r ON r.Request_Id = pq.Request_Id
+        LEFT JOIN Question q ON q.Q_Id = pq.Q_Id
+        WHERE r.Request_Id IS NULL OR q.Q_Id IS NULL OR q.C_Id <> r.C_Id
+        LIMIT 1
+    """).fetchone()
+    if bad is not None:
+        raise sqlite3.DatabaseError(f"Question ID {bad[0]} is not a question of its exam's course")
+
+    cursor.execute("INSERT INTO Picked SELECT Request_Id, Q_Id FROM Planned_Questions")
+
+    # Number each drawn course's pool once, then draw random ranks and redraw duplicates
+    cursor.execute("""
+        INSERT INTO Pool (C_Id, Q_Type, Pool_Rank, Q_Id)
+        SELECT q.C_Id, q.Q_Type, ROW_NUMBER() OVER (PARTITION BY q.C_Id, q.Q_Type ORDER BY q.Q_Id), q.Q_Id
+        FROM Question q
+        WHERE q.Q_Type IN ('TF', 'MCQ')
+          AND q.C_Id IN (SELECT r.C_Id FROM Exam_Requests r
+                         WHERE NOT EXISTS (SELECT 1 FROM Planned_Questions pq WHERE pq.Request_Id = r.Request_Id))
+    """)
+    cursor.execute("""
+        INSERT INTO Wanted (Request_Id, Q_Type, C_Id, Wanted, Pool_Count, Picked)
+        SELECT r.Request_Id, pools.Q_Type, r.C_Id,
+               MIN(CASE pools.Q_Type WHEN 'TF' THEN r.NumTrueFalse ELSE r.NumMCQ END, pools.Pool_Count),
+               pools.Pool_Count, 0
+        FROM Exam_Requests r
+        JOIN (SELECT C_Id, Q_Type, COUNT(*) AS Pool_Count FROM Pool GROUP BY C_Id, Q_Type) pools
+          ON pools.C_Id = r.C_Id
+        WHERE CASE pools.Q_Type WHEN 'TF' THEN r.NumTrueFalse ELSE r.NumMCQ END > 0
+          AND NOT EXISTS (SELECT 1 FROM Planned_Questions pq WHERE pq.Request_Id = r.Request_Id)
+    """)
+    cursor.execute("""
+        INSERT INTO Picked (Request_Id, Q_Id)
+        SELECT w.Request_Id, p.Q_Id FROM Wanted w JOIN Pool p ON p.C_Id = w.C_Id AND p.Q_Type = w.Q_Type
+        WHERE w.Wanted = w.Pool_Count
+    """)
+    cursor.execute("UPDATE Wanted SET Picked = Wanted WHERE Wanted = Pool_Count")
+    while cursor.execute("SELECT 1 FROM Wanted WHERE Picked < Wanted LIMIT 1").fetchone():
+        cursor.execute("""
+            WITH RECURSIVE Tally (N) AS (
+                SELECT 1 UNION ALL SELECT N + 1 FROM Tally WHERE N < (SELECT MAX(Wanted) FROM Wanted)
+            )
+            INSERT OR IGNORE INTO Picked (Request_Id, Q_Id)
+            SELECT d.Request_Id, p.Q_Id
+            FROM (
+                SELECT w.Request_Id, w.C_Id, w.Q_Type, ABS(RANDOM() % w.Pool_Count) + 1 AS Pool_Rank
+                FROM Wanted w JOIN Tally t ON t.N <= w.Wanted - w.Picked
+                WHERE w.Picked < w.Wanted
+            ) d
+            JOIN Pool p ON p.C_Id = d.C_Id AND p.Q_Type = d.Q_Type AND p.Pool_Rank = d.Pool_Rank
+        """)
+        cursor.execute("""
+            UPDATE Wanted
+            SET Picked = (SELECT COUNT(*) FROM Picked x JOIN Pool p ON p.Q_Id = x.Q_Id
+                          WHERE x.Request_Id = Wanted.Request_Id AND p.Q_Type = Wanted.Q_Type)
+            WHERE Picked < Wanted
+        """)
+
+    # Ids continue after MAX(E_Id) in request order; the write lock makes the range ours
+    first_id = cursor.execute("SELECT IFNULL(MAX(E_Id), 0) + 1 FROM Exam").fetchone()[0]
+    cursor.execute("""
+        INSERT INTO Exam (E_Id, E_Title, E_Total_Marks, E_Duaration, E_Date, C_Id)
+        SELECT ? + ROW_NUMBER() OVER (ORDER BY r.Request_Id) - 1,
+               IFNULL(r.E_Title, 'Auto Generated Exam'),
+               IFNULL((SELECT SUM(q.Q_Points) FROM Picked p JOIN Question q ON q.Q_Id = p.Q_Id
+                       WHERE p.Request_Id = r.Request_Id), 0),
+               IFNULL(r.E_Duaration, 60), IFNULL(r.E_Date, DATE('now')), r.C_Id
+        FROM Exam_Requests r
+        ORDER BY r.Request_Id
+    """, (first_id,))
+    cursor.execute("""
+        INSERT INTO Exam_Questions (E_Id, Q_Id)
+        SELECT c.E_Id, p.Q_Id
+        FROM Picked p
+        JOIN (SELECT Request_Id, ? + ROW_NUMBER() OVER (ORDER BY Request_Id) - 1 AS E_Id FROM Exam_Requests) c
+          ON c.Request_Id = p.Request_Id
+    """, (first_id,))
+    return cursor.execute("""
+        SELECT r.Request_Id, e.E_Id, e.E_Total_Marks,
+               (SELECT COUNT(*) FROM Picked p WHERE p.Request_Id = r.Request_Id)
+        FROM (SELECT Request_Id, ? + ROW_NUMBER() OVER (ORDER BY Request_Id) - 1 AS E_Id FROM Exam_Requests) r
+        JOIN Exam e ON e.E_Id = r.E_Id
+        ORDER BY r.Request_Id
+    """, (first_id,)).fetchall()
+
+def sp_import_questions_bulk(cursor, questions, choices):
+    """SP_ImportQuestionsBulk: questions is the QuestionImportType TVP as (Import_Id, C_Id,
+    Q_Content, Q_Type, Q_Points, Q_hardness) rows, choices the ChoiceImportType TVP as
+    (Import_Id, Choice_No, Is_Correct, Choice_Content) rows.
+    Returns [(Import_Id, Q_Id, First_Choice_Id, ChoiceCount)]"""
+    begin_immediate(cursor)
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS Question_Import (
+            Import_Id INTEGER PRIMARY KEY, C_Id INTEGER NOT NULL, Q_Content TEXT NOT NULL,
+            Q_Type TEXT NOT NULL, Q_Points REAL, Q_hardness TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS Choice_Import (
+            Import_Id INTEGER NOT NULL, Choice_No INTEGER NOT NULL, Is_Correct INTEGER NOT NULL,
+            Choice_Content TEXT NOT NULL, PRIMARY KEY (Import_Id, Choice_No)
+        )
+    """)
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS Import_Map "
+                   "(Import_Id INTEGER PRIMARY KEY, Q_Id INTEGER NOT NULL, First_Choice_Id INTEGER NOT NULL)")
+    for table in ("Question_Import", "Choice_Import", "Import_Map"):
+        cursor.execute(f"DELETE FROM {table}")
+    cursor.executemany("INSERT INTO Question_Import VALUES (?, ?, ?, ?, ?, ?)", questions)
+    cursor.executemany("INSERT INTO Choice_Import VALUES (?, ?, ?, ?)", choices)
+
+    bad = cursor.execute("""
+        SELECT q.C_Id FROM Question_Import q WHERE NOT EXISTS (SELECT 1 FROM Course c WHERE c.C_Id = q.C_Id) LIMIT 1
+    """).fetchone()
+    if bad is not None:
+        raise sqlite3.DatabaseError(f"Course ID {bad[0]} does not exist")
+    bad = cursor.execute("SELECT Import_Id FROM Question_Import WHERE Q_Type NOT IN ('MCQ', 'TF') LIMIT 1").fetchone()
+    if bad is not None:
+        raise sqlite3.DatabaseError(f"Question {bad[0]} has an unknown type (expected MCQ or TF)")
+    bad = cursor.execute("""
+        SELECT ch.Import_Id FROM Choice_Import ch
+        WHERE NOT EXISTS (SELECT 1 FROM Question_Import q WHERE q.Import_Id = ch.Import_Id) LIMIT 1
+    """).fetchone()
+    if bad is not None:
+        raise sqlite3.DatabaseError(f"Choices given for question {bad[0]}, which is not in the import")
+    bad = cursor.execute("""
+        SELECT q.Import_Id FROM Question_Import q
+        LEFT JOIN Choice_Import ch ON ch.Import_Id = q.Import_Id
+        GROUP BY q.Import_Id
+        HAVING COUNT(ch.Import_Id) < 2 OR SUM(CASE WHEN ch.Is_Correct = 1 THEN 1 ELSE 0 END) <> 1
+        LIMIT 1
+    """).fetchone()
+    if bad is not None:
+        raise sqlite3.DatabaseError(f"Question {bad[0]} needs at least two choices with exactly one correct")
+
+    # Ids continue after the current maximums; the write lock makes the ranges ours
+    cursor.execute("""
+        INSERT INTO Import_Map (Import_Id, Q_Id, First_Choice_Id)
+        SELECT q.Import_Id,
+               (SELECT IFNULL(MAX(Q_Id), 0) + 1 FROM Question) + ROW_NUMBER() OVER (ORDER BY q.Import_Id) - 1,
+               (SELECT IFNULL(MAX(Choice_Id), 0) + 1 FROM Choice) + IFNULL(SUM(counts.ChoiceCount) OVER (
+                   ORDER BY q.Import_Id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0)
+        FROM Question_Import q
+        JOIN (SELECT Import_Id, COUNT(*) AS ChoiceCount FROM Choice_Import GROUP BY Import_Id) counts
+          ON counts.Import_Id = q.Import_Id
+    """)
+    cursor.execute("""
+        INSERT INTO Question (Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness, C_Id)
+        SELECT m.Q_Id, q.Q_Content, q.Q_Type, q.Q_Points, q.Q_hardness, q.C_Id
+        FROM Question_Import q JOIN Import_Map m ON m.Import_Id = q.Import_Id
+    """)
+    cursor.execute("""
+        INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content)
+        SELECT m.First_Choice_Id + ROW_NUMBER() OVER (PARTITION BY ch.Import_Id ORDER BY ch.Choice_No) - 1,
+               m.Q_Id, ch.Is_Correct, ch.Choice_Content
+        FROM Choice_Import ch JOIN Import_Map m ON m.Import_Id = ch.Import_Id
+    """)
+    return cursor.execute("""
+        SELECT m.Import_Id, m.Q_Id, m.First_Choice_Id, COUNT(*)
+        FROM Import_Map m JOIN Choice_Import ch ON ch.Import_Id = m.Import_Id
+        GROUP BY m.Import_Id, m.Q_Id, m.First_Choice_Id
+        ORDER BY m.Import_Id
+    """).fetchall()
+
+def sp_get_students_by_department_page(cursor, dep_id, after_lname, after_fname, after_s_id, page_size):
+    """SP_GetStudentsByDepartmentPage: returns the open cursor, ordered by (S_LName, S_FName, S_Id)
+    with NULL names sorting as ''"""
+    return cursor.execute("""
+        SELECT page.S_Id, page.S_FName || ' ' || page.S_LName AS StudentName, page.S_FName, page.S_LName,
+               page.S_Age, page.S_Email, page.S_GPA, page.Track_Name, page.Track_Id, page.DepartmentName,
+               (SELECT GROUP_CONCAT(sp.S_Phone, ', ') FROM Student_Phones sp WHERE sp.S_Id = page.S_Id)
+                   AS PhoneNumbers
+        FROM (
+            SELECT s.S_Id, s.S_FName, s.S_LName, s.S_Age, s.S_Email, s.S_GPA,
+                   t.Track_Name, t.Track_Id, d.D_Name AS DepartmentName
+            FROM Student s
+            JOIN Track t ON s.Track_Id = t.Track_Id
+            JOIN Department d ON s.Dep_Id = d.D_Id
+            WHERE s.Dep_Id = :dep_id
+              AND (:after_s_id IS NULL
+                   OR (IFNULL(s.S_LName, ''), IFNULL(s.S_FName, ''), s.S_Id)
+                      > (IFNULL(:lname, ''), IFNULL(:fname, ''), :after_s_id))
+            ORDER BY IFNULL(s.S_LName, ''), IFNULL(s.S_FName, ''), s.S_Id
+            LIMIT :page_size
+        ) AS page
+        ORDER BY IFNULL(page.S_LName, ''), IFNULL(page.S_FName, ''), page.S_Id
+    """, {'dep_id': dep_id, 'lname': after_lname, 'fname': after_fname, 'after_s_id': after_s_id,
+          'page_size': page_size})
+
+def sp_get_student_enrollments_page(cursor, s_id, after_date, after_c_id, page_size):
+    """SP_GetStudentEnrollmentsPage: returns the open cursor, newest enrollment first"""
+    if cursor.execute("SELECT 1 FROM Student WHERE S_Id = ?", (s_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student ID {s_id} does not exist")
+    return cursor.execute("""
+        SELECT s.S_FName || ' ' || s.S_LName AS StudentName, c.C_Id, c.C_Name AS CourseName,
+               c.C_Des AS CourseDescription, c.C_Duration, sc.Enrollment_Date, t.Track_Name,
+               CAST(JULIANDAY('now') - JULIANDAY(sc.Enrollment_Date) AS INTEGER) AS DaysEnrolled,
+               (SELECT COUNT(*) FROM Exam WHERE C_Id = c.C_Id) AS TotalExams,
+               (SELECT COUNT(*) FROM Student_Exam se JOIN Exam e ON se.E_Id = e.E_Id
+                WHERE se.S_Id = :s_id AND e.C_Id = c.C_Id) AS ExamsTaken
+        FROM Student s
+        JOIN Student_Course sc ON s.S_Id = sc.S_Id
+        JOIN Course c ON sc.Course_Id = c.C_Id
+        LEFT JOIN Track t ON c.Track_Id = t.Track_Id
+        WHERE s.S_Id = :s_id
+          AND (:after_c_id IS NULL
+               OR IFNULL(sc.Enrollment_Date, '0001-01-01') < IFNULL(:after_date, '0001-01-01')
+               OR (IFNULL(sc.Enrollment_Date, '0001-01-01') = IFNULL(:after_date, '0001-01-01')
+                   AND c.C_Id > :after_c_id))
+        ORDER BY IFNULL(sc.Enrollment_Date, '0001-01-01') DESC, c.C_Id
+        LIMIT :page_size
+    """, {'s_id': s_id, 'after_date': after_date, 'after_c_id': after_c_id, 'page_size': page_size})
+
+def sp_get_available_exams_for_student_page(cursor, s_id, after_date, after_course_name, after_e_id, page_size):
+    """SP_GetAvailableExamsForStudentPage: returns the open cursor, ordered by (E_Date DESC, CourseName, E_Id)"""
+    if cursor.execute("SELECT 1 FROM Student WHERE S_Id = ?", (s_id,)).fetchone() is None:
+        raise sqlite3.DatabaseError(f"Student ID {s_id} does not exist")
+    return cursor.execute("""
+        SELECT e.E_Id, e.E_Title, e.E_Total_Marks, e.E_Duaration AS Duration_Minutes, e.E_Date,
+               c.C_Name AS CourseName, c.C_Id,
+               CASE WHEN se.E_Id IS NOT NULL THEN 'Taken' ELSE 'Available' END AS ExamStatus,
+               se.Grade, se.Date_Taken,
+               (SELECT COUNT(*) FROM Exam_Questions WHERE E_Id = e.E_Id) AS TotalQuestions
+        FROM Student_Course sc
+        JOIN Course c ON sc.Course_Id = c.C_Id
+        JOIN Exam e ON c.C_Id = e.C_Id
+        LEFT JOIN Student_Exam se ON e.E_Id = se.E_Id AND se.S_Id = :s_id
+        WHERE sc.S_Id = :s_id
+          AND (:after_e_id IS NULL
+               OR IFNULL(e.E_Date, '0001-01-01') < IFNULL(:after_date, '0001-01-01')
+               OR (IFNULL(e.E_Date, '0001-01-01') = IFNULL(:after_date, '0001-01-01')
+                   AND (IFNULL(c.C_Name, ''), e.E_Id) > (IFNULL(:after_course_name, ''), :after_e_id)))
+        ORDER BY IFNULL(e.E_Date, '0001-01-01') DESC, IFNULL(c.C_Name, ''), e.E_Id
+        LIMIT :page_size
+    """, {'s_id': s_id, 'after_date': after_date, 'after_course_name': after_course_name,
+          'after_e_id': after_e_id, 'page_size': page_size})
+
+PROCEDURES = {
+    "SP_CorrectExam": sp_correct_exam,
+    "SP_CorrectExamsBulk": sp_correct_exams_bulk,
+    "SP_GetExamQuestionsWithChoices": sp_get_exam_questions_with_choices,
+    "SP_UpdateQuestion": sp_update_question,
+    "SP_DeleteQuestion": sp_delete_question,
+    "SP_UpdateChoice": sp_update_choice,
+    "SP_UpdateExam": sp_update_exam,
+    "SP_LoginStudent": sp_login_student,
+    "SP_GetAvailableExamsForStudent": sp_get_available_exams_for_student,
+    "SP_SubmitStudentAnswers": sp_submit_student_answers,
+    "SP_EnrollStudentInCourse": sp_enroll_student_in_course,
+    "SP_EnrollStudentInTrackCourses": sp_enroll_student_in_track_courses,
+    "SP_EnrollStudentsBulk": sp_enroll_students_bulk,
+    "SP_RebuildStudentGradeSummary": sp_rebuild_student_grade_summary,
+    "SP_GetStudentGrades": sp_get_student_grades,
+    "SP_GenerateExam": sp_generate_exam,
+    "SP_GenerateExamsBulk": sp_generate_exams_bulk,
+    "SP_ImportQuestionsBulk": sp_import_questions_bulk,
+    "SP_GetStudentsByDepartmentPage": sp_get_students_by_department_page,
+    "SP_GetStudentEnrollmentsPage": sp_get_student_enrollments_page,
+    "SP_GetAvailableExamsForStudentPage": sp_get_available_exams_for_student_page,
+}
@@ -0,0 +1,96 @@
+"""
+ITI Database - answer-key grading tests
+Seeds a small SQLite database and checks that grade_with_answer_keys gives exactly the
+grades of one SP_CorrectExam call per submission, including partly or wholly unanswered
+exams and exams worth zero points. Run with: python -m pytest -q test_grade_exams.py
+"""
+
+import pytest
+
+from grade_exams import grade_mismatches, grade_one_by_one, grade_with_answer_keys, submitted_exams, to_grade
+from insert_egyptian_mock_data_v2 import DatabaseConnection
+
+@pytest.fixture(scope="module")
+def db(db_copy):
+    """The seeded SQLite database with the edge-case exams added"""
+    add_edge_cases(db_copy)
+    return db_copy
+
+def add_edge_cases(db: DatabaseConnection):
+    """Drop some answers, add a submission without answers and an exam worth zero points"""
+    cursor = db.cursor
+    # Leave the first question of every third submission unanswered
+    cursor.execute("""
+        DELETE FROM Student_Answer
+        WHERE A_Id IN (
+            SELECT MIN(sa.A_Id) FROM Student_Answer sa
+            JOIN Student_Exam se ON se.S_Id = sa.S_Id AND se.E_Id = sa.Exam_Id
+            WHERE (se.S_Id + se.E_Id) % 3 = 0
+            GROUP BY sa.S_Id, sa.Exam_Id
+        )
+    """)
+    # A submission with no answers at all
+    e_id, = cursor.execute("SELECT MIN(E_Id) FROM Exam_Questions").fetchone()
+    s_id, = cursor.execute("""
+        SELECT MIN(S_Id) FROM Student
+        WHERE S_Id NOT IN (SELECT S_Id FROM Student_Exam WHERE E_Id = ?)
+    """, (e_id,)).fetchone()
+    cursor.execute("INSERT INTO Student_Exam (S_Id, E_Id, Grade, Date_Taken) VALUES (?, ?, NULL, NULL)",
+                   (s_id, e_id))
+
+    # An exam whose questions are all worth zero points, answered right and wrong
+    c_id, = cursor.execute("SELECT MIN(C_Id) FROM Course").fetchone()
+    zero_exam, = cursor.execute("SELECT MAX(E_Id) + 1 FROM Exam").fetchone()
+    q_id, = cursor.execute("SELECT MAX(Q_Id) + 1 FROM Question").fetchone()
+    choice_id, = cursor.execute("SELECT MAX(Choice_Id) + 1 FROM Choice").fetchone()
+    a_id, = cursor.execute("SELECT MAX(A_Id) + 1 FROM Student_Answer").fetchone()
+    cursor.execute("INSERT INTO Exam (E_Id, E_Title, E_Total_Marks, E_Duaration, E_Date, C_Id) "
+                   "VALUES (?, 'Zero points', 0, 30, '2025-01-10', ?)", (zero_exam, c_id))
+    for offset in range(2):
+        cursor.execute("INSERT INTO Question (Q_Id, Q_Content, Q_Type, Q_Points, Q_hardness, C_Id) "
+                       "VALUES (?, 'Worth nothing', 'TF', 0, 'Easy', ?)", (q_id + offset, c_id))
+        cursor.execute("INSERT INTO Exam_Questions (E_Id, Q_Id) VALUES (?, ?)", (zero_exam, q_id + offset))
+        cursor.executemany("INSERT INTO Choice (Choice_Id, Q_Id, Is_Correct, Choice_Content) VALUES (?, ?, ?, ?)",
+                           [(choice_id + 2 * offset, q_id + offset, 1, 'True'),
+                            (choice_id + 2 * offset + 1, q_id + offset, 0, 'False')])
+    takers = [row[0] for row in cursor.execute("SELECT S_Id FROM Student ORDER BY S_Id LIMIT 2")]
+    for student, picked in zip(takers, (choice_id, choice_id + 1)):
+        cursor.execute("INSERT INTO Student_Exam (S_Id, E_Id, Grade, Date_Taken) VALUES (?, ?, NULL, NULL)",
+                       (student, zero_exam))
+        cursor.execute("INSERT INTO Student_Answer (A_Id, Question_Id, Exam_Id, Choice_Id, S_Id) "
+                       "VALUES (?, ?, ?, ?, ?)", (a_id, q_id, zero_exam, picked, student))
+        a_id += 1
+    db.commit()
+    return zero_exam
+
+def test_answer_keys_match_sp_correct_exam(db):
+    submissions = submitted_exams(db)
+    exam_ids = sorted({e_id for _, e_id in submissions})
+    expected = grade_one_by_one(db, submissions)
+    graded = grade_with_answer_keys(db, submissions, exam_ids)
+
+    assert len(graded) == len(submissions)
+    assert grade_mismatches(expected, graded) == []
+
+def test_edge_cases_are_covered(db):
+    submissions = submitted_exams(db)
+    graded = grade_with_answer_keys(db, submissions, sorted({e_id for _, e_id in submissions}))
+    zero_exam, = db.cursor.execute("SELECT E_Id FROM Exam WHERE E_Title = 'Zero points'").fetchone()
+
+    unanswered = db.cursor.execute("""
+        SELECT COUNT(*) FROM Student_Exam se
+        JOIN Exam_Questions eq ON eq.E_Id = se.E_Id
+        WHERE NOT EXISTS (SELECT 1 FROM Student_Answer sa
+                          WHERE sa.S_Id = se.S_Id AND sa.Exam_Id = se.E_Id AND sa.Question_Id = eq.Q_Id)
+    """).fetchone()[0]
+    assert unanswered > 0
+    assert [grade for (_, e_id), grade in graded.items() if e_id == zero_exam] == [to_grade(0)] * 2
+
+def test_subset_of_exams_matches(db):
+    submissions = submitted_exams(db)
+    exam_ids = sorted({e_id for _, e_id in submissions})[::2]
+    subset = submitted_exams(db, exam_ids)
+    assert {e_id for _, e_id in subset} == set(exam_ids)
+
+    expected = grade_one_by_one(db, subset)
+    assert grade_mismatches(expected, grade_with_answer_keys(db, subset, exam_ids)) == []
@@ -0,0 +1,61 @@
+"""
+ITI Database - keyset pagination tests
+Checks that iter_pages walks every row of a paged list procedure exactly once, in order,
+also when page boundaries fall on rows whose name columns are NULL (sorted as '').
+Run with: python -m pytest -q test_pagination.py
+"""
+
+import pytest
+
+PAGE_SIZES = [1, 2, 3, 7, 500]
+
+@pytest.fixture(scope="module")
+def db(db_copy):
+    """The seeded SQLite database with some NULL student and course names"""
+    cursor = db_copy.cursor
+    dep_id, = cursor.execute("SELECT Dep_Id FROM Student GROUP BY Dep_Id ORDER BY COUNT(*) DESC LIMIT 1").fetchone()
+    students = [row[0] for row in cursor.execute("SELECT S_Id FROM Student WHERE Dep_Id = ? ORDER BY S_Id", (dep_id,))]
+    cursor.executemany("UPDATE Student SET S_LName = NULL WHERE S_Id = ?", [(s,) for s in students[:3]])
+    cursor.execute("UPDATE Student SET S_FName = NULL WHERE S_Id = ?", (students[1],))
+    cursor.execute("UPDATE Student SET S_FName = NULL WHERE S_Id = ?", (students[-1],))
+    # Two NULL course names whose exams share one date, so page boundaries tie on (date, '')
+    courses = [row[0] for row in cursor.execute(
+        "SELECT C_Id FROM Exam GROUP BY C_Id ORDER BY COUNT(*) DESC, C_Id LIMIT 2")]
+    cursor.executemany("UPDATE Course SET C_Name = NULL WHERE C_Id = ?", [(c,) for c in courses])
+    cursor.executemany("UPDATE Exam SET E_Date = '2025-01-01' WHERE C_Id = ?", [(c,) for c in courses])
+    db_copy.commit()
+    db_copy.dep_id = dep_id
+    return db_copy
+
+def paged_ids(db, name, param, page_size, id_column):
+    ids = []
+    for page in db.iter_pages(name, param, page_size=page_size):
+        columns = [d[0] for d in db.cursor.description]
+        ids.extend(row[columns.index(id_column)] for row in page)
+    return ids
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def test_students_by_department_pages_through_null_names(db, page_size):
+    expected = [row[0] for row in db.cursor.execute("""
+        SELECT S_Id FROM Student WHERE Dep_Id = ?
+        ORDER BY IFNULL(S_LName, ''), IFNULL(S_FName, ''), S_Id
+    """, (db.dep_id,))]
+    assert db.cursor.execute("SELECT COUNT(*) FROM Student WHERE Dep_Id = ? AND S_LName IS NULL",
+                             (db.dep_id,)).fetchone()[0] == 3
+
+    assert paged_ids(db, "SP_GetStudentsByDepartmentPage", db.dep_id, page_size, "S_Id") == expected
+
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+def test_available_exams_pages_through_null_course_names(db, page_size):
+    s_id, count = db.cursor.execute("""
+        SELECT sc.S_Id, COUNT(*) FROM Student_Course sc
+        JOIN Course c ON c.C_Id = sc.Course_Id
+        JOIN Exam e ON e.C_Id = c.C_Id
+        GROUP BY sc.S_Id
+        ORDER BY SUM(c.C_Name IS NULL) DESC, COUNT(*) DESC
+        LIMIT 1
+    """).fetchone()
+
+    ids = paged_ids(db, "SP_GetAvailableExamsForStudentPage", s_id, page_size, "E_Id")
+    assert len(ids) == count
+    assert len(set(ids)) == count